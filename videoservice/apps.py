@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def provision_beat_schedule(sender, **kwargs):
+    """post_migrate hook: provision Celery Beat periodic tasks once per migrate run."""
+    from videoservice.config.beat_schedule import provision_periodic_tasks
+
+    provision_periodic_tasks()
+
+
+class VideoserviceConfig(AppConfig):
+    name = "videoservice"
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        post_migrate.connect(provision_beat_schedule, sender=self)
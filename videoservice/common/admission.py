@@ -0,0 +1,243 @@
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from redis.exceptions import RedisError
+from rest_framework.throttling import BaseThrottle
+
+from videoservice import settings
+from videoservice.common.circuit_breaker import CircuitBreaker
+from videoservice.common.exceptions import ServiceOverloaded
+
+logger = logging.getLogger('videoservice')
+
+KEY_PREFIX = "videoservice:admission"
+
+# Refills the bucket for the time elapsed since its last use, then takes `cost` tokens.
+# Runs atomically in Redis on the Redis clock, so every web worker and host shares one bucket.
+# Returns {allowed (0/1), seconds until enough tokens are available (string: Lua truncates numbers)}.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+# Counting semaphore over a sorted set of slot tokens scored by their expiry: slots of crashed
+# workers expire instead of leaking. Returns 1 if a slot was taken.
+ACQUIRE_SLOT_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= limit then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + ttl, ARGV[2])
+redis.call('EXPIRE', KEYS[1], math.ceil(ttl) + 1)
+return 1
+"""
+
+
+def admission_config():
+    return getattr(settings, "ADMISSION_CONTROL", {})
+
+
+class AdmissionControl:
+    """
+    Admission control in front of the video endpoints:
+    - per-client token buckets (rate limiting), shared through Redis;
+    - a global limit on requests doing miss-path work (DB reads and upstream calls), shared
+      through Redis. Cache hits never take a slot, so they keep being served while misses are shed.
+    If Redis is unreachable (or disabled), clients are not rate limited and the miss budget falls
+    back to a per-process limit, so the service degrades instead of failing closed.
+    """
+
+    redis_breaker = CircuitBreaker("admission-redis", failure_threshold=3, recovery_timeout=10.0)
+    _scripts = {}
+    _local_slots = None
+    _local_lock = threading.Lock()
+    _shed = Counter()
+
+    @classmethod
+    def enabled(cls):
+        return admission_config().get("ENABLED", False)
+
+    @classmethod
+    def redis_script(cls, source):
+        """
+        Returns the registered Redis script, or None when Redis is disabled or failing.
+        Scripts are sent by SHA and re-loaded automatically after a Redis restart.
+        """
+        if not settings.USE_REDIS or not cls.redis_breaker.allow_request():
+            return None
+        if source not in cls._scripts:
+            # The raw client of Django's Redis cache backend, keys are not prefixed by the cache
+            cls._scripts[source] = cache._cache.get_client(write=True).register_script(source)
+        return cls._scripts[source]
+
+    @classmethod
+    def run_script(cls, source, keys, args):
+        """Runs a Redis script. Returns None (after recording the failure) if Redis is unavailable."""
+        script = cls.redis_script(source)
+        if script is None:
+            return None
+        try:
+            result = script(keys=keys, args=args)
+        except RedisError as e:
+            logger.warning(f"Admission control falling back to local limits, Redis failed: {e}")
+            cls.redis_breaker.record_failure()
+            return None
+        cls.redis_breaker.record_success()
+        return result
+
+    @classmethod
+    def take_bucket_tokens(cls, key, rate, burst, cost=1):
+        """
+        Takes `cost` tokens from a shared Redis token bucket.
+        Args:
+            key (str): Redis key of the bucket.
+            rate (float): Tokens added per second.
+            burst (float): Bucket size.
+            cost (int): Tokens to take.
+        Returns:
+            tuple | None: (allowed, seconds to wait before retrying), or None if Redis is unavailable.
+        """
+        result = cls.run_script(TOKEN_BUCKET_SCRIPT, [key], [rate, burst, cost])
+        if result is None:
+            return None
+        allowed, wait = result
+        return bool(allowed), float(wait)
+
+    @classmethod
+    def take_token(cls, client_id):
+        """
+        Takes one token from the client's bucket (allowed when Redis is unavailable).
+        Args:
+            client_id (str): Client identity (address or API key).
+        Returns:
+            tuple: (allowed, seconds to wait before retrying).
+        """
+        config = admission_config()
+        result = cls.take_bucket_tokens(
+            f"{KEY_PREFIX}:bucket:{client_id}", config.get("CLIENT_RATE", 20), config.get("CLIENT_BURST", 40)
+        )
+        return (True, 0.0) if result is None else result
+
+    @classmethod
+    def local_slots(cls):
+        """Per-process semaphore used for the miss budget while Redis is unavailable."""
+        with cls._local_lock:
+            if cls._local_slots is None:
+                cls._local_slots = threading.BoundedSemaphore(admission_config().get("LOCAL_MISS_CONCURRENCY", 8))
+            return cls._local_slots
+
+    @classmethod
+    @contextmanager
+    def miss_slot(cls):
+        """
+        Holds one slot of the global miss budget for the duration of the block.
+        Raises:
+            ServiceOverloaded: If the budget is exhausted (the request is shed).
+        """
+        if not cls.enabled():
+            yield
+            return
+        config = admission_config()
+        key = f"{KEY_PREFIX}:miss_slots"
+        token = uuid.uuid4().hex
+        acquired = cls.run_script(
+            ACQUIRE_SLOT_SCRIPT, [key], [config.get("MISS_CONCURRENCY", 64), token, config.get("MISS_SLOT_TTL", 30)]
+        )
+        local = acquired is None
+        if local:
+            acquired = cls.local_slots().acquire(blocking=False)
+        if not acquired:
+            cls.record_shed("miss_budget")
+            raise ServiceOverloaded(wait=config.get("RETRY_AFTER", 1))
+        try:
+            yield
+        finally:
+            if local:
+                cls.local_slots().release()
+            else:
+                cls.release_slot(key, token)
+
+    @classmethod
+    def release_slot(cls, key, token):
+        try:
+            cache._cache.get_client(write=True).zrem(key, token)
+        except RedisError as e:
+            # The slot expires after MISS_SLOT_TTL anyway
+            logger.warning(f"Could not release miss slot: {e}")
+
+    @classmethod
+    def record_shed(cls, reason):
+        """Counts a shed request, per process and (best effort) in Redis across all workers."""
+        cls._shed[reason] += 1
+        logger.warning(f"Request shed: {reason}")
+        if settings.USE_REDIS and cls.redis_breaker.state == CircuitBreaker.CLOSED:
+            try:
+                cache._cache.get_client(write=True).hincrby(f"{KEY_PREFIX}:shed", reason, 1)
+            except RedisError:
+                cls.redis_breaker.record_failure()
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns the shed counters and the miss-path requests currently in flight.
+        Returns:
+            dict: {"shed": {reason: count}, "shed_local": {...}, "miss_in_flight": int | None, "redis": {...}}
+        """
+        stats = {
+            "shed": None,
+            "shed_local": dict(cls._shed),
+            "miss_in_flight": None,
+            "redis": cls.redis_breaker.snapshot(),
+        }
+        if settings.USE_REDIS and cls.redis_breaker.state == CircuitBreaker.CLOSED:
+            try:
+                client = cache._cache.get_client()
+                stats["shed"] = {
+                    reason.decode(): int(count) for reason, count in client.hgetall(f"{KEY_PREFIX}:shed").items()
+                }
+                stats["miss_in_flight"] = client.zcount(f"{KEY_PREFIX}:miss_slots", time.time(), "+inf")
+            except RedisError as e:
+                logger.warning(f"Could not read admission stats: {e}")
+        return stats
+
+
+class ClientRateThrottle(BaseThrottle):
+    """DRF throttle backed by the per-client Redis token buckets of `AdmissionControl`."""
+
+    def allow_request(self, request, view):
+        if not AdmissionControl.enabled():
+            return True
+        allowed, self.retry_after = AdmissionControl.take_token(self.get_ident(request))
+        if not allowed:
+            AdmissionControl.record_shed("rate_limited")
+        return allowed
+
+    def wait(self):
+        return self.retry_after
@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger('videoservice')
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    - CLOSED: calls pass through; consecutive failures are counted.
+    - OPEN: calls fail fast until `recovery_timeout` seconds have passed.
+    - HALF_OPEN: a single trial call is let through; success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        """Returns the current state, moving OPEN to HALF_OPEN once the recovery timeout has elapsed."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            return self._state
+
+    def allow_request(self):
+        """
+        Checks whether a call may proceed.
+        Returns:
+            bool: False while the circuit is open (or a half-open trial is already running).
+        """
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Records a successful call and closes the circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit breaker '{self.name}' closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Records a failed call, opening the circuit once the failure threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit breaker '{self.name}' opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def snapshot(self):
+        """Returns the breaker state as a dict, for metrics."""
+        state = self.state
+        with self._lock:
+            return {"name": self.name, "state": state, "consecutive_failures": self._failures}
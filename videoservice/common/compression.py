@@ -0,0 +1,72 @@
+import gzip
+
+from videoservice import settings
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+IDENTITY = "identity"
+
+
+def supported_encodings():
+    """Returns the content codings this service can produce, most preferred first."""
+    return ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding, available=None):
+    """
+    Picks the content coding for a response from an `Accept-Encoding` header.
+    Among codings the client accepts with q > 0, the server's preference order wins.
+    Args:
+        accept_encoding (str): Raw `Accept-Encoding` header value (may be empty).
+        available (tuple, optional): Candidate codings, most preferred first.
+    Returns:
+        str: "br", "gzip" or "identity".
+    """
+    available = available or supported_encodings()
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for coding in available:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return IDENTITY
+
+
+def compress_variants(body):
+    """
+    Builds every encoded variant of a response body once, so they can be cached and served
+    without compressing per request. Bodies below `RESPONSE_COMPRESSION["MIN_SIZE"]` are not
+    compressed: each variant then maps to the identity body.
+    Args:
+        body (bytes): Rendered (uncompressed) response body.
+    Returns:
+        dict: Requested coding -> (applied coding, bytes), including "identity".
+    """
+    config = getattr(settings, "RESPONSE_COMPRESSION", {})
+    variants = {IDENTITY: (IDENTITY, body)}
+    compress = len(body) >= config.get("MIN_SIZE", 512)
+
+    for coding in supported_encodings():
+        encoded = None
+        if compress and coding == "gzip":
+            encoded = gzip.compress(body, compresslevel=config.get("GZIP_LEVEL", 6), mtime=0)
+        elif compress:
+            encoded = brotli.compress(body, quality=config.get("BROTLI_QUALITY", 5))
+        # Keep the identity body when compression is skipped or does not pay off
+        variants[coding] = (coding, encoded) if encoded and len(encoded) < len(body) else (IDENTITY, body)
+    return variants
@@ -0,0 +1,73 @@
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from videoservice.common.compression import IDENTITY
+
+
+# Formats and content codings `variant_etag` may add to an ETag (any worker, whatever it has installed)
+VARIANT_FORMATS = ("json", "msgpack")
+VARIANT_ENCODINGS = (IDENTITY, "br", "gzip")
+
+
+def _weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def variant_etag(etag, encoding, media_format="json"):
+    """
+    Returns the strong ETag of a representation variant, e.g. `"abc"` -> `"abc-msgpack-gzip"`.
+    Args:
+        etag (str): ETag of the JSON, identity-coded representation.
+        encoding (str): Applied content coding.
+        media_format (str): Renderer format ("json", "msgpack", ...).
+    Returns:
+        str: ETag for that variant.
+    """
+    suffix = "".join(
+        f"-{part}" for part, default in ((media_format, "json"), (encoding, IDENTITY)) if part != default
+    )
+    return f'{etag[:-1]}{suffix}"'
+
+
+def _same_version(client_etag, etag):
+    """True if `client_etag` is `etag` or one of its format/content-coding variants."""
+    client_etag = _weak(client_etag)
+    return client_etag == etag or any(
+        client_etag == variant_etag(etag, encoding, media_format)
+        for media_format in VARIANT_FORMATS for encoding in VARIANT_ENCODINGS
+    )
+
+
+def not_modified_etag(request, validators):
+    """
+    Evaluates conditional GET headers against a resource's validators (RFC 9110 section 13.2.2).
+    `If-None-Match` takes precedence over `If-Modified-Since` and uses weak comparison; the ETag
+    of any format or content-coding variant of the same version matches.
+    Args:
+        request (Request): The HTTP request object.
+        validators (dict): {"etag": str, "last_modified": int epoch seconds}.
+    Returns:
+        str | None: ETag to send with a 304, or None if the full response is needed.
+    """
+    etag = validators["etag"]
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        for client_etag in parse_etags(if_none_match):
+            if client_etag == "*":
+                return etag
+            if _same_version(client_etag, etag):
+                return _weak(client_etag)
+        return None
+
+    if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    if if_modified_since is not None and validators["last_modified"] <= if_modified_since:
+        return etag
+    return None
+
+
+def set_validator_headers(response, validators, etag=None):
+    """Adds `ETag`, `Last-Modified` and `Vary: Accept-Encoding` headers to a response."""
+    response["ETag"] = etag or validators["etag"]
+    response["Last-Modified"] = http_date(validators["last_modified"])
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
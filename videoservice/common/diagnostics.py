@@ -0,0 +1,308 @@
+import gc
+import heapq
+import hmac
+import itertools
+import logging
+import re
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection
+from rest_framework.permissions import BasePermission
+
+from videoservice import settings
+
+logger = logging.getLogger('videoservice')
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def diagnostics_config():
+    return getattr(settings, "DIAGNOSTICS", {})
+
+
+def normalize_sql(sql):
+    """Reduces a statement to its shape, so repeats with different parameters group together."""
+    sql = _IN_LIST.sub("(...)", sql)
+    sql = _STRING.sub("?", sql)
+    return _NUMBER.sub("?", sql)
+
+
+class QueryRecorder:
+    """`connection.execute_wrapper` hook recording every statement with its duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "sql": sql,
+                "params": params if not many else None,
+                "duration_ms": (time.perf_counter() - started) * 1000,
+            })
+
+    @property
+    def total_ms(self):
+        return sum(query["duration_ms"] for query in self.queries)
+
+    def repeated(self, threshold):
+        """Returns statement shapes executed at least `threshold` times (likely N+1 patterns)."""
+        counts = Counter(normalize_sql(query["sql"]) for query in self.queries)
+        return [{"sql": sql, "count": count} for sql, count in counts.most_common() if count >= threshold]
+
+
+def explain(sql, params):
+    """
+    Returns the database's plan for a SELECT statement, or None if it cannot be explained.
+    Args:
+        sql (str): Statement with driver placeholders.
+        params: Statement parameters.
+    Returns:
+        list | None: Plan lines.
+    """
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}.get(connection.vendor)
+    if prefix is None:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [" ".join(str(column) for column in row) for row in cursor.fetchall()]
+    except DatabaseError as e:
+        logger.debug(f"EXPLAIN failed: {e}")
+        return None
+
+
+class WorstSamples:
+    """Thread-safe bounded buffer keeping the N slowest samples seen by this process."""
+
+    def __init__(self, size):
+        self.size = size
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, duration_ms, sample):
+        entry = (duration_ms, next(self._counter), sample)
+        with self._lock:
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, entry)
+            elif duration_ms > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def samples(self):
+        """Returns the kept samples, slowest first."""
+        with self._lock:
+            return [sample for _, _, sample in sorted(self._heap, key=lambda entry: entry[0], reverse=True)]
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+
+slow_requests = WorstSamples(diagnostics_config().get("WORST_N", 50))
+
+
+class DiagnosticsMiddleware:
+    """
+    Opt-in (DIAGNOSTICS["ENABLED"]) slow-request capture. For requests slower than SLOW_REQUEST_MS it
+    records the ORM queries with their timings, flags repeated statement shapes (N+1 patterns),
+    runs EXPLAIN for queries slower than SLOW_QUERY_MS and keeps the worst samples in `slow_requests`.
+    When disabled, Django drops the middleware at startup, so it costs nothing.
+    Streaming responses are timed up to the first byte.
+    """
+
+    # The diagnostics endpoint itself is never sampled
+    EXCLUDED_PATH_PREFIX = "/diagnostics/"
+
+    def __init__(self, get_response):
+        config = diagnostics_config()
+        if not config.get("ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_request_ms = config.get("SLOW_REQUEST_MS", 200)
+        self.slow_query_ms = config.get("SLOW_QUERY_MS", 50)
+        self.explain_enabled = config.get("EXPLAIN", True)
+        self.n_plus_one_threshold = config.get("N_PLUS_ONE_THRESHOLD", 5)
+        self.max_queries = config.get("MAX_QUERIES_RECORDED", 100)
+        self.max_explains = config.get("MAX_EXPLAINS", 5)
+
+    def __call__(self, request):
+        if request.path.startswith(self.EXCLUDED_PATH_PREFIX):
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if duration_ms >= self.slow_request_ms:
+            sample = self.build_sample(request, response, duration_ms, recorder)
+            slow_requests.add(duration_ms, sample)
+            logger.warning(
+                f"Slow request {request.method} {request.get_full_path()}: {duration_ms:.1f} ms, "
+                f"{sample['query_count']} queries ({sample['query_ms']:.1f} ms)"
+                + (f", repeated statements: {len(sample['n_plus_one'])}" if sample["n_plus_one"] else "")
+            )
+        return response
+
+    def build_sample(self, request, response, duration_ms, recorder):
+        """Builds the diagnostic record of a slow request (runs EXPLAIN for its slow queries)."""
+        slowest = sorted(recorder.queries, key=lambda query: query["duration_ms"], reverse=True)
+        explained = set()
+        queries = []
+        for query in slowest[:self.max_queries]:
+            entry = {"sql": query["sql"], "duration_ms": round(query["duration_ms"], 3)}
+            shape = normalize_sql(query["sql"])
+            if (
+                self.explain_enabled
+                and query["duration_ms"] >= self.slow_query_ms
+                and query["params"] is not None
+                and shape not in explained
+                and len(explained) < self.max_explains
+            ):
+                explained.add(shape)
+                entry["explain"] = explain(query["sql"], query["params"])
+            queries.append(entry)
+
+        return {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 3),
+            "query_count": len(recorder.queries),
+            "query_ms": round(recorder.total_ms, 3),
+            "n_plus_one": recorder.repeated(self.n_plus_one_threshold),
+            "queries": queries,
+            "recorded_at": time.time(),
+        }
+
+
+allocation_samples = WorstSamples(diagnostics_config().get("WORST_N", 50))
+_allocation_state = threading.local()
+
+
+def gc_collections():
+    """Returns the number of garbage collections run so far, all generations."""
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+
+class AllocationReport:
+    """Memory allocated by one request, overall and per stage, as seen by tracemalloc."""
+
+    def __init__(self):
+        tracemalloc.reset_peak()
+        self.started_bytes = tracemalloc.get_traced_memory()[0]
+        self.peak_bytes = self.started_bytes
+        self.gc_started = gc_collections()
+        self.stages = []
+
+    def observe_peak(self):
+        """Folds the tracemalloc peak into the request's peak, before a stage resets it."""
+        self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+
+    def finish(self):
+        self.observe_peak()
+        return {
+            "allocated_kb": round((self.peak_bytes - self.started_bytes) / 1024, 3),
+            "retained_kb": round((tracemalloc.get_traced_memory()[0] - self.started_bytes) / 1024, 3),
+            "gc_collections": gc_collections() - self.gc_started,
+            "stages": self.stages,
+        }
+
+
+@contextmanager
+def allocation_stage(name):
+    """
+    Attributes the memory allocated inside the block to stage `name` of the current request's
+    allocation report. A no-op unless allocation profiling is on; stages must not be nested.
+    """
+    report = getattr(_allocation_state, "report", None)
+    if report is None:
+        yield
+        return
+    report.observe_peak()
+    tracemalloc.reset_peak()
+    started_bytes = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        report.stages.append({
+            "stage": name,
+            "allocated_kb": round((peak_bytes - started_bytes) / 1024, 3),
+            "retained_kb": round((current_bytes - started_bytes) / 1024, 3),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        })
+
+
+class AllocationProfilerMiddleware:
+    """
+    Opt-in (DIAGNOSTICS["ALLOCATIONS"]) per-request allocation profiling with tracemalloc.
+    Every request gets a report of its peak allocated memory, what it retained, the garbage
+    collections it triggered and the same figures per `allocation_stage`; the heaviest requests
+    are kept in `allocation_samples` and optionally their top allocation sites (ALLOCATION_TOP_SITES).
+    tracemalloc is process-wide and slows Python down severalfold: profile with one
+    single-threaded worker, never in production.
+    """
+
+    EXCLUDED_PATH_PREFIX = DiagnosticsMiddleware.EXCLUDED_PATH_PREFIX
+
+    def __init__(self, get_response):
+        config = diagnostics_config()
+        if not config.get("ALLOCATIONS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.top_sites = config.get("ALLOCATION_TOP_SITES", 0)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(config.get("ALLOCATION_FRAMES", 1))
+
+    def __call__(self, request):
+        if request.path.startswith(self.EXCLUDED_PATH_PREFIX):
+            return self.get_response(request)
+        before = tracemalloc.take_snapshot() if self.top_sites else None
+        report = _allocation_state.report = AllocationReport()
+        try:
+            response = self.get_response(request)
+        finally:
+            _allocation_state.report = None
+
+        sample = {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            **report.finish(),
+            "recorded_at": time.time(),
+        }
+        if before is not None:
+            sample["top_sites"] = [
+                {"site": str(stat.traceback), "size_kb": round(stat.size_diff / 1024, 3), "blocks": stat.count_diff}
+                for stat in tracemalloc.take_snapshot().compare_to(before, "lineno")[:self.top_sites]
+            ]
+        allocation_samples.add(sample["allocated_kb"], sample)
+        logger.info(
+            f"Allocations {request.method} {request.get_full_path()}: {sample['allocated_kb']} KiB peak, "
+            f"{sample['retained_kb']} KiB retained, {sample['gc_collections']} GC runs"
+        )
+        return response
+
+
+class HasDiagnosticsToken(BasePermission):
+    """Allows requests carrying the configured `X-Diagnostics-Token`; denies all when none is configured."""
+
+    def has_permission(self, request, view):
+        token = diagnostics_config().get("ADMIN_TOKEN")
+        supplied = request.META.get("HTTP_X_DIAGNOSTICS_TOKEN", "")
+        return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
@@ -26,7 +26,8 @@ def custom_exception_handler(exc, context):
             errors = [
                 {"status": str(response.status_code), "title": response.status_text, "detail": str(response.data)}]
 
-        return Response({"errors": errors}, status=response.status_code)
+        # Keep headers set by DRF, e.g. Retry-After on throttled or shed requests
+        return Response({"errors": errors}, status=response.status_code, headers=dict(response.items()))
 
     # Handle unexpected exceptions (500 errors)
     logger.error(f"Unhandled exception in {context['view']}: {exc}")
@@ -54,3 +55,30 @@ class CustomValidationError(APIException):
         else:
             self.detail = {"error": detail}
 
+
+class UpstreamUnavailable(APIException):
+    status_code = 503
+    default_detail = "The upstream video API is temporarily unavailable."
+    default_code = "upstream_unavailable"
+
+
+class UpstreamOverloaded(UpstreamUnavailable):
+    # Fail-fast rejection, no call was made: the circuit breaker is open or no fetch slot is free
+    default_detail = "The upstream video API is overloaded, please retry later."
+    default_code = "upstream_overloaded"
+
+
+class ServiceOverloaded(APIException):
+    status_code = 503
+    default_detail = "The service is overloaded, please retry later."
+    default_code = "overloaded"
+
+    def __init__(self, wait=None, detail=None):
+        super().__init__(detail)
+        self.wait = wait  # seconds, sent as Retry-After
+
+
+class ProfilerBusy(APIException):
+    status_code = 409
+    default_detail = "A profile is already running in this worker."
+    default_code = "profiler_busy"
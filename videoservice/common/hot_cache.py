@@ -0,0 +1,217 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+from videoservice import settings
+
+logger = logging.getLogger('videoservice')
+
+# File layout: a header followed by `slots` fixed-size slots forming an open-addressing hash table.
+#   header: magic, version, slot count, slot size, key capacity
+#   slot:   seq (seqlock counter, odd while being written), key hash (0 = empty), expires_at,
+#           key length, value length, key bytes (KEY_SIZE), value bytes (rest of the slot)
+MAGIC = b"VSHC"
+VERSION = 1
+HEADER = struct.Struct("<4sIIII")
+HEADER_SIZE = 64
+SLOT_HEADER = struct.Struct("<QQdHI")
+SEQ = struct.Struct("<Q")
+KEY_SIZE = 64
+MAX_PROBES = 8
+READ_RETRIES = 4
+
+
+def key_hash(key):
+    """Returns the non-zero 64-bit hash of a key (0 marks an empty slot)."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+class SharedHotCache:
+    """
+    Host-local key/value cache in a memory-mapped file shared by every worker process on the box.
+    - Fixed-size hash index with linear probing; values live inline in fixed-size slots.
+    - Exactly one writer (see `run_hot_cache`); readers never lock: each slot is guarded by a
+      seqlock, and a read that overlaps a write is retried, then treated as a miss.
+    Values larger than a slot are not cached.
+    """
+
+    def __init__(self, path, slots, slot_size, mm, writable):
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.value_capacity = slot_size - SLOT_HEADER.size - KEY_SIZE
+        self.writable = writable
+        self._mm = mm
+        self._inode = os.stat(path).st_ino
+
+    @classmethod
+    def create(cls, path, slots, slot_size):
+        """
+        Opens the cache file for writing, creating (or re-creating, if its geometry changed) it.
+        An existing file with the same geometry is reused in place, so mapped readers stay valid.
+        """
+        size = HEADER_SIZE + slots * slot_size
+        header = HEADER.pack(MAGIC, VERSION, slots, slot_size, KEY_SIZE)
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            with open(path, "rb") as file:
+                reuse = file.read(HEADER.size) == header
+        else:
+            reuse = False
+        if not reuse:
+            # A new file (new inode) makes readers re-open instead of reading a resized mapping
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.truncate(size)
+                file.write(header)
+            os.replace(temp_path, path)
+        with open(path, "r+b") as file:
+            mm = mmap.mmap(file.fileno(), size)
+        return cls(path, slots, slot_size, mm, writable=True)
+
+    @classmethod
+    def open(cls, path):
+        """Maps an existing cache file read-only. Returns None if it is missing or not a cache file."""
+        try:
+            with open(path, "rb") as file:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        magic, version, slots, slot_size, key_size = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION or key_size != KEY_SIZE or len(mm) < HEADER_SIZE + slots * slot_size:
+            mm.close()
+            return None
+        return cls(path, slots, slot_size, mm, writable=False)
+
+    def close(self):
+        self._mm.close()
+
+    def is_stale(self):
+        """True when the file was replaced by a writer with a different geometry."""
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except OSError:
+            return True
+
+    def _offset(self, index):
+        return HEADER_SIZE + index * self.slot_size
+
+    def _read_slot(self, offset, hashed):
+        """
+        Seqlock read of one slot. Returns (slot hash, expires_at, key, value) with key/value only
+        when the slot holds `hashed`, or None if every attempt overlapped a write.
+        """
+        mm = self._mm
+        for _ in range(READ_RETRIES):
+            seq, slot_hash, expires_at, key_length, value_length = SLOT_HEADER.unpack_from(mm, offset)
+            if seq & 1:
+                continue  # being written
+            if slot_hash != hashed:
+                return slot_hash, expires_at, None, None
+            if key_length > KEY_SIZE or value_length > self.value_capacity:
+                continue  # torn header
+            start = offset + SLOT_HEADER.size
+            slot_key = mm[start:start + key_length]
+            value = mm[start + KEY_SIZE:start + KEY_SIZE + value_length]
+            if SEQ.unpack_from(mm, offset)[0] == seq:
+                return slot_hash, expires_at, slot_key, value
+        return None
+
+    def get(self, key, now=None):
+        """
+        Returns the live value stored under `key`, or None.
+        Args:
+            key (str): Cache key (at most 64 bytes UTF-8).
+            now (float, optional): Current epoch time, for expiry.
+        Returns:
+            bytes | None
+        """
+        key_bytes = key.encode("utf-8")
+        hashed = key_hash(key_bytes)
+        for probe in range(MAX_PROBES):
+            slot = self._read_slot(self._offset((hashed + probe) % self.slots), hashed)
+            if slot is None:
+                return None  # contended: a miss is cheaper than spinning
+            slot_hash, expires_at, slot_key, value = slot
+            if slot_hash == 0:
+                return None  # end of the probe chain
+            if slot_key == key_bytes:
+                return value if expires_at > (now or time.time()) else None
+        return None
+
+    def put(self, key, value, ttl, now=None):
+        """
+        Stores `value` under `key` for `ttl` seconds (single writer only).
+        Uses the key's own slot, else the first empty or expired slot of its probe chain,
+        else overwrites the live slot that expires first.
+        Returns:
+            bool: False if the key or value does not fit in a slot.
+        """
+        if not self.writable:
+            raise PermissionError("Hot cache opened read-only")
+        key_bytes = key.encode("utf-8")
+        if len(key_bytes) > KEY_SIZE or len(value) > self.value_capacity:
+            return False
+        hashed = key_hash(key_bytes)
+        now = now or time.time()
+        mm = self._mm
+
+        target = free = oldest = None
+        oldest_expires_at = None
+        for probe in range(MAX_PROBES):
+            offset = self._offset((hashed + probe) % self.slots)
+            _, slot_hash, expires_at, key_length, _ = SLOT_HEADER.unpack_from(mm, offset)
+            start = offset + SLOT_HEADER.size
+            if slot_hash == hashed and mm[start:start + key_length] == key_bytes:
+                target = offset
+                break
+            if slot_hash == 0 or expires_at <= now:
+                free = offset if free is None else free
+                if slot_hash == 0:
+                    break
+            elif oldest is None or expires_at < oldest_expires_at:
+                oldest, oldest_expires_at = offset, expires_at
+        target = target if target is not None else free if free is not None else oldest
+
+        # Seqlock write: odd counter while the slot is inconsistent
+        seq = SEQ.unpack_from(mm, target)[0]
+        SEQ.pack_into(mm, target, seq + 1)
+        SLOT_HEADER.pack_into(mm, target, seq + 1, hashed, now + ttl, len(key_bytes), len(value))
+        start = target + SLOT_HEADER.size
+        mm[start:start + len(key_bytes)] = key_bytes
+        mm[start + KEY_SIZE:start + KEY_SIZE + len(value)] = value
+        SEQ.pack_into(mm, target, seq + 2)
+        return True
+
+
+def hot_cache_config():
+    return getattr(settings, "HOT_CACHE", {})
+
+
+_reader = None
+_reader_checked_at = 0.0
+_reader_lock = threading.Lock()
+REOPEN_CHECK_SECONDS = 5.0
+
+
+def get_hot_cache():
+    """
+    Returns this process's read-only view of the host-local hot cache, or None when it is
+    disabled or no refresher has created it yet. The file is re-checked every few seconds.
+    """
+    global _reader, _reader_checked_at
+    config = hot_cache_config()
+    if not config.get("ENABLED", False):
+        return None
+    now = time.monotonic()
+    if now - _reader_checked_at < REOPEN_CHECK_SECONDS:
+        return _reader
+    with _reader_lock:
+        if now - _reader_checked_at >= REOPEN_CHECK_SECONDS:
+            if _reader is None or _reader.is_stale():
+                _reader = SharedHotCache.open(config.get("PATH"))
+            _reader_checked_at = now
+    return _reader
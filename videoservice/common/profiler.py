@@ -0,0 +1,134 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.core.exceptions import MiddlewareNotUsed
+
+from videoservice.common.diagnostics import diagnostics_config
+
+logger = logging.getLogger('videoservice')
+
+MAX_STACK_DEPTH = 128
+DEFAULT_PATH = "other"
+
+# Serving path of every thread currently handling a request, only tracked while sampling.
+# Written by the request threads, read by the sampler thread.
+_thread_paths = {}
+_active = False
+_profile_lock = threading.Lock()
+
+
+def tag_request_path(path):
+    """
+    Labels the serving path the current request is on ("hit", "db", "upstream", ...), so samples
+    taken from now on are attributed to it. A flag check when no profile is running.
+    """
+    if _active:
+        thread_id = threading.get_ident()
+        if thread_id in _thread_paths:
+            _thread_paths[thread_id] = path
+
+
+def frame_label(code):
+    """Returns `package/module.py:function` for a code object."""
+    directory, filename = os.path.split(code.co_filename)
+    return f"{os.path.basename(directory)}/{filename}:{code.co_name}"
+
+
+def collapse_stack(frame):
+    """Returns a frame's stack in collapsed format (root first, `;`-separated)."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class ProfileInProgress(Exception):
+    """Raised when a profile is requested while another one is running in this process."""
+
+
+def _sample(seconds, interval):
+    """Sampling loop of `start_profile`, run by the sampler thread while it holds `_profile_lock`."""
+    global _active
+    samples = Counter()
+    sampler_thread = threading.get_ident()
+    try:
+        _active = True
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frames = sys._current_frames()
+            for thread_id, path in list(_thread_paths.items()):
+                frame = frames.get(thread_id)
+                if frame is not None and thread_id != sampler_thread:
+                    samples[f"{path};{collapse_stack(frame)}"] += 1
+            del frames
+            time.sleep(interval)
+    finally:
+        _active = False
+        _thread_paths.clear()
+    return samples
+
+
+def start_profile(seconds, interval, on_done):
+    """
+    Samples the stacks of the threads serving requests in this process for `seconds`, in a
+    background thread, and returns at once: the request asking for a profile does not hold a
+    request thread (or the whole worker, if it is single-threaded).
+    Args:
+        seconds (float): Duration of the profile.
+        interval (float): Seconds between samples.
+        on_done (callable): Called from the sampler thread with the samples (Counter: collapsed
+            stack prefixed with the request's serving path -> number of samples).
+    Raises:
+        ProfileInProgress: If another profile is already running in this process.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfileInProgress
+
+    def run():
+        samples = Counter()
+        try:
+            samples = _sample(seconds, interval)
+        except Exception:
+            logger.exception("Stack sampling failed")
+        finally:
+            _profile_lock.release()
+        on_done(samples)
+
+    try:
+        threading.Thread(target=run, name="stack-sampler", daemon=True).start()
+    except RuntimeError:
+        _profile_lock.release()
+        raise
+
+
+def format_collapsed(samples):
+    """Renders samples in the collapsed-stack format read by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+class SamplingProfilerMiddleware:
+    """
+    Opt-in (DIAGNOSTICS["PROFILER"]) support for `start_profile`: while a profile runs, marks the
+    threads handling requests so the sampler only records request work. When profiling is not
+    enabled Django drops the middleware at startup; when enabled but idle it costs a flag check.
+    """
+
+    def __init__(self, get_response):
+        if not diagnostics_config().get("PROFILER", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _active:
+            return self.get_response(request)
+        thread_id = threading.get_ident()
+        _thread_paths[thread_id] = DEFAULT_PATH
+        try:
+            return self.get_response(request)
+        finally:
+            _thread_paths.pop(thread_id, None)
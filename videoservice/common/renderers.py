@@ -1,4 +1,33 @@
-from rest_framework.renderers import JSONRenderer
+import json
+from datetime import timezone as dt_timezone
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+def group_by_channel(data, renderer_context):
+    """
+    Groups a list of videos under the requested `channel_id`: `{channel_id: [...]}`.
+    Other payloads (errors, dicts) are returned unchanged.
+    """
+    request = (renderer_context or {}).get('request', None)
+
+    # Ensure we have a valid request object and "channel_id" param is present
+    if request and request.query_params.get("channel_id"):
+        channel_id = request.query_params["channel_id"]
+
+        # If the response data is a list (default DRF serializer format), transform it
+        if isinstance(data, list):
+            data = {channel_id: data}
+    return data
+
 
 class VideoJSONRenderer(JSONRenderer):
     """
@@ -15,14 +44,57 @@ class VideoJSONRenderer(JSONRenderer):
         """
         Modify the response structure to group videos under `channel_id`.
         """
-        request = renderer_context.get('request', None)
+        data = group_by_channel(data, renderer_context)
+        return super().render(data, accepted_media_type, renderer_context)
 
-        # Ensure we have a valid request object and "channel_id" param is present
-        if request and request.query_params.get("channel_id"):
-            channel_id = request.query_params["channel_id"]
 
-            # If the response data is a list (default DRF serializer format), transform it
-            if isinstance(data, list):
-                data = {channel_id: data}
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer for newline-delimited JSON exports.
+    Export data is streamed by the view itself; this renderer only makes `application/x-ndjson`
+    negotiable and renders non-streamed payloads (such as errors) as a single JSON line.
+    """
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
 
-        return super().render(data, accepted_media_type, renderer_context)
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return (json.dumps(data, cls=encoders.JSONEncoder, separators=(",", ":")) + "\n").encode(self.charset)
+
+
+class VideoMessagePackRenderer(BaseRenderer):
+    """
+    Compact binary renderer for internal service-to-service calls.
+    Produces the same `{channel_id: [...]}` structure as `VideoJSONRenderer`, with
+    `upload_date` encoded as integer seconds since the epoch (UTC).
+    Selected with `Accept: application/x-msgpack` (or `?format=msgpack`).
+    """
+    media_type = "application/x-msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        data = group_by_channel(data, renderer_context)
+        if isinstance(data, dict):
+            data = {
+                key: [self.compact_video(video) for video in value] if isinstance(value, list) else value
+                for key, value in data.items()
+            }
+        return msgpack.packb(data, use_bin_type=True)
+
+    @staticmethod
+    def compact_video(video):
+        """Returns a video dict with `upload_date` as integer epoch seconds."""
+        if not isinstance(video, dict) or not isinstance(video.get("upload_date"), str):
+            return video
+        upload_date = parse_datetime(video["upload_date"])
+        if upload_date is None:
+            return video
+        if upload_date.tzinfo is None:
+            upload_date = upload_date.replace(tzinfo=dt_timezone.utc)
+        return {**video, "upload_date": int(upload_date.timestamp())}
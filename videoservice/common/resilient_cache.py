@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache as default_cache
+from redis.exceptions import RedisError
+
+from videoservice import settings
+from videoservice.common.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger('videoservice')
+
+# Failures of the Redis cache backend; socket timeouts surface as redis.TimeoutError or OSError
+CACHE_ERRORS = (RedisError, OSError)
+
+
+def cache_resilience_config():
+    return getattr(settings, "CACHE_RESILIENCE", {})
+
+
+class LocalCache:
+    """Thread-safe, bounded (LRU) in-process cache with per-entry expiry."""
+
+    def __init__(self, max_entries=1000, ttl=30, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        ttl = self.ttl if timeout is None else min(timeout, self.ttl)
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResilientCache:
+    """
+    Cache access layer in front of the Redis cache backend.
+    - Every call is bounded by the backend's socket timeouts (see CACHES OPTIONS).
+    - Failures trip a circuit breaker; while it is open Redis is skipped entirely and reads and
+      writes go to a small local cache (misses fall through to the DB).
+    - The breaker half-opens after its recovery timeout and a successful call closes it again;
+      the local cache is dropped then, so entries written during the outage do not outlive it.
+    Exposes the subset of the Django cache API used by the read path.
+    """
+
+    def __init__(self, backend=None, breaker=None, local=None):
+        config = cache_resilience_config()
+        self.backend = backend or default_cache
+        self.breaker = breaker or CircuitBreaker(
+            "redis-cache",
+            failure_threshold=config.get("BREAKER_FAILURE_THRESHOLD", 3),
+            recovery_timeout=config.get("BREAKER_RECOVERY_TIMEOUT", 5.0),
+        )
+        self.local = local or LocalCache(config.get("LOCAL_MAX_ENTRIES", 1000), config.get("LOCAL_TTL", 30))
+        self._degraded = False
+
+    def _call(self, operation, *args, **kwargs):
+        """
+        Runs a backend operation through the breaker.
+        Returns:
+            tuple: (True, result) on success, (False, None) if Redis was skipped or failed.
+        """
+        if not self.breaker.allow_request():
+            return False, None
+        try:
+            result = getattr(self.backend, operation)(*args, **kwargs)
+        except CACHE_ERRORS as e:
+            logger.warning(f"Redis cache {operation} failed, serving without it: {e}")
+            self.breaker.record_failure()
+            self._degraded = True
+            return False, None
+        self.breaker.record_success()
+        if self._degraded:
+            self._degraded = False
+            self.local.clear()
+            logger.info("Redis cache recovered, dropped the local fallback cache")
+        return True, result
+
+    def get(self, key, default=None):
+        ok, value = self._call("get", key, default)
+        return value if ok else self.local.get(key, default)
+
+    def get_many(self, keys):
+        ok, values = self._call("get_many", keys)
+        if ok:
+            return values
+        found = {key: self.local.get(key) for key in keys}
+        return {key: value for key, value in found.items() if value is not None}
+
+    def set(self, key, value, timeout=None):
+        ok, _ = self._call("set", key, value, timeout=timeout)
+        if not ok:
+            self.local.set(key, value, timeout)
+
+    def set_many(self, data, timeout=None):
+        ok, _ = self._call("set_many", data, timeout=timeout)
+        if not ok:
+            for key, value in data.items():
+                self.local.set(key, value, timeout)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.local.delete(key)
+        self._call("delete_many", keys)
+
+    def snapshot(self):
+        """Returns the breaker state and local fallback size, for metrics."""
+        return {**self.breaker.snapshot(), "local_entries": len(self.local)}
+
+
+resilient_cache = ResilientCache()
@@ -0,0 +1,151 @@
+import hashlib
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from videoservice import settings
+
+
+def recent_videos_top_k():
+    """Returns K, the number of newest videos cached per channel; every limit up to K is served from them."""
+    return getattr(settings, "RECENT_VIDEOS_TOP_K", 20)
+
+
+def latest_videos_limit():
+    """Returns how many newest videos are denormalized onto each `Channel.latest_videos` (K by default)."""
+    return getattr(settings, "LATEST_VIDEOS_LIMIT", recent_videos_top_k())
+
+
+def latest_top_k(latest_videos, complete):
+    """
+    Returns the top K entries of a channel's `latest_videos` and whether they are all its videos.
+    A row holding fewer than K entries without being complete was denormalized with a smaller
+    limit: its top K are unknown and must be read from the video table.
+    Args:
+        latest_videos (list | None): The channel's `latest_videos`.
+        complete (bool): The channel's `latest_videos_complete`.
+    Returns:
+        tuple: (entries, complete), or (None, False) when the row cannot provide the top K.
+    """
+    top_k = recent_videos_top_k()
+    latest_videos = latest_videos or []
+    if len(latest_videos) >= top_k:
+        return latest_videos[:top_k], complete and len(latest_videos) == top_k
+    if complete:
+        return latest_videos, True
+    return None, False
+
+
+def recent_videos_key(channel_id):
+    """Returns the cache key holding a channel's recent videos."""
+    return f"recent_videos:{channel_id}"
+
+
+def rendered_body_key(channel_id, etag, encoding, media_format="json"):
+    """
+    Returns the cache key of a rendered (and possibly compressed) response body.
+    Keys include the ETag of the data they were rendered from, so a data change never
+    serves an old body; superseded bodies simply expire.
+    """
+    version = etag.strip('"')
+    return f"recent_videos_body:{channel_id}:{version}:{media_format}:{encoding}"
+
+
+def upload_epoch(upload_date):
+    """Returns an upload datetime as integer seconds since the epoch (naive values are taken as UTC)."""
+    if isinstance(upload_date, str):
+        # Unsaved model instances keep whatever was assigned, e.g. "2024-03-01"
+        upload_date = parse_datetime(upload_date) or datetime.combine(parse_date(upload_date), time.min)
+    if timezone.is_naive(upload_date):
+        upload_date = timezone.make_aware(upload_date)
+    return int(upload_date.timestamp())
+
+
+def modified_epoch():
+    """Returns the current time as integer epoch seconds: the `Last-Modified` of validators built now."""
+    return int(timezone.now().timestamp())
+
+
+def build_validators(videos):
+    """
+    Derives HTTP validators for a channel's recent videos without serializing them.
+    The strong ETag combines the newest upload time with a digest of the ids, titles and
+    upload times, so any change to the listed videos changes it. `Last-Modified` is the time the
+    validators are built, not the newest upload: an edited title is not a new upload, yet the
+    entry holding it is rebuilt, so `If-Modified-Since` cannot revalidate a stale copy.
+    Args:
+        videos (list): Video-like objects (video_id, video_title, upload_date), newest first.
+    Returns:
+        dict: {"etag": str, "last_modified": int epoch seconds}, or None for an empty list.
+    """
+    if not videos:
+        return None
+    digest = hashlib.blake2b(digest_size=8)
+    newest = 0
+    for video in videos:
+        epoch = upload_epoch(video.upload_date)
+        newest = max(newest, epoch)
+        digest.update(f"{video.video_id}\x1f{video.video_title}\x1f{epoch}\x1e".encode("utf-8"))
+    return {"etag": f'"{newest:x}-{digest.hexdigest()}"', "last_modified": modified_epoch()}
+
+
+def limit_validators(validators, limit):
+    """
+    Derives the validators of the first `limit` videos from those of a channel's top K.
+    A prefix can only change when the top K change, so an ETag derived from the top-K ETag stays
+    a strong validator without loading the videos, and the top K's `Last-Modified` bounds the prefix's.
+    Args:
+        validators (dict | None): Validators of the top K videos.
+        limit (int): Number of videos served.
+    Returns:
+        dict | None: Validators of the served prefix.
+    """
+    if not validators or not validators.get("etag") or limit >= recent_videos_top_k():
+        return validators
+    # "." keeps prefix ETags apart from the "-" suffixes of representation variants (see variant_etag)
+    version = validators["etag"].strip('"')
+    return {**validators, "etag": f'"{version}.l{limit}"'}
+
+
+def build_cache_entry(videos, complete=False):
+    """
+    Builds the cached value for a channel's recent videos: their ids and upload times (epoch
+    seconds, used to merge channels into feeds) plus HTTP validators.
+    Args:
+        videos (list): Video-like objects, newest first (at most K).
+        complete (bool): True if these are all of the channel's videos.
+    Returns:
+        dict: {"video_ids": [...], "upload_epochs": [...], "complete": bool, "etag": str, "last_modified": int}
+    """
+    entry = {
+        "video_ids": [video.video_id for video in videos],
+        "upload_epochs": [upload_epoch(video.upload_date) for video in videos],
+        "complete": complete,
+    }
+    entry.update(build_validators(videos) or {"etag": None, "last_modified": None})
+    return entry
+
+
+def serves_limit(entry, limit):
+    """
+    True if a cache entry holds a channel's first `limit` videos: it lists that many, or all of them.
+    Entries built from a short `latest_videos` row (or before the flag was cached) may not.
+    """
+    return len(entry["video_ids"]) >= limit or entry.get("complete", False)
+
+
+def normalize_cache_entry(value):
+    """
+    Normalizes a cached value to the dict format. Entries written before validators were cached
+    are plain lists of video ids; they are still served but carry no validators.
+    Args:
+        value: Raw value from the cache (None, list or dict).
+    Returns:
+        dict | None: Normalized entry, or None for a miss.
+    """
+    if not value:
+        return None
+    if isinstance(value, list):
+        return {"video_ids": value, "etag": None, "last_modified": None}
+    return value
@@ -0,0 +1,70 @@
+import json
+import logging
+
+from django.db.utils import OperationalError, ProgrammingError
+
+from videoservice import settings
+
+logger = logging.getLogger('videoservice')
+
+
+def periodic_task_definitions():
+    """
+    Returns the Celery Beat periodic tasks this service relies on. The adaptive refresh scheduler
+    and the fixed-interval cache refresh are alternatives: only one of them is enabled.
+    Returns:
+        list: Dicts with the task display name, Celery task path, interval (every, period) and
+        whether the task is enabled.
+    """
+    scheduler = getattr(settings, "REFRESH_SCHEDULER", {})
+    scheduler_enabled = scheduler.get("ENABLED", True)
+    return [
+        {
+            "name": "Refresh Video Cache",
+            "task": "videoservice.config.tasks.update_video_cache",
+            "every": 5,
+            "period": "minutes",
+            "enabled": not scheduler_enabled,
+        },
+        {
+            "name": "Refresh Due Channels",
+            "task": "videoservice.config.tasks.refresh_due_channels",
+            "every": scheduler.get("TICK_SECONDS", 60),
+            "period": "seconds",
+            "enabled": scheduler_enabled,
+        },
+    ]
+
+
+def provision_periodic_tasks():
+    """
+    Creates or updates the Celery Beat periodic tasks. Safe to run any number of times.
+    Returns:
+        list: (task name, created) tuples; empty if the database is not ready yet.
+    """
+    # Imported here so that importing this module never touches django_celery_beat models
+    from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+    results = []
+    try:
+        for definition in periodic_task_definitions():
+            schedule, _ = IntervalSchedule.objects.get_or_create(
+                every=definition["every"], period=definition["period"]
+            )
+            _, created = PeriodicTask.objects.update_or_create(
+                name=definition["name"],
+                defaults={
+                    "interval": schedule, "task": definition["task"], "args": json.dumps([]),
+                    "enabled": definition["enabled"],
+                },
+            )
+            logger.info(
+                f"{'Created' if created else 'Updated'} Celery Beat periodic task: {definition['task']}"
+                f"{'' if definition['enabled'] else ' (disabled)'}"
+            )
+            results.append((definition["name"], created))
+    except (OperationalError, ProgrammingError):
+        # Happens when django_celery_beat tables are not migrated yet
+        logger.warning("Database is not ready. Skipping Celery Beat setup for now.")
+        return []
+    return results
@@ -1,5 +1,8 @@
 import os
 from celery import Celery
+from celery.signals import before_task_publish
+
+from videoservice.config.queues import stamp_sent_at
 
 # Set Django settings module (Make sure this points to your correct settings file)
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "videoservice.settings")
@@ -9,5 +12,8 @@ celery_app = Celery("videoservice")
 # Load Celery configuration from Django settings
 celery_app.config_from_object("django.conf:settings", namespace="CELERY")
 
-# Auto-discover tasks in all installed Django apps
-celery_app.autodiscover_tasks()
+# Tasks live in videoservice.config.tasks, not in an app-level tasks module
+celery_app.autodiscover_tasks(["videoservice.config"])
+
+# Stamp every published task so per-queue lag can be read from the broker
+before_task_publish.connect(stamp_sent_at, weak=False)
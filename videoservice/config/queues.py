@@ -0,0 +1,64 @@
+import json
+import logging
+import time
+
+logger = logging.getLogger('videoservice')
+
+# Queues in the order workers should be started; routing lives in settings.CELERY_TASK_ROUTES
+REFRESH_QUEUE = "refresh"  # latency-sensitive: beat-driven cache and channel refreshes
+INGEST_QUEUE = "ingest"  # bulk writes of upstream videos (late ack: redelivered if a worker dies)
+BOOKKEEPING_QUEUE = "bookkeeping"  # low priority: last_accessed updates, safe to drop when stale
+DEFAULT_QUEUE = "celery"
+QUEUES = (REFRESH_QUEUE, INGEST_QUEUE, BOOKKEEPING_QUEUE, DEFAULT_QUEUE)
+
+SENT_AT_HEADER = "sent_at"
+
+
+def stamp_sent_at(headers=None, **kwargs):
+    """`before_task_publish` handler: records the publish time so queue lag can be measured."""
+    if headers is not None:
+        headers.setdefault(SENT_AT_HEADER, time.time())
+
+
+def message_age(raw_message, now=None):
+    """
+    Returns how long a raw Redis-transport message has been waiting.
+    Args:
+        raw_message (bytes | str): Message as stored in the broker list.
+        now (float, optional): Current epoch time.
+    Returns:
+        float | None: Age in seconds, or None if the message carries no publish time.
+    """
+    try:
+        sent_at = json.loads(raw_message).get("headers", {}).get(SENT_AT_HEADER)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    if sent_at is None:
+        return None
+    return max(0.0, (now or time.time()) - float(sent_at))
+
+
+def queue_stats(app, queues=QUEUES, now=None):
+    """
+    Reads per-queue depth and lag (age of the oldest waiting message) from the Redis broker.
+    Kombu pushes new messages to the head of the list and workers pop from the tail,
+    so the oldest message is the last element.
+    Args:
+        app (Celery): The Celery app whose broker is inspected.
+        queues (tuple): Queue names.
+        now (float, optional): Current epoch time.
+    Returns:
+        dict: Queue name -> {"depth": int, "lag_seconds": float | None}.
+    Raises:
+        ValueError: If the broker is not Redis.
+    """
+    stats = {}
+    with app.connection_for_read() as connection:
+        if connection.transport.driver_type != "redis":
+            raise ValueError(f"Queue stats need the Redis broker, not {connection.transport.driver_type}")
+        client = connection.default_channel.client
+        for queue in queues:
+            depth = client.llen(queue)
+            oldest = client.lindex(queue, -1) if depth else None
+            stats[queue] = {"depth": depth, "lag_seconds": message_age(oldest, now) if oldest else None}
+    return stats
@@ -1,18 +1,28 @@
 
 import logging
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from celery import shared_task
-from django.core.cache import cache
-from django.db import transaction
 from videoservice import settings
+from videoservice.common.resilient_cache import resilient_cache as cache
+from videoservice.common.video_cache import build_cache_entry, latest_top_k, recent_videos_key
 from videoservice.models.channel import Channel
-from videoservice.models.video import Video
+from videoservice.models.video_record import VideoRecord
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.prefetch_service import ChannelPrefetchService
 
 logger = logging.getLogger("videoservice")
-CACHE_LIMIT = 5
-THREAD_POOL = ThreadPoolExecutor(max_workers=5)
+CACHE_LIMIT = getattr(settings, "VIDEO_CACHE_REFRESH_LIMIT", 1000)
+CACHE_REFRESH_CHUNK_SIZE = 500
+THREAD_POOL_MAX_WORKERS = 5
+# Queued last_accessed updates older than this are dropped instead of run late
+LAST_ACCESSED_TASK_EXPIRES = 300
+# A prefetch is only worth anything right after the access that predicted it
+PREFETCH_TASK_EXPIRES = 30
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
 
 try:
     from celery import shared_task
@@ -20,6 +30,19 @@ try:
 except ImportError:
     CELERY_AVAILABLE = False
 
+def get_thread_pool():
+    """
+    Returns the fallback ThreadPoolExecutor, creating it on first use
+    (so processes that never need it, e.g. Celery workers, never start its threads).
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        with _thread_pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(max_workers=THREAD_POOL_MAX_WORKERS)
+    return _thread_pool
+
+
 def async_store_videos_in_db(channel_id, videos_data):
     """
     Store videos asynchronously, using Celery if available, otherwise use ThreadPoolExecutor.
@@ -29,9 +52,10 @@ def async_store_videos_in_db(channel_id, videos_data):
         store_videos_in_db.delay(channel_id, videos_data)
     else:
         logger.info(f"Using ThreadPoolExecutor (fallback) for async task: Storing videos for {channel_id}")
-        THREAD_POOL.submit(store_videos_in_db_sync, channel_id, videos_data)
+        get_thread_pool().submit(store_videos_in_db_sync, channel_id, videos_data)
 
-@shared_task
+# Late ack: ingest is an idempotent upsert, so a message is redelivered rather than lost if the worker dies
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
 def store_videos_in_db(channel_id, videos_data):
     """Asynchronously store fetched videos in the database (Celery)."""
     logger.info(f"Celery Task: Storing videos for channel {channel_id}")
@@ -40,27 +64,12 @@ def store_videos_in_db(channel_id, videos_data):
 def store_videos_in_db_sync(channel_id, videos_data):
     """Synchronous DB storage (used by Celery & ThreadPoolExecutor)."""
     try:
-        # Ensure the channel exists
-        channel, _ = Channel.objects.get_or_create(
-            channel_id=channel_id, defaults={"name": f"Mock Channel {channel_id}"}
+        # Upsert new/changed videos and refresh the channel's denormalized latest_videos in one transaction
+        result = VideoIngestService.store_videos(channel_id, videos_data)
+        logger.info(
+            f"Successfully stored videos for channel {channel_id}: {result['inserted']} inserted, "
+            f"{result['updated']} updated, {result['unchanged']} unchanged"
         )
-
-        # Prepare video objects for bulk insert
-        video_objects = [
-            Video(
-                video_id=video["video_id"],
-                video_title=video["video_title"],
-                upload_date=datetime.strptime(video["upload_date"], "%Y-%m-%d"),
-                channel=channel,
-            )
-            for video in videos_data
-        ]
-
-        # Bulk insert videos into DB (ignore conflicts)
-        with transaction.atomic():
-            Video.objects.bulk_create(video_objects, ignore_conflicts=True)
-
-        logger.info(f"Successfully stored {len(video_objects)} videos for channel {channel_id}")
     except Exception as e:
         logger.error(f"Failed to store videos for {channel_id}: {str(e)}")
 
@@ -72,12 +81,12 @@ def async_update_last_accessed(channel_id):
     """
     if CELERY_AVAILABLE and getattr(settings, "USE_CELERY", True):
         logger.info(f"Using Celery for async task: Updating last_accessed for {channel_id}")
-        update_last_accessed.delay(channel_id)  # ✅ Celery Async Task
+        update_last_accessed.apply_async((channel_id,), expires=LAST_ACCESSED_TASK_EXPIRES)  # ✅ Celery Async Task
     else:
         logger.info(f"Using ThreadPoolExecutor (fallback) for async task: Updating last_accessed for {channel_id}")
-        THREAD_POOL.submit(update_last_accessed_sync, channel_id)  # ✅ ThreadPoolExecutor Fallback
+        get_thread_pool().submit(update_last_accessed_sync, channel_id)  # ✅ ThreadPoolExecutor Fallback
 
-@shared_task
+@shared_task(ignore_result=True)
 def update_last_accessed(channel_id):
     """Celery task to update last_accessed timestamp."""
     logger.info(f"🚀 Celery Task Running: Updating last_accessed for {channel_id}")
@@ -92,26 +101,101 @@ def update_last_accessed_sync(channel_id):
         logger.error(f"❌ Failed to update last_accessed for {channel_id}: {str(e)}")
 
 
-## TODO Future implementation to implement cache update with LRU strategy
-@shared_task
-def update_video_cache():
-    """Background task to refresh Redis cache for the most active channels."""
-    logger.info("🚀 Running periodic video cache refresh...")
+def async_observe_channel_access(client_id, channel_id):
+    """
+    Records a channel access for co-access prefetching, off the request path.
+    Always runs in the thread pool: it is a couple of Redis round trips, not worth a Celery message.
+    """
+    get_thread_pool().submit(observe_channel_access_sync, client_id, channel_id)
+
+def observe_channel_access_sync(client_id, channel_id):
+    """Learns from the access and schedules a prefetch of the likely-next channels, within budget."""
+    try:
+        candidates = ChannelPrefetchService.admit(ChannelPrefetchService.observe(client_id, channel_id))
+        if candidates:
+            async_prefetch_channels(candidates)
+    except Exception as e:
+        logger.error(f"Failed to observe access to {channel_id}: {str(e)}")
 
-    # ✅ Fetch only the most recently accessed channels
-    active_channels = Channel.objects.order_by("-last_accessed")[:CACHE_LIMIT]
 
-    for channel in active_channels:
-        # Get latest 5 videos
-        videos = list(Video.objects.filter(channel=channel).order_by("-upload_date")[:5])
+def async_record_prefetch_hit(channel_id):
+    """Counts a cache hit towards the prefetch hit rate, off the request path (thread pool)."""
+    get_thread_pool().submit(record_prefetch_hit_sync, channel_id)
 
-        if videos:
-            video_ids = [video.video_id for video in videos]
-            cache_key = f"recent_videos:{channel.channel_id}"
+def record_prefetch_hit_sync(channel_id):
+    """Synchronous hit count (used by ThreadPoolExecutor)."""
+    try:
+        ChannelPrefetchService.record_hit(channel_id)
+    except Exception as e:
+        logger.error(f"Failed to record prefetch hit for {channel_id}: {str(e)}")
 
-            # ✅ Store video IDs in Redis with TTL
-            cache.set(cache_key, video_ids, timeout=300)
 
-    logger.info(f"✅ Updated Redis cache for {len(active_channels)} active channels.")
+def async_prefetch_channels(channel_ids):
+    """
+    Prefetches channels into the cache asynchronously.
+    Uses Celery if available; otherwise, falls back to ThreadPoolExecutor.
+    """
+    if CELERY_AVAILABLE and getattr(settings, "USE_CELERY", True):
+        logger.info(f"Using Celery for async task: Prefetching channels {channel_ids}")
+        prefetch_channels.apply_async((channel_ids,), expires=PREFETCH_TASK_EXPIRES)
+    else:
+        logger.info(f"Using ThreadPoolExecutor (fallback) for async task: Prefetching channels {channel_ids}")
+        get_thread_pool().submit(prefetch_channels_sync, channel_ids)
+
+@shared_task(ignore_result=True)
+def prefetch_channels(channel_ids):
+    """Celery task caching the recent videos of channels predicted to be requested next."""
+    logger.info(f"Celery Task: Prefetching channels {channel_ids}")
+    prefetch_channels_sync(channel_ids)
+
+def prefetch_channels_sync(channel_ids):
+    """Synchronous prefetch (used by Celery & ThreadPoolExecutor)."""
+    try:
+        ChannelPrefetchService.prefetch(channel_ids)
+    except Exception as e:
+        logger.error(f"Failed to prefetch channels {channel_ids}: {str(e)}")
+
+
+## TODO Future implementation to implement cache update with LRU strategy
+@shared_task(ignore_result=True)
+def update_video_cache():
+    """Background task to refresh Redis cache for the most active channels."""
+    logger.info("🚀 Running periodic video cache refresh...")
 
-    return "Cache Updated"
\ No newline at end of file
+    # ✅ One scan of the channel table: latest_videos already holds each channel's newest uploads
+    active_channels = (
+        Channel.objects.order_by("-last_accessed")
+        .values_list("channel_id", "latest_videos", "latest_videos_complete")[:CACHE_LIMIT]
+    )
+
+    refreshed = 0
+    entries = {}
+    for channel_id, latest_videos, complete in active_channels.iterator(chunk_size=CACHE_REFRESH_CHUNK_SIZE):
+        # Rows short of K entries are left to the request path, which reads the video table
+        top_videos, complete = latest_top_k(latest_videos, complete)
+        if not top_videos:
+            continue
+        videos = [VideoRecord.from_latest_entry(entry, channel_id) for entry in top_videos]
+        entries[recent_videos_key(channel_id)] = build_cache_entry(videos, complete)
+        if len(entries) >= CACHE_REFRESH_CHUNK_SIZE:
+            cache.set_many(entries, timeout=300)
+            refreshed += len(entries)
+            entries = {}
+
+    if entries:
+        cache.set_many(entries, timeout=300)
+        refreshed += len(entries)
+
+    logger.info(f"✅ Updated Redis cache for {refreshed} active channels.")
+
+    return "Cache Updated"
+
+
+@shared_task(ignore_result=True)
+def refresh_due_channels():
+    """Periodic task: refresh channels whose adaptive refresh time is due (see ChannelRefreshScheduler)."""
+    # Imported here: the scheduler depends on VideoService, which imports this module
+    from videoservice.services.refresh_scheduler import ChannelRefreshScheduler
+
+    logger.info("🚀 Running adaptive channel refresh tick...")
+    return ChannelRefreshScheduler.refresh_due_channels()
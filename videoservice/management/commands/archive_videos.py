@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from videoservice.models.channel import Channel
+from videoservice.services.archive_service import VideoArchiveService
+
+
+class Command(BaseCommand):
+    """
+    Moves videos older than the hot retention window from `videoservice_video` into the archive.
+
+    Channels are processed in primary-key order, one transaction per chunk, so the command
+    can be interrupted and resumed with `--start-after`. Run it periodically (e.g. nightly).
+    """
+
+    help = "Archive videos uploaded before the hot retention window."
+
+    def add_arguments(self, parser):
+        config = VideoArchiveService.config()
+        parser.add_argument(
+            "--hot-months", type=int, default=config.get("HOT_MONTHS", 3),
+            help="Full months kept hot besides the current one.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=config.get("BATCH_SIZE", 500),
+            help="Channels processed per transaction.",
+        )
+        parser.add_argument("--start-after", default="", help="Resume after this channel_id.")
+
+    def handle(self, *args, **options):
+        cutoff = VideoArchiveService.hot_cutoff(hot_months=options["hot_months"])
+        batch_size = options["batch_size"]
+        last_channel_id = options["start_after"]
+        archived = 0
+
+        while True:
+            channel_ids = list(
+                Channel.objects.filter(channel_id__gt=last_channel_id)
+                .order_by("channel_id")
+                .values_list("channel_id", flat=True)[:batch_size]
+            )
+            if not channel_ids:
+                break
+
+            archived += VideoArchiveService.archive_channels(channel_ids, cutoff)
+            last_channel_id = channel_ids[-1]
+            self.stdout.write(f"Archived {archived} videos so far (last: {last_channel_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Archive complete: {archived} videos uploaded before {cutoff.date()}."))
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from videoservice.common.video_cache import latest_videos_limit
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.models.video_record import VideoRecord
+
+
+class Command(BaseCommand):
+    """
+    Recomputes `Channel.latest_videos` (and `latest_videos_complete`) from the video table.
+    Run it after raising LATEST_VIDEOS_LIMIT or RECENT_VIDEOS_TOP_K: until then, channels whose rows
+    hold fewer than K entries are read from the video table on every cache miss.
+
+    Channels are processed in primary-key order, one locked chunk per transaction, so the command
+    can be interrupted and resumed with `--start-after`. Each channel's newest videos are read
+    with a LIMIT query on the (channel, -upload_date) index, so the cost per channel does not
+    grow with its (or the table's) total number of videos.
+    """
+
+    help = "Backfill the denormalized Channel.latest_videos column from existing videos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Channels processed per transaction.")
+        parser.add_argument("--start-after", default="", help="Resume after this channel_id.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_channel_id = options["start_after"]
+        limit = latest_videos_limit()
+        total = 0
+
+        while True:
+            # Rows stay locked from the read to the write, so an ingest merging into the same
+            # channels waits instead of having its entries overwritten (see VideoIngestService)
+            with transaction.atomic():
+                channel_ids = list(
+                    Channel.objects.select_for_update()
+                    .filter(channel_id__gt=last_channel_id)
+                    .order_by("channel_id")
+                    .values_list("channel_id", flat=True)[:batch_size]
+                )
+                if not channel_ids:
+                    break
+
+                # One row past the limit tells whether the channel has older videos
+                latest = {
+                    channel_id: [
+                        Channel.to_latest_entry(VideoRecord.from_row(row))
+                        for row in Video.objects.filter(channel_id=channel_id)
+                        .order_by("-upload_date")
+                        .values_list(*VideoRecord.FIELDS)[:limit + 1]
+                    ]
+                    for channel_id in channel_ids
+                }
+                channels = [
+                    Channel(channel_id=channel_id, latest_videos=entries[:limit], latest_videos_complete=len(entries) <= limit)
+                    for channel_id, entries in latest.items()
+                ]
+                Channel.objects.bulk_update(channels, ["latest_videos", "latest_videos_complete"])
+
+            total += len(channel_ids)
+            last_channel_id = channel_ids[-1]
+            self.stdout.write(f"Backfilled {total} channels (last: {last_channel_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfill complete: {total} channels updated."))
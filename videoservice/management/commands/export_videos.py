@@ -0,0 +1,54 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from videoservice.services.export_service import VideoExportService
+
+
+class Command(BaseCommand):
+    """
+    Streams videos to a file (or stdout) as NDJSON, optionally gzip-compressed.
+
+    Rows are read with keyset pagination and written chunk by chunk, so memory use
+    stays flat no matter how large the export is.
+    """
+
+    help = "Export videos as NDJSON, optionally filtered by channel and upload date range."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", default="-", help="Output file path ('-' for stdout).")
+        parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output.")
+        parser.add_argument(
+            "--channel-id", action="append", default=[], dest="channel_ids",
+            help="Channel to export; may be repeated (default: all channels).",
+        )
+        parser.add_argument("--uploaded-after", help="Inclusive lower bound on upload_date.")
+        parser.add_argument("--uploaded-before", help="Exclusive upper bound on upload_date.")
+        parser.add_argument("--chunk-size", type=int, default=VideoExportService.CHUNK_SIZE, help="Rows per query.")
+
+    def handle(self, *args, **options):
+        try:
+            uploaded_after = VideoExportService.parse_upload_bound(options["uploaded_after"], "uploaded_after")
+            uploaded_before = VideoExportService.parse_upload_bound(options["uploaded_before"], "uploaded_before")
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+
+        chunks = VideoExportService.iter_ndjson(
+            options["channel_ids"],
+            uploaded_after,
+            uploaded_before,
+            compress=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+
+        if options["output"] == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Export written to {options['output']}"))
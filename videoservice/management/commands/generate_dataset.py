@@ -0,0 +1,113 @@
+import json
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from videoservice.common.video_cache import latest_videos_limit
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.services.stats_service import ChannelStatsService
+from videoservice.stress_test.dataset_generator import SyntheticDataset
+
+
+class Command(BaseCommand):
+    """
+    Generates a deterministic synthetic dataset and writes it straight into the database.
+
+    Channels are written in chunks, one transaction per chunk, with their videos,
+    `latest_videos` and upload statistics. Optionally also writes an upstream fixture
+    (for the stub upstream) and an NDJSON request trace (for load tests).
+    """
+
+    help = "Generate a seeded large-scale dataset of channels and videos for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--channels", type=int, default=1000, help="Number of channels.")
+        parser.add_argument("--videos", type=int, default=50000, help="Approximate total number of videos.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of videos per channel.")
+        parser.add_argument("--span-days", type=int, default=3650, help="Maximum upload history per channel.")
+        parser.add_argument("--end-date", default="2025-01-01", help="Newest possible upload day (YYYY-MM-DD).")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Channels written per transaction.")
+        parser.add_argument("--no-db", action="store_true", help="Only write the fixture/trace files.")
+        parser.add_argument("--fixture", help="Write an upstream fixture JSON (channel_id -> videos) here.")
+        parser.add_argument("--fixture-videos", type=int, default=20, help="Newest videos per channel in the fixture.")
+        parser.add_argument("--trace", help="Write an NDJSON request trace here.")
+        parser.add_argument("--trace-requests", type=int, default=100000)
+        parser.add_argument("--trace-rps", type=float, default=200.0, help="Mean request rate of the trace.")
+        parser.add_argument("--trace-zipf", type=float, default=1.0, help="Zipf exponent of channel popularity.")
+
+    def handle(self, *args, **options):
+        try:
+            end_date = datetime.strptime(options["end_date"], "%Y-%m-%d").replace(tzinfo=dt_timezone.utc)
+        except ValueError:
+            raise CommandError("--end-date must be YYYY-MM-DD")
+        dataset = SyntheticDataset(
+            options["channels"], options["videos"], seed=options["seed"], zipf_s=options["zipf"],
+            span_days=options["span_days"], end_date=end_date,
+        )
+        started = time.perf_counter()
+
+        if not options["no_db"]:
+            self.write_database(dataset, options["batch_size"])
+        if options["fixture"]:
+            self.write_fixture(dataset, options["fixture"], options["fixture_videos"])
+        if options["trace"]:
+            with open(options["trace"], "w") as file:
+                for request in dataset.iter_trace(options["trace_requests"], options["trace_rps"], options["trace_zipf"]):
+                    file.write(json.dumps(request) + "\n")
+            self.stdout.write(f"Wrote {options['trace_requests']} requests to {options['trace']}")
+
+        total_videos = sum(dataset.video_counts())
+        self.stdout.write(self.style.SUCCESS(
+            f"Dataset seed={dataset.seed}: {dataset.channels} channels, {total_videos} videos "
+            f"in {time.perf_counter() - started:.1f}s."
+        ))
+
+    def write_database(self, dataset, batch_size):
+        limit = latest_videos_limit()
+        written = 0
+        for start in range(0, dataset.channels, batch_size):
+            channels = []
+            videos = []
+            for index, channel_id, channel_videos in dataset.iter_channels(start, start + batch_size):
+                rows = [
+                    Video(
+                        video_id=video["video_id"],
+                        video_title=video["video_title"],
+                        upload_date=video["upload_date"],
+                        channel_id=channel_id,
+                        content_hash=Video.compute_content_hash(video["video_title"], video["upload_date"]),
+                    )
+                    for video in channel_videos
+                ]
+                channels.append(Channel(
+                    channel_id=channel_id,
+                    name=f"Synthetic Channel {index}",
+                    latest_videos=[Channel.to_latest_entry(video) for video in rows[:limit]],
+                    latest_videos_complete=len(rows) <= limit,
+                ))
+                videos.extend(rows)
+
+            with transaction.atomic():
+                Channel.objects.bulk_create(channels, ignore_conflicts=True, batch_size=1000)
+                Video.objects.bulk_create(videos, ignore_conflicts=True, batch_size=5000)
+            ChannelStatsService.rebuild([channel.channel_id for channel in channels])
+
+            written += len(videos)
+            self.stdout.write(f"Wrote {start + len(channels)} channels, {written} videos")
+
+    def write_fixture(self, dataset, path, videos_per_channel):
+        # Streamed so the whole fixture never has to be held in memory
+        with open(path, "w") as file:
+            file.write("{")
+            for index, channel_id, channel_videos in dataset.iter_channels():
+                entries = [
+                    dict(video, upload_date=video["upload_date"].strftime("%Y-%m-%d"))
+                    for video in channel_videos[:videos_per_channel]
+                ]
+                file.write(("," if index else "") + f"\n{json.dumps(channel_id)}: {json.dumps(entries)}")
+            file.write("\n}\n")
+        self.stdout.write(f"Wrote upstream fixture for {dataset.channels} channels to {path}")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from videoservice.config.beat_schedule import provision_periodic_tasks
+
+
+class Command(BaseCommand):
+    """
+    Creates or updates the Celery Beat periodic tasks.
+
+    Runs automatically after `migrate`; this command exists for deployments that
+    provision schedules separately. It is idempotent.
+    """
+
+    help = "Create or update the Celery Beat periodic tasks used by the video service."
+
+    def handle(self, *args, **options):
+        results = provision_periodic_tasks()
+        for name, created in results:
+            self.stdout.write(f"{'Created' if created else 'Updated'}: {name}")
+        self.stdout.write(self.style.SUCCESS(f"Provisioned {len(results)} periodic tasks."))
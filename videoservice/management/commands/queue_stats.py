@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from videoservice.config.celery import celery_app
+from videoservice.config.queues import QUEUES, queue_stats
+
+
+class Command(BaseCommand):
+    """
+    Prints the depth and lag (age of the oldest waiting task) of every Celery queue.
+
+    Lag is measured from the `sent_at` header stamped on publish, so tasks queued by
+    an older release show no lag until they drain.
+    """
+
+    help = "Show per-queue Celery depth and lag."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queue", action="append", help="Queue to inspect (repeatable, default: all).")
+
+    def handle(self, *args, **options):
+        try:
+            stats = queue_stats(celery_app, tuple(options["queue"] or QUEUES))
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for queue, values in stats.items():
+            lag = f"{values['lag_seconds']:.1f}s" if values["lag_seconds"] is not None else "-"
+            self.stdout.write(f"{queue:<12} depth={values['depth']:<8} lag={lag}")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from videoservice.services.search_service import VideoSearchService
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the full-text indexes on video titles from the hot and archive video tables.
+
+    The index is maintained automatically on every write; run this to backfill rows that
+    predate it, after a SQLite VACUUM, or to repair a damaged index.
+    """
+
+    help = "Rebuild the full-text search index on video titles."
+
+    def handle(self, *args, **options):
+        if not VideoSearchService.rebuild_index():
+            raise CommandError("This database backend has no full-text index; search uses a title scan.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from videoservice.models.channel import Channel
+from videoservice.services.stats_service import ChannelStatsService
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the per-channel upload statistics rollups from the video table.
+
+    Channels are processed in primary-key order, one chunk at a time, so the command
+    can be interrupted and resumed with `--start-after`.
+    """
+
+    help = "Rebuild the per-channel upload statistics rollups from existing videos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Channels processed per transaction.")
+        parser.add_argument("--start-after", default="", help="Resume after this channel_id.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_channel_id = options["start_after"]
+        total = 0
+
+        while True:
+            channel_ids = list(
+                Channel.objects.filter(channel_id__gt=last_channel_id)
+                .order_by("channel_id")
+                .values_list("channel_id", flat=True)[:batch_size]
+            )
+            if not channel_ids:
+                break
+
+            buckets = ChannelStatsService.rebuild(channel_ids)
+            total += len(channel_ids)
+            last_channel_id = channel_ids[-1]
+            self.stdout.write(f"Rebuilt {total} channels, {buckets} daily buckets in batch (last: {last_channel_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuild complete: {total} channels updated."))
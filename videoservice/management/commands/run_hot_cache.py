@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from videoservice.common.hot_cache import hot_cache_config
+from videoservice.services.hot_cache_service import HotCacheRefresher
+
+
+class Command(BaseCommand):
+    """
+    Runs the single writer of the host-local hot cache: every `--interval` seconds it stores the
+    recent videos of the most recently accessed channels. Run exactly one per host, next to the
+    web workers, which read the same file without locking.
+    """
+
+    help = "Fill the host-local shared-memory hot cache (one process per host)."
+
+    def add_arguments(self, parser):
+        config = hot_cache_config()
+        parser.add_argument("--once", action="store_true", help="Run a single refresh and exit.")
+        parser.add_argument(
+            "--interval", type=float, default=config.get("REFRESH_INTERVAL", 15),
+            help="Seconds between refreshes.",
+        )
+        parser.add_argument(
+            "--channels", type=int, default=config.get("CHANNELS", 10000),
+            help="Most recently accessed channels kept hot.",
+        )
+
+    def handle(self, *args, **options):
+        hot_cache = HotCacheRefresher.open_cache()
+        self.stdout.write(f"Hot cache at {hot_cache.path}: {hot_cache.slots} slots of {hot_cache.slot_size} bytes")
+        try:
+            while True:
+                started = time.monotonic()
+                stored = HotCacheRefresher.refresh(hot_cache, limit=options["channels"])
+                self.stdout.write(f"Stored {stored} channels in {time.monotonic() - started:.2f}s")
+                if options["once"]:
+                    break
+                time.sleep(max(0.0, options["interval"] - (time.monotonic() - started)))
+        finally:
+            hot_cache.close()
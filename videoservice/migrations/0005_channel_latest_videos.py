@@ -0,0 +1,18 @@
+# Generated by Django 4.2.18 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoservice", "0004_rename_title_video_video_title"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="latest_videos",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
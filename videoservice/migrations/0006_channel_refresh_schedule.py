@@ -0,0 +1,23 @@
+# Generated by Django 4.2.18 on 2026-10-19 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoservice", "0005_channel_latest_videos"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="next_refresh_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="refresh_interval",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Full-text index on Video.video_title.
+#
+# - SQLite: an external-content FTS5 table kept in sync by triggers on videoservice_video.
+#   It references the implicit rowid, so run `manage.py rebuild_search_index` after a VACUUM.
+# - PostgreSQL: a generated tsvector column with a GIN index.
+# Other backends get no index; search falls back to a title scan.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS videoservice_video_fts
+    USING fts5(video_title, content='videoservice_video', content_rowid='rowid', tokenize='porter unicode61')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videoservice_video_fts_ai AFTER INSERT ON videoservice_video BEGIN
+        INSERT INTO videoservice_video_fts(rowid, video_title) VALUES (new.rowid, new.video_title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videoservice_video_fts_ad AFTER DELETE ON videoservice_video BEGIN
+        INSERT INTO videoservice_video_fts(videoservice_video_fts, rowid, video_title)
+        VALUES ('delete', old.rowid, old.video_title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videoservice_video_fts_au AFTER UPDATE OF video_title ON videoservice_video BEGIN
+        INSERT INTO videoservice_video_fts(videoservice_video_fts, rowid, video_title)
+        VALUES ('delete', old.rowid, old.video_title);
+        INSERT INTO videoservice_video_fts(rowid, video_title) VALUES (new.rowid, new.video_title);
+    END
+    """,
+    "INSERT INTO videoservice_video_fts(videoservice_video_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS videoservice_video_fts_au",
+    "DROP TRIGGER IF EXISTS videoservice_video_fts_ad",
+    "DROP TRIGGER IF EXISTS videoservice_video_fts_ai",
+    "DROP TABLE IF EXISTS videoservice_video_fts",
+]
+
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE videoservice_video ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(video_title, ''))) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS videoservice_video_search_idx ON videoservice_video USING GIN (search_vector)",
+]
+
+POSTGRESQL_REVERSE = [
+    "DROP INDEX IF EXISTS videoservice_video_search_idx",
+    "ALTER TABLE videoservice_video DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_statements(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoservice", "0006_channel_refresh_schedule"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements(
+                {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRESQL_FORWARD}
+            ),
+            run_statements(
+                {"sqlite": SQLITE_REVERSE, "postgresql": POSTGRESQL_REVERSE}
+            ),
+        ),
+    ]
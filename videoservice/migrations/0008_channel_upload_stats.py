@@ -0,0 +1,62 @@
+# Generated by Django 4.2.18 on 2026-10-19 02:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoservice", "0007_video_title_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChannelUploadStats",
+            fields=[
+                (
+                    "channel",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="upload_stats",
+                        serialize=False,
+                        to="videoservice.channel",
+                    ),
+                ),
+                ("video_count", models.PositiveIntegerField(default=0)),
+                ("first_upload_at", models.DateTimeField()),
+                ("last_upload_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ChannelDailyUploads",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("video_count", models.PositiveIntegerField(default=0)),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_uploads",
+                        to="videoservice.channel",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="channeldailyuploads",
+            constraint=models.UniqueConstraint(
+                fields=("channel", "day"), name="unique_channel_daily_uploads"
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.18 on 2026-10-19 03:00
+
+from django.db import migrations, models
+
+# On PostgreSQL the archive is recreated as a table partitioned by upload month. Partitioned
+# tables need the partition key in the primary key; video_id stays unique in practice because
+# rows only enter the archive when they leave videoservice_video. Monthly partitions are
+# created by the archive_videos command; the default partition catches anything else.
+POSTGRESQL_PARTITIONED_ARCHIVE = [
+    "DROP TABLE videoservice_videoarchive",
+    """
+    CREATE TABLE videoservice_videoarchive (
+        video_id varchar(255) NOT NULL,
+        video_title varchar(255) NOT NULL,
+        upload_date timestamp with time zone NOT NULL,
+        channel_id varchar(255) NOT NULL,
+        archived_at timestamp with time zone NOT NULL,
+        PRIMARY KEY (video_id, upload_date)
+    ) PARTITION BY RANGE (upload_date)
+    """,
+    "CREATE INDEX archive_channel_recent_idx ON videoservice_videoarchive (channel_id, upload_date DESC)",
+    "CREATE INDEX archive_upload_date_idx ON videoservice_videoarchive (upload_date)",
+    "CREATE TABLE videoservice_videoarchive_default PARTITION OF videoservice_videoarchive DEFAULT",
+]
+
+
+def partition_archive(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRESQL_PARTITIONED_ARCHIVE:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoservice", "0008_channel_upload_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VideoArchive",
+            fields=[
+                (
+                    "video_id",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("video_title", models.CharField(max_length=255)),
+                ("upload_date", models.DateTimeField()),
+                ("channel_id", models.CharField(max_length=255)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-upload_date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="video",
+            index=models.Index(
+                fields=["channel", "-upload_date"], name="video_channel_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoarchive",
+            index=models.Index(
+                fields=["channel_id", "-upload_date"], name="archive_channel_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoarchive",
+            index=models.Index(fields=["upload_date"], name="archive_upload_date_idx"),
+        ),
+        migrations.RunPython(partition_archive, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.18 on 2026-10-19 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoservice", "0009_video_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="video",
+            name="content_hash",
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.18 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoservice", "0011_video_archive_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="latest_videos_complete",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,4 +1,10 @@
+from datetime import timezone as dt_timezone
+
 from django.db import models
+from django.utils import timezone
+
+from videoservice.common.video_cache import latest_videos_limit
+
 
 class Channel(models.Model):
     """
@@ -9,11 +15,65 @@ class Channel(models.Model):
         name (str, optional): The name of the channel (nullable).
         created_at (datetime): Timestamp indicating when the channel was created.
         last_accessed (datetime): Timestamp indicating the last time the channel was accessed.
+        latest_videos (list): Denormalized copy of the channel's newest videos, newest first.
+            Each entry is a dict with `video_id`, `video_title` and an ISO-8601 `upload_date`.
+        latest_videos_complete (bool): True when `latest_videos` lists every video of the channel.
+            False when it may have older ones, or is not known (rows denormalized before the flag
+            existed, possibly with a smaller limit: `backfill_latest_videos` recomputes both).
+        next_refresh_at (datetime, optional): When the refresh scheduler should next refresh the channel.
+        refresh_interval (int, optional): Refresh interval in seconds learned from upload cadence and access.
     """
     channel_id = models.CharField(max_length=255, unique=True, primary_key=True)
     name = models.CharField(max_length=255, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     last_accessed = models.DateTimeField(auto_now=True)
+    latest_videos = models.JSONField(default=list, blank=True)
+    latest_videos_complete = models.BooleanField(default=False)
+    next_refresh_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    refresh_interval = models.PositiveIntegerField(null=True, blank=True)
 
     def __str__(self):
         return self.channel_id
+
+    @staticmethod
+    def to_latest_entry(video):
+        """
+        Converts a Video instance into its compact `latest_videos` representation.
+        Args:
+            video (Video): Video instance (saved or not).
+        Returns:
+            dict: Entry with video_id, video_title and a UTC ISO-8601 upload_date.
+        """
+        upload_date = video.upload_date
+        if timezone.is_naive(upload_date):
+            upload_date = timezone.make_aware(upload_date)
+        return {
+            "video_id": video.video_id,
+            "video_title": video.video_title,
+            "upload_date": upload_date.astimezone(dt_timezone.utc).isoformat(),
+        }
+
+    def merge_latest_videos(self, videos, prefer_incoming=False):
+        """
+        Merges newly stored videos into `latest_videos`, keeping only the newest entries, and
+        clears `latest_videos_complete` once entries are dropped.
+        By default existing entries win over incoming ones with the same video_id, mirroring
+        `bulk_create(ignore_conflicts=True)`; upsert ingest passes `prefer_incoming=True`.
+        The caller is responsible for saving.
+        Args:
+            videos (iterable): Video instances that were just written for this channel.
+            prefer_incoming (bool): Replace existing entries with the incoming version.
+        Returns:
+            list: The updated `latest_videos` list.
+        """
+        merged = {entry["video_id"]: entry for entry in self.latest_videos or []}
+        for video in videos:
+            if prefer_incoming:
+                merged[video.video_id] = self.to_latest_entry(video)
+            else:
+                merged.setdefault(video.video_id, self.to_latest_entry(video))
+
+        limit = latest_videos_limit()
+        self.latest_videos_complete = self.latest_videos_complete and len(merged) <= limit
+        self.latest_videos = sorted(merged.values(), key=lambda entry: entry["upload_date"], reverse=True)[:limit]
+        return self.latest_videos
@@ -0,0 +1,45 @@
+from django.db import models
+
+from videoservice.models.channel import Channel
+
+
+class ChannelUploadStats(models.Model):
+    """
+    Per-channel upload totals, maintained incrementally on ingest.
+
+    Attributes:
+        channel (OneToOneField): The channel these totals belong to (Primary Key).
+        video_count (int): Number of videos ingested for the channel.
+        first_upload_at (datetime): Upload time of the channel's oldest video.
+        last_upload_at (datetime): Upload time of the channel's newest video.
+    """
+    channel = models.OneToOneField(Channel, on_delete=models.CASCADE, primary_key=True, related_name="upload_stats")
+    video_count = models.PositiveIntegerField(default=0)
+    first_upload_at = models.DateTimeField()
+    last_upload_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.channel_id}: {self.video_count} videos"
+
+
+class ChannelDailyUploads(models.Model):
+    """
+    Number of videos a channel uploaded on one UTC day, maintained incrementally on ingest.
+    Coarser buckets (weeks) are summed from these rows.
+
+    Attributes:
+        channel (ForeignKey): The channel the bucket belongs to.
+        day (date): UTC upload day.
+        video_count (int): Videos uploaded that day.
+    """
+    channel = models.ForeignKey(Channel, on_delete=models.CASCADE, related_name="daily_uploads")
+    day = models.DateField()
+    video_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["channel", "day"], name="unique_channel_daily_uploads"),
+        ]
+
+    def __str__(self):
+        return f"{self.channel_id} {self.day}: {self.video_count}"
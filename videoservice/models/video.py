@@ -1,5 +1,8 @@
+import hashlib
+
 from django.db import models
 
+from videoservice.common.video_cache import upload_epoch
 from videoservice.models.channel import Channel
 
 class Video(models.Model):
@@ -11,14 +14,35 @@ class Video(models.Model):
         video_title (str): The title of the video.
         upload_date (datetime): Timestamp indicating when the video was uploaded.
         channel (ForeignKey): Foreign key linking the video to its respective channel.
+        content_hash (str): Digest of the upstream-provided content (title, upload time), used by
+            upsert ingest to skip unchanged rows. Null for rows stored before it existed.
     """
     video_id = models.CharField(max_length=255, primary_key=True)
     video_title = models.CharField(max_length=255)
     upload_date = models.DateTimeField()
     channel = models.ForeignKey(Channel, on_delete=models.CASCADE, related_name="videos")
+    # Nullable so adding it is a plain ADD COLUMN: SQLite would otherwise rebuild the table (and drop its FTS triggers)
+    content_hash = models.CharField(max_length=16, null=True, blank=True)
 
     class Meta:
         ordering = ['-upload_date']
+        indexes = [
+            # Latest-N per channel: an index range scan instead of sorting the channel's videos
+            models.Index(fields=["channel", "-upload_date"], name="video_channel_recent_idx"),
+        ]
 
     def __str__(self):
         return self.video_title
+
+    @staticmethod
+    def compute_content_hash(video_title, upload_date):
+        """
+        Returns the content digest of a video's mutable upstream fields.
+        Args:
+            video_title (str): The title of the video.
+            upload_date (datetime | str): Upload time (naive values are taken as UTC).
+        Returns:
+            str: 16 hex characters.
+        """
+        payload = f"{video_title}\x1f{upload_epoch(upload_date)}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
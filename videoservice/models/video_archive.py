@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class VideoArchive(models.Model):
+    """
+    Cold storage for videos older than the hot retention window (see `archive_videos`).
+    On PostgreSQL the table is declaratively partitioned by upload month, so date-bounded
+    queries only touch the matching partitions; on other backends it is a plain table.
+
+    Attributes:
+        video_id (str): Unique identifier for the video.
+        video_title (str): The title of the video.
+        upload_date (datetime): Timestamp indicating when the video was uploaded (partition key).
+        channel_id (str): Identifier of the channel the video belongs to.
+        archived_at (datetime): When the row was moved out of `videoservice_video`.
+    """
+    video_id = models.CharField(max_length=255, primary_key=True)
+    video_title = models.CharField(max_length=255)
+    upload_date = models.DateTimeField()
+    channel_id = models.CharField(max_length=255)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-upload_date']
+        indexes = [
+            models.Index(fields=["channel_id", "-upload_date"], name="archive_channel_recent_idx"),
+            models.Index(fields=["upload_date"], name="archive_upload_date_idx"),
+        ]
+
+    def __str__(self):
+        return self.video_title
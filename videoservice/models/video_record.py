@@ -0,0 +1,68 @@
+from datetime import datetime
+
+
+class VideoRecord:
+    """
+    Compact read model of a video for the request path: four slots, no model `_state`, no field
+    descriptors and no signals, so building one costs a fraction of a `Video` instance.
+    Accepted wherever the read path takes a video (`VideoSerializer`, cache entries, validators,
+    `Channel.to_latest_entry`); it is never saved.
+    """
+
+    __slots__ = ("video_id", "video_title", "upload_date", "channel_id")
+
+    # Column order of `values_list` rows accepted by `from_row`
+    FIELDS = ("video_id", "video_title", "upload_date", "channel_id")
+
+    def __init__(self, video_id, video_title, upload_date, channel_id=None):
+        self.video_id = video_id
+        self.video_title = video_title
+        self.upload_date = upload_date
+        self.channel_id = channel_id
+
+    def __repr__(self):
+        return f"VideoRecord({self.video_id!r}, {self.video_title!r}, {self.upload_date!r}, {self.channel_id!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, VideoRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds a record from a `values_list(*VideoRecord.FIELDS)` row."""
+        return cls(*row)
+
+    @classmethod
+    def from_latest_entry(cls, entry, channel_id):
+        """
+        Builds a record from a `Channel.latest_videos` entry (no DB access).
+        Args:
+            entry (dict): Entry produced by `Channel.to_latest_entry`.
+            channel_id (str): The channel the entry belongs to.
+        Returns:
+            VideoRecord
+        """
+        return cls(entry["video_id"], entry["video_title"], datetime.fromisoformat(entry["upload_date"]), channel_id)
+
+    @classmethod
+    def from_upstream(cls, video, channel_id=None):
+        """
+        Builds a record from an upstream API (or fixture) video dict.
+        Args:
+            video (dict): Dict with video_id, video_title and a YYYY-MM-DD upload_date.
+            channel_id (str, optional): The channel, if it is stored locally.
+        Returns:
+            VideoRecord
+        """
+        return cls(
+            video["video_id"], video["video_title"], datetime.strptime(video["upload_date"], "%Y-%m-%d"), channel_id
+        )
+
+    def serializable_value(self, field_name):
+        """Mirrors `Model.serializable_value`, used by DRF for the `channel` primary-key field."""
+        if field_name == "channel":
+            return self.channel_id
+        return getattr(self, field_name)
@@ -6,8 +6,9 @@ class VideoSerializer(serializers.ModelSerializer):
     """
     Serializer for the Video model.
 
-    Serializes all fields of the Video model for API responses.
+    Serializes the fields of the Video model for API responses
+    (`content_hash` is internal to ingest and not exposed).
     """
     class Meta:
         model = Video
-        fields = '__all__'
+        exclude = ("content_hash",)
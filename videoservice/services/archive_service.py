@@ -0,0 +1,123 @@
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from videoservice import settings
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.models.video_archive import VideoArchive
+
+logger = logging.getLogger('videoservice')
+
+
+class VideoArchiveService:
+    """
+    Service layer for hot/cold video storage.
+    - `videoservice_video` (hot) keeps the recent months plus every channel's latest videos,
+      so the API's working set and its indexes stay small.
+    - `videoservice_videoarchive` (cold) receives older rows; on PostgreSQL it is partitioned
+      by upload month and partitions are created on demand before rows are moved.
+    """
+
+    ARCHIVE_TABLE = "videoservice_videoarchive"
+
+    @classmethod
+    def config(cls):
+        return getattr(settings, "VIDEO_RETENTION", {})
+
+    @staticmethod
+    def month_start(value):
+        """Returns midnight UTC on the first day of `value`'s month."""
+        value = value.astimezone(dt_timezone.utc)
+        return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+    @staticmethod
+    def add_months(month, count):
+        """Returns the first day of the month `count` months after `month` (count may be negative)."""
+        index = month.year * 12 + month.month - 1 + count
+        return month.replace(year=index // 12, month=index % 12 + 1)
+
+    @classmethod
+    def hot_cutoff(cls, now=None, hot_months=None):
+        """
+        Returns the month boundary before which videos are cold.
+        Args:
+            now (datetime, optional): Reference time (default: now).
+            hot_months (int, optional): Full months kept hot besides the current one.
+        Returns:
+            datetime: First day (UTC) of the oldest hot month.
+        """
+        hot_months = cls.config().get("HOT_MONTHS", 3) if hot_months is None else hot_months
+        return cls.add_months(cls.month_start(now or timezone.now()), -hot_months)
+
+    @classmethod
+    def partition_name(cls, month):
+        return f"{cls.ARCHIVE_TABLE}_y{month.year}m{month.month:02d}"
+
+    @classmethod
+    def ensure_partitions(cls, upload_dates):
+        """
+        Creates the monthly archive partitions covering `upload_dates` (PostgreSQL only).
+        Args:
+            upload_dates (iterable): Upload datetimes about to be archived.
+        """
+        if connection.vendor != "postgresql":
+            return
+        months = {cls.month_start(upload_date) for upload_date in upload_dates}
+        with connection.cursor() as cursor:
+            for month in sorted(months):
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {cls.partition_name(month)} PARTITION OF {cls.ARCHIVE_TABLE} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [month, cls.add_months(month, 1)],
+                )
+
+    @classmethod
+    def archive_channels(cls, channel_ids, cutoff):
+        """
+        Moves the channels' videos uploaded before `cutoff` into the archive, in one transaction.
+        Videos listed in `Channel.latest_videos` always stay hot; channels whose latest videos
+        are not denormalized yet are skipped.
+        Args:
+            channel_ids (list): Channels to process.
+            cutoff (datetime): Videos uploaded before this are moved.
+        Returns:
+            int: Number of videos archived.
+        """
+        with transaction.atomic():
+            keep = set()
+            archivable = []
+            for channel_id, latest_videos in (
+                Channel.objects.select_for_update().filter(channel_id__in=channel_ids)
+                .values_list("channel_id", "latest_videos")
+            ):
+                if latest_videos:
+                    archivable.append(channel_id)
+                    keep.update(entry["video_id"] for entry in latest_videos)
+
+            cold = [
+                VideoArchive(video_id=video_id, video_title=video_title, upload_date=upload_date, channel_id=channel_id)
+                for video_id, video_title, upload_date, channel_id in (
+                    Video.objects.filter(channel_id__in=archivable, upload_date__lt=cutoff)
+                    .values_list("video_id", "video_title", "upload_date", "channel_id")
+                )
+                if video_id not in keep
+            ]
+            if not cold:
+                return 0
+
+            cls.ensure_partitions(video.upload_date for video in cold)
+            VideoArchive.objects.bulk_create(cold, ignore_conflicts=True, batch_size=1000)
+            video_ids = [video.video_id for video in cold]
+            for start in range(0, len(video_ids), 1000):
+                Video.objects.filter(video_id__in=video_ids[start:start + 1000]).delete()
+
+        logger.info(f"Archived {len(cold)} videos uploaded before {cutoff.date()} for {len(archivable)} channels")
+        return len(cold)
+
+    @classmethod
+    def archived_ids(cls, video_ids):
+        """Returns the subset of `video_ids` stored in the archive."""
+        return set(VideoArchive.objects.filter(video_id__in=video_ids).values_list("video_id", flat=True))
@@ -0,0 +1,130 @@
+import json
+import logging
+import zlib
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from videoservice.models.video import Video
+from videoservice.models.video_archive import VideoArchive
+
+logger = logging.getLogger('videoservice')
+
+
+class VideoExportService:
+    """
+    Service layer for bulk video exports.
+    - Scans the hot table and then the archive, each in primary-key order with keyset pagination,
+      one chunk at a time. Upload date bounds let PostgreSQL prune archive partitions.
+    - Encodes rows as NDJSON (one JSON object per line), optionally gzip-compressed on the fly.
+    Memory use is bounded by the chunk size regardless of how many rows are exported.
+    """
+
+    CHUNK_SIZE = 2000
+    EXPORT_FIELDS = ("video_id", "video_title", "upload_date", "channel_id")
+
+    @classmethod
+    def parse_upload_bound(cls, value, field):
+        """
+        Parses an upload date filter given as YYYY-MM-DD or an ISO-8601 datetime.
+        Args:
+            value (str): Raw filter value (may be empty).
+            field (str): Parameter name, used in validation errors.
+        Returns:
+            datetime | None: Timezone-aware datetime, or None when no value is given.
+        """
+        if not value:
+            return None
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                parsed_date = parse_date(value)
+                parsed = datetime.combine(parsed_date, time.min) if parsed_date else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({field: ["Enter a valid date (YYYY-MM-DD) or ISO-8601 datetime."]})
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    @classmethod
+    def iter_videos(cls, channel_ids=None, uploaded_after=None, uploaded_before=None, chunk_size=None):
+        """
+        Yields matching videos as tuples using keyset pagination on `video_id`: hot videos first,
+        then archived ones.
+        Args:
+            channel_ids (list, optional): Restrict the export to these channels.
+            uploaded_after (datetime, optional): Inclusive lower bound on upload_date.
+            uploaded_before (datetime, optional): Exclusive upper bound on upload_date.
+            chunk_size (int, optional): Rows fetched per query.
+        Yields:
+            tuple: (video_id, video_title, upload_date, channel_id)
+        """
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        for model in (Video, VideoArchive):
+            queryset = model.objects.order_by("video_id")
+            if channel_ids:
+                queryset = queryset.filter(channel_id__in=channel_ids)
+            if uploaded_after:
+                queryset = queryset.filter(upload_date__gte=uploaded_after)
+            if uploaded_before:
+                queryset = queryset.filter(upload_date__lt=uploaded_before)
+            queryset = queryset.values_list(*cls.EXPORT_FIELDS)
+
+            last_video_id = None
+            while True:
+                page = queryset.filter(video_id__gt=last_video_id) if last_video_id is not None else queryset
+                rows = list(page[:chunk_size])
+                yield from rows
+                if len(rows) < chunk_size:
+                    break
+                last_video_id = rows[-1][0]
+
+    @classmethod
+    def iter_ndjson(cls, channel_ids=None, uploaded_after=None, uploaded_before=None, compress=False, chunk_size=None):
+        """
+        Yields the export as NDJSON byte chunks, one chunk per database page.
+        Args:
+            channel_ids (list, optional): Restrict the export to these channels.
+            uploaded_after (datetime, optional): Inclusive lower bound on upload_date.
+            uploaded_before (datetime, optional): Exclusive upper bound on upload_date.
+            compress (bool): Emit a gzip stream instead of plain NDJSON.
+            chunk_size (int, optional): Rows fetched per query.
+        Yields:
+            bytes: Encoded (and optionally compressed) NDJSON data.
+        """
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+        lines = []
+        exported = 0
+        for video_id, video_title, upload_date, channel_id in cls.iter_videos(
+            channel_ids, uploaded_after, uploaded_before, chunk_size
+        ):
+            lines.append(encoder.encode({
+                "video_id": video_id,
+                "video_title": video_title,
+                "upload_date": upload_date.isoformat(),
+                "channel_id": channel_id,
+            }))
+            if len(lines) >= chunk_size:
+                exported += len(lines)
+                chunk = cls._encode_lines(lines, compressor)
+                lines = []
+                if chunk:
+                    yield chunk
+
+        exported += len(lines)
+        chunk = cls._encode_lines(lines, compressor) if lines else b""
+        if compressor:
+            chunk += compressor.flush()
+        if chunk:
+            yield chunk
+        logger.info(f"Exported {exported} videos as NDJSON")
+
+    @staticmethod
+    def _encode_lines(lines, compressor):
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        return compressor.compress(data) if compressor else data
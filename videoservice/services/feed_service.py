@@ -0,0 +1,215 @@
+import base64
+import heapq
+import json
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from videoservice import settings
+from videoservice.common.admission import AdmissionControl
+from videoservice.common.resilient_cache import resilient_cache as cache
+from videoservice.common.video_cache import build_cache_entry, latest_top_k, recent_videos_key, upload_epoch
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.models.video_record import VideoRecord
+from videoservice.services.video_service import VideoService
+
+logger = logging.getLogger('videoservice')
+
+
+# Position above every feed item
+UNKNOWN = (float("inf"), "")
+
+
+def feed_position(item):
+    """Sort key of a feed item (upload epoch, video_id); the feed is in descending order of it."""
+    return item[0], item[1]
+
+
+class VideoFeedService:
+    """
+    Service layer for the merged "latest uploads" feed of a set of channels, newest first.
+    - Reads the channels' cached top-K lists (video ids and upload times) in one cache round trip.
+      Channels that miss are loaded from their denormalized `latest_videos` in one query, and cached.
+    - K-way heap-merges the lists. A list not flagged `complete` may be truncated: the channel can
+      have older, uncached videos. If a page runs past the end of such a list, the truncated channels are
+      read from the video table with a single keyset query limited to the page size; like any
+      other miss, that query holds a slot of the miss budget (AdmissionControl.miss_slot).
+    - Titles of the page's videos are read in one primary-key query.
+    Pages continue with a keyset cursor on (upload time, video_id), so a page costs about the same
+    at any depth, whatever the size of the channels' history.
+    """
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+    MAX_CHANNELS = 500
+
+    @classmethod
+    def encode_cursor(cls, position):
+        """Encodes the keyset position after a feed item as an opaque URL-safe string."""
+        payload = json.dumps(list(position), separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        """
+        Decodes a cursor produced by `encode_cursor`.
+        Returns:
+            tuple | None: (upload epoch, video_id), or None when no cursor is given.
+        Raises:
+            ValidationError: If the cursor is malformed.
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            epoch, video_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return int(epoch), str(video_id)
+        except (ValueError, TypeError):
+            raise ValidationError({"cursor": ["Invalid pagination cursor."]})
+
+    @classmethod
+    def feed(cls, channel_ids, limit=None, cursor=None):
+        """
+        Returns one page of the merged feed of the given channels.
+        Args:
+            channel_ids (list): Channels to merge (e.g. a user's subscriptions).
+            limit (int, optional): Page size (default 20, max 100).
+            cursor (str, optional): `next_cursor` from the previous page.
+        Returns:
+            tuple: (list of VideoRecord objects, newest first, next cursor or None)
+        Raises:
+            ValidationError: If no or too many channels are given, or the cursor is malformed.
+            ServiceOverloaded: If the page needs the video table while the miss budget is exhausted.
+        """
+        channel_ids = list(dict.fromkeys(channel_ids))
+        if not channel_ids:
+            raise ValidationError({"channel_id": ["This query parameter is required."]})
+        if len(channel_ids) > cls.MAX_CHANNELS:
+            raise ValidationError({"channel_id": [f"Enter at most {cls.MAX_CHANNELS} channels."]})
+        limit = min(limit or cls.DEFAULT_LIMIT, cls.MAX_LIMIT)
+        after = cls.decode_cursor(cursor)
+
+        streams = cls.cached_streams(channel_ids)
+        # One extra item tells whether another page follows
+        page, truncated = cls.merge_page(streams, after, limit + 1)
+        if truncated:
+            logger.info(f"Feed page ran past the cached videos of {len(truncated)} channels, reading the DB")
+            for channel_id in truncated:
+                del streams[channel_id]
+            with AdmissionControl.miss_slot():
+                streams[None] = (cls.load_older(truncated, after, limit + 1), True)
+            page, _ = cls.merge_page(streams, after, limit + 1)
+
+        next_cursor = cls.encode_cursor(feed_position(page[limit - 1])) if len(page) > limit else None
+        return cls.load_records(page[:limit]), next_cursor
+
+    @classmethod
+    def cached_streams(cls, channel_ids):
+        """
+        Returns each channel's known newest videos, read from the cache (or its `latest_videos`).
+        Args:
+            channel_ids (list): Channels of the feed.
+        Returns:
+            dict: channel_id -> (items sorted newest first, complete); items are
+            (upload epoch, video_id, channel_id, VideoRecord or None) and `complete` is the flag
+            stored with the list: False when the channel may have older videos than those listed.
+        """
+        keys = {recent_videos_key(channel_id): channel_id for channel_id in channel_ids}
+        entries = cache.get_many(list(keys)) if settings.USE_REDIS else {}
+
+        streams = {}
+        missing = []
+        for key, channel_id in keys.items():
+            entry = entries.get(key)
+            # Entries cached before upload times were stored cannot be merged: reload them
+            if isinstance(entry, dict) and entry.get("upload_epochs"):
+                items = [
+                    (epoch, video_id, channel_id, None)
+                    for video_id, epoch in zip(entry["video_ids"], entry["upload_epochs"])
+                ]
+                streams[channel_id] = (sorted(items, key=feed_position, reverse=True), entry.get("complete", False))
+            else:
+                missing.append(channel_id)
+
+        if missing:
+            fresh = {}
+            rows = Channel.objects.filter(channel_id__in=missing).values_list(
+                "channel_id", "latest_videos", "latest_videos_complete"
+            )
+            for channel_id, latest_videos, complete in rows:
+                # A row short of K entries lists nothing reliable: the whole channel is read from the DB
+                top_videos, complete = latest_top_k(latest_videos, complete)
+                videos = [VideoRecord.from_latest_entry(entry, channel_id) for entry in top_videos or []]
+                items = [(upload_epoch(video.upload_date), video.video_id, channel_id, video) for video in videos]
+                streams[channel_id] = (sorted(items, key=feed_position, reverse=True), complete)
+                if videos:
+                    fresh[recent_videos_key(channel_id)] = build_cache_entry(videos, complete)
+            if fresh and settings.USE_REDIS:
+                cache.set_many(fresh, timeout=VideoService.CACHE_EXPIRY)
+        return streams
+
+    @staticmethod
+    def merge_page(streams, after, size):
+        """
+        K-way merges the streams from the keyset position `after` on.
+        Args:
+            streams (dict): Output of `cached_streams`.
+            after (tuple | None): Position of the last item of the previous page.
+            size (int): Number of items wanted.
+        Returns:
+            tuple: (page items, channels to read from the DB). The channel list is empty when the
+            page is complete: either full, or every stream was known to its end.
+        """
+        sources = [
+            [item for item in items if after is None or feed_position(item) < after]
+            for items, _ in streams.values()
+        ]
+        # Below the last listed video of a possibly truncated channel the order is unknown; an
+        # empty one (its row was too short to list anything) leaves nothing known
+        horizon = max(
+            (feed_position(items[-1]) if items else UNKNOWN for items, complete in streams.values() if not complete),
+            default=None,
+        )
+        page = []
+        for item in heapq.merge(*sources, key=feed_position, reverse=True):
+            if horizon is not None and feed_position(item) < horizon:
+                break
+            page.append(item)
+            if len(page) == size:
+                return page, []
+        return page, [channel_id for channel_id, (_, complete) in streams.items() if not complete]
+
+    @staticmethod
+    def load_older(channel_ids, after, size):
+        """
+        Reads the newest `size` videos of the channels after the keyset position, in one query.
+        Returns:
+            list: Feed items, newest first.
+        """
+        queryset = Video.objects.filter(channel_id__in=channel_ids)
+        if after is not None:
+            epoch, video_id = after
+            uploaded = datetime.fromtimestamp(epoch, tz=dt_timezone.utc)
+            queryset = queryset.filter(Q(upload_date__lt=uploaded) | Q(upload_date=uploaded, video_id__lt=video_id))
+        rows = queryset.order_by("-upload_date", "-video_id").values_list(*VideoRecord.FIELDS)[:size]
+        records = [VideoRecord.from_row(row) for row in rows]
+        return [(upload_epoch(record.upload_date), record.video_id, record.channel_id, record) for record in records]
+
+    @staticmethod
+    def load_records(page):
+        """
+        Returns the page's videos as records, reading those known only by id in one primary-key query.
+        Videos deleted since they were cached are skipped.
+        """
+        ids = [video_id for _, video_id, _, record in page if record is None]
+        loaded = {}
+        if ids:
+            loaded = {
+                row[0]: VideoRecord.from_row(row)
+                for row in Video.objects.filter(video_id__in=ids).values_list(*VideoRecord.FIELDS)
+            }
+        records = [record or loaded.get(video_id) for _, video_id, _, record in page]
+        return [record for record in records if record is not None]
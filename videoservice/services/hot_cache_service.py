@@ -0,0 +1,75 @@
+import json
+import logging
+import time
+
+from videoservice.common.hot_cache import SharedHotCache, hot_cache_config
+from videoservice.common.video_cache import build_validators, latest_top_k, recent_videos_key
+from videoservice.models.channel import Channel
+from videoservice.models.video_record import VideoRecord
+from videoservice.serializers.video_serializer import VideoSerializer
+
+logger = logging.getLogger('videoservice')
+
+
+class HotCacheRefresher:
+    """
+    Writer side of the host-local hot cache: periodically stores the pre-serialized recent videos
+    of the most recently accessed channels, read from their denormalized `latest_videos`.
+    Run exactly one refresher per host (`manage.py run_hot_cache`).
+    """
+
+    @classmethod
+    def open_cache(cls):
+        """Creates (or re-opens) the cache file described by `settings.HOT_CACHE` for writing."""
+        config = hot_cache_config()
+        return SharedHotCache.create(config["PATH"], config.get("SLOTS", 16384), config.get("SLOT_SIZE", 4096))
+
+    @staticmethod
+    def build_payload(channel_id, latest_videos, complete):
+        """
+        Builds the cached payload of a channel: its serialized recent videos and HTTP validators.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            latest_videos (list): The channel's `latest_videos` entries, newest first.
+            complete (bool): The channel's `latest_videos_complete`.
+        Returns:
+            bytes | None: JSON payload, or None if the channel has no videos or its row holds
+            fewer than K entries of a longer history (served from the video table instead).
+        """
+        top_videos, _ = latest_top_k(latest_videos, complete)
+        videos = [VideoRecord.from_latest_entry(entry, channel_id) for entry in top_videos or []]
+        if not videos:
+            return None
+        return json.dumps(
+            {"videos": VideoSerializer(videos, many=True).data, "validators": build_validators(videos)},
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    @classmethod
+    def refresh(cls, hot_cache, limit=None, ttl=None):
+        """
+        Stores the payloads of the `limit` most recently accessed channels.
+        Args:
+            hot_cache (SharedHotCache): Writable cache.
+            limit (int, optional): Number of channels, defaults to HOT_CACHE["CHANNELS"].
+            ttl (int, optional): Entry lifetime in seconds, defaults to HOT_CACHE["TTL"].
+        Returns:
+            int: Number of channels stored.
+        """
+        config = hot_cache_config()
+        limit = limit or config.get("CHANNELS", 10000)
+        ttl = ttl or config.get("TTL", 60)
+        now = time.time()
+        stored = skipped = 0
+        rows = (
+            Channel.objects.order_by("-last_accessed")
+            .values_list("channel_id", "latest_videos", "latest_videos_complete")[:limit]
+        )
+        for channel_id, latest_videos, complete in rows.iterator(chunk_size=1000):
+            payload = cls.build_payload(channel_id, latest_videos or [], complete)
+            if payload is not None and hot_cache.put(recent_videos_key(channel_id), payload, ttl, now=now):
+                stored += 1
+            else:
+                skipped += 1
+        logger.info(f"Hot cache refreshed: {stored} channels stored, {skipped} skipped")
+        return stored
@@ -0,0 +1,183 @@
+import logging
+from datetime import datetime
+
+from django.db import transaction
+
+from videoservice import settings
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.models.video_archive import VideoArchive
+from videoservice.services.stats_service import ChannelStatsService
+
+logger = logging.getLogger('videoservice')
+
+
+class VideoIngestService:
+    """
+    Service layer for writing upstream video data into the database.
+    - Compares incoming videos with stored ones and writes only new or changed rows
+      ("upsert" mode) or only new rows ("insert" mode), in one statement per batch.
+    - Keeps the denormalized `Channel.latest_videos` column up to date in the same transaction.
+    - Folds newly inserted videos into the per-channel upload statistics rollups.
+    - Invalidates the cached recent videos of channels whose data actually changed.
+    """
+
+    BULK_BATCH_SIZE = 1000
+    MODES = ("upsert", "insert")
+    UPSERT_FIELDS = ["video_title", "upload_date", "content_hash"]
+
+    @classmethod
+    def build_videos(cls, channel_id, videos_data):
+        """
+        Converts upstream video dicts into unsaved Video objects.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            videos_data (list): Dicts with video_id, video_title and upload_date (YYYY-MM-DD).
+        Returns:
+            list: Unsaved Video instances with their content hash set.
+        """
+        videos = []
+        for video in videos_data:
+            upload_date = datetime.strptime(video["upload_date"], "%Y-%m-%d")
+            videos.append(Video(
+                video_id=video["video_id"],
+                video_title=video["video_title"],
+                upload_date=upload_date,
+                channel_id=channel_id,
+                content_hash=Video.compute_content_hash(video["video_title"], upload_date),
+            ))
+        return videos
+
+    @classmethod
+    def store_videos(cls, channel_id, videos_data, mode=None):
+        """
+        Stores videos for a single channel and refreshes its `latest_videos`.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            videos_data (list): Upstream video dicts.
+            mode (str, optional): "upsert" or "insert" (default: settings.VIDEO_INGEST_MODE).
+        Returns:
+            dict: Counts of inserted, updated and unchanged videos.
+        """
+        return cls.bulk_store_videos({channel_id: videos_data}, mode=mode)
+
+    @classmethod
+    def classify_videos(cls, videos):
+        """
+        Splits incoming videos into new, changed and unchanged ones by comparing content hashes
+        with the stored rows (hot table and archive). Only the first occurrence of a video_id counts.
+        Archived videos are always unchanged: they are never rewritten into the hot table.
+        Args:
+            videos (list): Unsaved Video instances with `content_hash` set.
+        Returns:
+            tuple: (new videos, changed videos, number of unchanged videos)
+        """
+        video_ids = [video.video_id for video in videos]
+        stored_hashes = {}
+        archived = set()
+        for start in range(0, len(video_ids), cls.BULK_BATCH_SIZE):
+            batch = video_ids[start:start + cls.BULK_BATCH_SIZE]
+            for video_id, content_hash, video_title, upload_date in Video.objects.filter(
+                video_id__in=batch
+            ).values_list("video_id", "content_hash", "video_title", "upload_date"):
+                # Rows stored before content hashes existed are hashed on the fly
+                stored_hashes[video_id] = content_hash or Video.compute_content_hash(video_title, upload_date)
+            archived.update(VideoArchive.objects.filter(video_id__in=batch).values_list("video_id", flat=True))
+
+        new, changed, seen = [], [], set()
+        for video in videos:
+            if video.video_id in seen:
+                continue
+            seen.add(video.video_id)
+            if video.video_id in archived:
+                continue
+            stored_hash = stored_hashes.get(video.video_id)
+            if stored_hash is None:
+                new.append(video)
+            elif stored_hash != video.content_hash:
+                changed.append(video)
+        return new, changed, len(seen) - len(new) - len(changed)
+
+    @classmethod
+    def bulk_store_videos(cls, videos_by_channel, mode=None):
+        """
+        Stores videos for many channels in one transaction.
+        Channel rows are locked while videos are classified and `latest_videos` are merged, so
+        concurrent ingests for the same channel cannot lose each other's updates.
+        Upload statistics only count inserted videos; run `rebuild_upload_stats` if upstream
+        changes upload dates.
+        Args:
+            videos_by_channel (dict): Mapping of channel_id to a list of upstream video dicts.
+            mode (str, optional): "upsert" or "insert" (default: settings.VIDEO_INGEST_MODE).
+        Returns:
+            dict: Counts of inserted, updated and unchanged videos.
+        """
+        mode = mode or getattr(settings, "VIDEO_INGEST_MODE", "upsert")
+        if mode not in cls.MODES:
+            raise ValueError(f"Unknown ingest mode: {mode}")
+        result = {"inserted": 0, "updated": 0, "unchanged": 0}
+        if not videos_by_channel:
+            return result
+
+        channel_ids = list(videos_by_channel)
+        all_videos = [
+            video
+            for channel_id, videos_data in videos_by_channel.items()
+            for video in cls.build_videos(channel_id, videos_data)
+        ]
+
+        with transaction.atomic():
+            Channel.objects.bulk_create(
+                # A new channel has no videos yet: its (empty) latest_videos are complete
+                [
+                    Channel(channel_id=channel_id, name=f"Mock Channel {channel_id}", latest_videos_complete=True)
+                    for channel_id in channel_ids
+                ],
+                ignore_conflicts=True,
+                batch_size=cls.BULK_BATCH_SIZE,
+            )
+            channels = Channel.objects.select_for_update().in_bulk(channel_ids)
+
+            new_videos, changed_videos, unchanged = cls.classify_videos(all_videos)
+            if mode == "insert":
+                unchanged += len(changed_videos)
+                changed_videos = []
+            written = new_videos + changed_videos
+            if written:
+                Video.objects.bulk_create(
+                    written,
+                    update_conflicts=True,
+                    unique_fields=["video_id"],
+                    update_fields=cls.UPSERT_FIELDS,
+                    batch_size=cls.BULK_BATCH_SIZE,
+                )
+            ChannelStatsService.record_new_videos(new_videos)
+
+            written_by_channel = {}
+            for video in written:
+                written_by_channel.setdefault(video.channel_id, []).append(video)
+            for channel_id, videos in written_by_channel.items():
+                channels[channel_id].merge_latest_videos(videos, prefer_incoming=True)
+            Channel.objects.bulk_update(
+                [channels[channel_id] for channel_id in written_by_channel], ["latest_videos", "latest_videos_complete"],
+                batch_size=cls.BULK_BATCH_SIZE,
+            )
+            # Drop cached recent videos only once the new rows are visible to readers
+            if written_by_channel:
+                changed_channel_ids = list(written_by_channel)
+                transaction.on_commit(lambda: cls.invalidate_cache(changed_channel_ids))
+
+        result.update(inserted=len(new_videos), updated=len(changed_videos), unchanged=unchanged)
+        logger.info(
+            f"Ingested videos for {len(channel_ids)} channels: {result['inserted']} inserted, "
+            f"{result['updated']} updated, {result['unchanged']} unchanged"
+        )
+        return result
+
+    @classmethod
+    def invalidate_cache(cls, channel_ids):
+        """Drops the cached recent videos of the given channels."""
+        # Imported here: video_service imports the tasks module, which imports this service
+        from videoservice.services.video_service import VideoService
+
+        VideoService.invalidate_cached_videos(channel_ids)
@@ -0,0 +1,241 @@
+import logging
+
+from redis.exceptions import RedisError
+
+from videoservice import settings
+from videoservice.common.admission import AdmissionControl
+from videoservice.common.circuit_breaker import CircuitBreaker
+from videoservice.common.resilient_cache import resilient_cache
+from videoservice.common.video_cache import build_cache_entry, latest_top_k, recent_videos_key
+from videoservice.models.channel import Channel
+from videoservice.models.video_record import VideoRecord
+
+logger = logging.getLogger('videoservice')
+
+KEY_PREFIX = "videoservice:prefetch"
+
+# Adds one co-access observation "source -> ARGV[1]" to the source channel's association set.
+# Scores decay exponentially with ARGV[2] as half-life (applied lazily to the whole set, which
+# holds at most ARGV[3] members), so stale associations fade and the table stays bounded.
+OBSERVE_SCRIPT = """
+local half_life = tonumber(ARGV[2])
+local top_k = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local last = tonumber(redis.call('GET', KEYS[2])) or now
+local factor = math.pow(2, -math.max(0, now - last) / half_life)
+if factor < 0.999 then
+    local scored = redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES')
+    for i = 1, #scored, 2 do
+        redis.call('ZADD', KEYS[1], tonumber(scored[i + 1]) * factor, scored[i])
+    end
+end
+redis.call('ZINCRBY', KEYS[1], 1, ARGV[1])
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -(top_k + 1))
+redis.call('SET', KEYS[2], tostring(now), 'EX', ttl)
+redis.call('EXPIRE', KEYS[1], ttl)
+return 1
+"""
+
+
+def prefetch_config():
+    return getattr(settings, "PREFETCH", {})
+
+
+class ChannelPrefetchService:
+    """
+    Predictive prefetching of channels that are usually requested together.
+    - `observe` learns co-access from each client's recent request window: every channel requested
+      within WINDOW_SECONDS after another one strengthens the association "previous -> current".
+      Associations live in Redis, per source channel: the TOP_K strongest, exponentially decayed.
+    - The strongest associations of the requested channel become prefetch candidates; a global
+      token bucket (BUDGET_RATE channels per second) caps the extra DB load they cause.
+    - `prefetch` (a background task) caches the candidates' recent videos from their denormalized
+      `latest_videos`, in a single query. A marker key per prefetched channel, consumed by the
+      first hit, counts the hits; the cache entries themselves are never rewritten.
+    All Redis work is best effort: prefetching is skipped while the Redis cache is unhealthy.
+    """
+
+    _scripts = {}
+
+    @classmethod
+    def enabled(cls):
+        return settings.USE_REDIS and prefetch_config().get("ENABLED", False)
+
+    @classmethod
+    def redis_client(cls):
+        """Returns the raw Redis client, or None while the cache breaker reports Redis unhealthy."""
+        if resilient_cache.breaker.state != CircuitBreaker.CLOSED:
+            return None
+        return resilient_cache.backend._cache.get_client(write=True)
+
+    @staticmethod
+    def flag_key(channel_id):
+        return f"{KEY_PREFIX}:flag:{channel_id}"
+
+    @staticmethod
+    def association_keys(channel_id):
+        return f"{KEY_PREFIX}:assoc:{channel_id}", f"{KEY_PREFIX}:assoc_ts:{channel_id}"
+
+    @classmethod
+    def observe(cls, client_id, channel_id):
+        """
+        Records that `client_id` requested `channel_id` and returns the channels likely to follow.
+        Args:
+            client_id (str): Client identity (address or API key).
+            channel_id (str): The requested channel.
+        Returns:
+            list: Candidate channel ids, strongest association first.
+        """
+        config = prefetch_config()
+        window = config.get("WINDOW", 5)
+        client = cls.redis_client()
+        if client is None:
+            return []
+        recent_key = f"{KEY_PREFIX}:recent:{client_id}"
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.lrange(recent_key, 0, window - 1)
+            pipe.lpush(recent_key, channel_id)
+            pipe.ltrim(recent_key, 0, window - 1)
+            pipe.expire(recent_key, config.get("WINDOW_SECONDS", 120))
+            pipe.zrevrange(cls.association_keys(channel_id)[0], 0, config.get("MAX_CANDIDATES", 3) - 1, withscores=True)
+            previous, _, _, _, associations = pipe.execute()
+
+            previous = {value.decode() for value in previous}
+            sources = previous - {channel_id}
+            if sources:
+                if OBSERVE_SCRIPT not in cls._scripts:
+                    cls._scripts[OBSERVE_SCRIPT] = client.register_script(OBSERVE_SCRIPT)
+                script = cls._scripts[OBSERVE_SCRIPT]
+                pipe = client.pipeline(transaction=False)
+                for source in sources:
+                    script(
+                        keys=list(cls.association_keys(source)),
+                        args=[channel_id, config.get("HALF_LIFE", 86400), config.get("TOP_K", 16),
+                              config.get("ASSOCIATION_TTL", 7 * 86400)],
+                        client=pipe,
+                    )
+                pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Co-access observation failed: {e}")
+            return []
+
+        min_score = config.get("MIN_SCORE", 2.0)
+        return [
+            candidate.decode() for candidate, score in associations
+            if score >= min_score and candidate.decode() not in previous | {channel_id}
+        ]
+
+    @classmethod
+    def admit(cls, channel_ids):
+        """
+        Takes prefetch budget for the candidates.
+        Returns:
+            list: The candidates to prefetch (empty if the budget is exhausted or Redis unavailable).
+        """
+        if not channel_ids:
+            return []
+        config = prefetch_config()
+        result = AdmissionControl.take_bucket_tokens(
+            f"{KEY_PREFIX}:budget", config.get("BUDGET_RATE", 50), config.get("BUDGET_BURST", 100),
+            cost=len(channel_ids),
+        )
+        if not result or not result[0]:
+            cls.count("skipped_budget", len(channel_ids))
+            return []
+        return channel_ids
+
+    @classmethod
+    def prefetch(cls, channel_ids):
+        """
+        Caches the recent videos of channels that are not cached yet (one DB query).
+        Args:
+            channel_ids (list): Channels to prefetch.
+        Returns:
+            int: Number of channels cached.
+        """
+        keys = {recent_videos_key(channel_id): channel_id for channel_id in channel_ids}
+        cached = resilient_cache.get_many(list(keys))
+        missing = [channel_id for key, channel_id in keys.items() if key not in cached]
+        entries = {}
+        if missing:
+            rows = Channel.objects.filter(channel_id__in=missing).values_list(
+                "channel_id", "latest_videos", "latest_videos_complete"
+            )
+            for channel_id, latest_videos, complete in rows:
+                # Rows short of K entries are left to the request path, which reads the video table
+                top_videos, complete = latest_top_k(latest_videos, complete)
+                if not top_videos:
+                    continue
+                entries[recent_videos_key(channel_id)] = build_cache_entry(
+                    [VideoRecord.from_latest_entry(item, channel_id) for item in top_videos], complete
+                )
+            resilient_cache.set_many(entries, timeout=prefetch_config().get("CACHE_TTL", 300))
+            cls.mark_prefetched([keys[key] for key in entries])
+        cls.count("prefetched", len(entries))
+        cls.count("skipped_cached", len(cached))
+        logger.info(f"Prefetched {len(entries)} channels ({len(cached)} already cached)")
+        return len(entries)
+
+    @classmethod
+    def mark_prefetched(cls, channel_ids):
+        """Sets the marker of each prefetched channel, expiring with its cache entry."""
+        client = cls.redis_client() if channel_ids else None
+        if client is None:
+            return
+        ttl = prefetch_config().get("CACHE_TTL", 300)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for channel_id in channel_ids:
+                pipe.set(cls.flag_key(channel_id), 1, ex=ttl)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Could not mark prefetched channels: {e}")
+
+    @classmethod
+    def record_hit(cls, channel_id):
+        """
+        Counts a cache hit on a prefetched channel: consumes its marker, so each prefetch counts at
+        most once towards the hit rate. Runs off the request path (see `async_record_prefetch_hit`).
+        """
+        client = cls.redis_client()
+        if client is None:
+            return
+        try:
+            consumed = client.delete(cls.flag_key(channel_id))
+        except RedisError as e:
+            logger.debug(f"Could not consume the prefetch marker of {channel_id}: {e}")
+            return
+        if consumed:
+            cls.count("hits")
+
+    @classmethod
+    def count(cls, counter, amount=1):
+        client = cls.redis_client() if amount else None
+        if client is None:
+            return
+        try:
+            client.hincrby(f"{KEY_PREFIX}:stats", counter, amount)
+        except RedisError as e:
+            logger.debug(f"Could not count prefetch {counter}: {e}")
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns the prefetch counters and hit rate (prefetched entries that were later requested).
+        Returns:
+            dict: {"prefetched", "hits", "skipped_budget", "skipped_cached", "hit_rate"}
+        """
+        stats = dict.fromkeys(("prefetched", "hits", "skipped_budget", "skipped_cached"), 0)
+        client = cls.redis_client()
+        if client is not None:
+            try:
+                stats.update({
+                    counter.decode(): int(value) for counter, value in client.hgetall(f"{KEY_PREFIX}:stats").items()
+                })
+            except RedisError as e:
+                logger.warning(f"Could not read prefetch stats: {e}")
+        stats["hit_rate"] = round(stats["hits"] / stats["prefetched"], 4) if stats["prefetched"] else None
+        return stats
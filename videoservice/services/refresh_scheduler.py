@@ -0,0 +1,222 @@
+import logging
+import statistics
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from videoservice import settings
+from videoservice.common.exceptions import UpstreamOverloaded
+from videoservice.common.video_cache import latest_top_k
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.models.video_record import VideoRecord
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.video_service import VideoService
+
+logger = logging.getLogger('videoservice')
+
+
+class ChannelRefreshScheduler:
+    """
+    Adaptive per-channel refresh scheduler.
+    - Learns each channel's upload cadence from its `Video.upload_date` history and how recently
+      it was read from `Channel.last_accessed`.
+    - Keeps the next refresh time per channel in `Channel.next_refresh_at`; the index on that column
+      is the priority queue, so each tick pops the most overdue channels first.
+    - Refreshes due channels from upstream and re-caches them, within a global rate budget. Each
+      tick claims its channels (skipping rows another tick has locked and pushing their refresh
+      time out by CLAIM_SECONDS), so overlapping ticks never refresh a channel twice.
+    - A channel whose refresh fails is retried later with exponential backoff; only an open upstream
+      circuit or an overloaded upstream client ends the tick early.
+    Refresh work therefore follows how often channels actually change, not how many channels exist.
+    """
+
+    @classmethod
+    def config(cls):
+        return getattr(settings, "REFRESH_SCHEDULER", {})
+
+    @classmethod
+    def compute_refresh_interval(cls, upload_dates, last_accessed, now):
+        """
+        Computes how long to wait before refreshing a channel again.
+        The base interval is a fraction of the median gap between recent uploads; it is then
+        stretched for channels nobody has read for a while, and clamped to the configured bounds.
+        Args:
+            upload_dates (list): Recent upload datetimes, newest first.
+            last_accessed (datetime, optional): When the channel was last read.
+            now (datetime): Current time.
+        Returns:
+            int: Refresh interval in seconds.
+        """
+        config = cls.config()
+        min_interval = config.get("MIN_INTERVAL", 300)
+        max_interval = config.get("MAX_INTERVAL", 7 * 24 * 3600)
+
+        gaps = [
+            (newer - older).total_seconds()
+            for newer, older in zip(upload_dates, upload_dates[1:])
+        ]
+        if not gaps:
+            return max_interval
+
+        interval = max(statistics.median(gaps), 1) * config.get("CADENCE_FRACTION", 0.25)
+
+        if last_accessed:
+            idle_hours = max((now - last_accessed).total_seconds(), 0) / 3600
+            interval *= 2 ** (idle_hours / config.get("ACCESS_DECAY_HOURS", 24))
+
+        return int(min(max(interval, min_interval), max_interval))
+
+    @classmethod
+    def reschedule(cls, channel_id, last_accessed, now):
+        """
+        Recomputes and stores a channel's refresh interval and next refresh time.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            last_accessed (datetime, optional): When the channel was last read.
+            now (datetime): Current time.
+        Returns:
+            int: The new refresh interval in seconds.
+        """
+        upload_dates = list(
+            Video.objects.filter(channel_id=channel_id)
+            .order_by("-upload_date")
+            .values_list("upload_date", flat=True)[:cls.config().get("HISTORY_SIZE", 20)]
+        )
+        interval = cls.compute_refresh_interval(upload_dates, last_accessed, now)
+        Channel.objects.filter(channel_id=channel_id).update(
+            refresh_interval=interval, next_refresh_at=now + timedelta(seconds=interval)
+        )
+        return interval
+
+    @classmethod
+    def back_off(cls, channel_id, refresh_interval, now):
+        """
+        Pushes back a channel whose refresh failed, doubling its interval (within the bounds) on
+        every consecutive failure; the next successful refresh recomputes it from the cadence.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            refresh_interval (int, optional): The channel's current refresh interval in seconds.
+            now (datetime): Current time.
+        Returns:
+            int: The backoff interval in seconds.
+        """
+        config = cls.config()
+        interval = min(max(2 * (refresh_interval or 0), config.get("MIN_INTERVAL", 300)),
+                       config.get("MAX_INTERVAL", 7 * 24 * 3600))
+        Channel.objects.filter(channel_id=channel_id).update(
+            refresh_interval=interval, next_refresh_at=now + timedelta(seconds=interval)
+        )
+        return interval
+
+    @classmethod
+    def claim_due_channels(cls, limit, now):
+        """
+        Claims the most overdue channels for this tick: rows locked by a concurrent tick are
+        skipped, and the claimed rows' next refresh is pushed CLAIM_SECONDS out in the same
+        transaction, so no other tick picks them until this one reschedules (or releases) them.
+        Args:
+            limit (int): Maximum number of channels to claim.
+            now (datetime): Current time.
+        Returns:
+            list: (channel_id, last_accessed, refresh_interval, next_refresh_at) tuples, most overdue first.
+        """
+        with transaction.atomic():
+            due = list(
+                Channel.objects.select_for_update(skip_locked=True)
+                .filter(next_refresh_at__lte=now)
+                .order_by("next_refresh_at")
+                .values_list("channel_id", "last_accessed", "refresh_interval", "next_refresh_at")[:limit]
+            )
+            Channel.objects.filter(channel_id__in=[row[0] for row in due]).update(
+                next_refresh_at=now + timedelta(seconds=cls.config().get("CLAIM_SECONDS", 600))
+            )
+        return due
+
+    @classmethod
+    def refresh_budget(cls):
+        """Returns how many upstream refreshes one tick may perform."""
+        config = cls.config()
+        return max(1, int(config.get("RATE_BUDGET_PER_MINUTE", 600) * config.get("TICK_SECONDS", 60) / 60))
+
+    @classmethod
+    def schedule_new_channels(cls, limit, now):
+        """
+        Gives channels that were never scheduled a first refresh time without calling upstream.
+        Args:
+            limit (int): Maximum number of channels to schedule.
+            now (datetime): Current time.
+        Returns:
+            int: Number of channels scheduled.
+        """
+        unscheduled = list(
+            Channel.objects.filter(next_refresh_at__isnull=True).values_list("channel_id", "last_accessed")[:limit]
+        )
+        for channel_id, last_accessed in unscheduled:
+            cls.reschedule(channel_id, last_accessed, now)
+        return len(unscheduled)
+
+    @classmethod
+    def refresh_channel(cls, channel_id):
+        """
+        Refreshes one channel from upstream, stores new videos and re-caches the newest ones.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+        Returns:
+            bool: True if the channel's latest videos changed.
+        """
+        before = Channel.objects.filter(channel_id=channel_id).values_list("latest_videos", flat=True).first()
+        upstream_videos = VideoService.fetch_videos_from_upstream(channel_id)
+        if upstream_videos:
+            VideoIngestService.store_videos(channel_id, upstream_videos)
+
+        latest_videos, complete = Channel.objects.filter(channel_id=channel_id).values_list(
+            "latest_videos", "latest_videos_complete"
+        ).first()
+        # A row short of K entries is left to the request path, which reads the video table
+        top_videos, complete = latest_top_k(latest_videos, complete)
+        if top_videos:
+            VideoService.cache_videos(
+                channel_id, [VideoRecord.from_latest_entry(entry, channel_id) for entry in top_videos], complete
+            )
+        return latest_videos != before
+
+    @classmethod
+    def refresh_due_channels(cls, now=None):
+        """
+        Runs one scheduler tick: refreshes the most overdue channels within the rate budget.
+        Args:
+            now (datetime, optional): Current time (defaults to timezone.now()).
+        Returns:
+            dict: Counts of refreshed, changed, failed (backed off) and newly scheduled channels.
+        """
+        now = now or timezone.now()
+        budget = cls.refresh_budget()
+        due = cls.claim_due_channels(budget, now)
+
+        refreshed = changed = failed = 0
+        for position, (channel_id, last_accessed, refresh_interval, _) in enumerate(due):
+            try:
+                changed += cls.refresh_channel(channel_id)
+            except UpstreamOverloaded:
+                logger.warning(f"Upstream overloaded, stopping refresh tick after {refreshed} channels")
+                # Unclaim the rest: they keep their place at the head of the queue
+                Channel.objects.bulk_update(
+                    [Channel(channel_id=row[0], next_refresh_at=row[3]) for row in due[position:]],
+                    ["next_refresh_at"],
+                )
+                break
+            except Exception as e:
+                failed += 1
+                interval = cls.back_off(channel_id, refresh_interval, now)
+                logger.error(f"Refresh of channel {channel_id} failed, retrying in {interval}s: {e}")
+                continue
+            refreshed += 1
+            cls.reschedule(channel_id, last_accessed, now)
+
+        scheduled = cls.schedule_new_channels(budget, now)
+        logger.info(
+            f"Refresh tick: {refreshed} refreshed, {changed} changed, {failed} failed, {scheduled} newly scheduled"
+        )
+        return {"refreshed": refreshed, "changed": changed, "failed": failed, "scheduled": scheduled}
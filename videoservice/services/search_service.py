@@ -0,0 +1,210 @@
+import base64
+import hashlib
+import json
+import logging
+import re
+import uuid
+
+from django.db import connection
+from rest_framework.exceptions import ValidationError
+
+from videoservice import settings
+from videoservice.common.resilient_cache import resilient_cache as cache
+from videoservice.models.video import Video
+from videoservice.models.video_archive import VideoArchive
+from videoservice.models.video_record import VideoRecord
+
+logger = logging.getLogger('videoservice')
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_snapshot_key(snapshot_id):
+    """Returns the cache key holding the ranked video ids of a paginated search."""
+    return f"search_snapshot:{snapshot_id}"
+
+
+class VideoSearchService:
+    """
+    Service layer for full-text search over video titles, hot and archived.
+    - SQLite: FTS5 tables `videoservice_video_fts` / `videoservice_videoarchive_fts`, ranked by BM25.
+    - PostgreSQL: GIN-indexed `search_vector` columns, ranked by `ts_rank`.
+    The indexes are created by migrations 0007 (hot table) and 0011 (archive) and maintained by the
+    database itself (triggers / generated column), so every write path, archiving included, keeps
+    them in sync. Each table is searched through its own index, with the channel filter applied in
+    each branch, and the matches are combined.
+    Results are ordered by (score DESC, video_id). Scores depend on the whole index (BM25 weighs
+    terms by corpus statistics), so a cursor cannot hold a score: the first page ranks up to
+    MAX_RESULTS ids once, stores them in the shared cache, and cursors are offsets into that snapshot.
+    """
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+    MAX_RESULTS = 1000
+    SNAPSHOT_EXPIRY = 600  # seconds a search can be paged through before it is ranked again
+
+    @classmethod
+    def tokenize(cls, query):
+        """Returns the word tokens of a user query; punctuation and query operators are dropped."""
+        return TOKEN_PATTERN.findall(query or "")[:32]
+
+    @classmethod
+    def encode_cursor(cls, snapshot_id, offset):
+        """Encodes a position in a ranking snapshot as an opaque URL-safe string."""
+        payload = json.dumps([snapshot_id, offset], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        """
+        Decodes a cursor produced by `encode_cursor`.
+        Returns:
+            tuple | None: (snapshot id, offset), or None when no cursor is given.
+        Raises:
+            ValidationError: If the cursor is malformed.
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            snapshot_id, offset = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(snapshot_id, str) or not isinstance(offset, int) or offset < 0:
+                raise ValueError
+            return snapshot_id, offset
+        except (ValueError, TypeError):
+            raise ValidationError({"cursor": ["Invalid pagination cursor."]})
+
+    @classmethod
+    def search(cls, query, channel_id=None, limit=None, cursor=None):
+        """
+        Searches video titles.
+        Args:
+            query (str): Free-text query; all words must match.
+            channel_id (str, optional): Restrict results to one channel.
+            limit (int, optional): Page size (default 20, max 100).
+            cursor (str, optional): Cursor returned with the previous page.
+        Returns:
+            tuple: (list of VideoRecord, next cursor or None)
+        """
+        tokens = cls.tokenize(query)
+        if not tokens:
+            raise ValidationError({"q": ["Enter at least one word to search for."]})
+        limit = min(limit or cls.DEFAULT_LIMIT, cls.MAX_LIMIT)
+        snapshot_id, offset = cls.decode_cursor(cursor) or (uuid.uuid4().hex, 0)
+
+        # The snapshot is bound to its query: a cursor reused with other words starts a new ranking
+        query_digest = hashlib.blake2b(json.dumps([tokens, channel_id]).encode("utf-8"), digest_size=8).hexdigest()
+        snapshot = cache.get(search_snapshot_key(snapshot_id)) if cursor and settings.USE_REDIS else None
+        if snapshot and snapshot["query"] == query_digest:
+            video_ids = snapshot["video_ids"]
+        else:
+            # First page, or the snapshot expired: rank again (later pages may then shift)
+            video_ids = cls.ranked_ids(tokens, channel_id)
+            if len(video_ids) > offset + limit and settings.USE_REDIS:
+                cache.set(
+                    search_snapshot_key(snapshot_id), {"query": query_digest, "video_ids": video_ids},
+                    timeout=cls.SNAPSHOT_EXPIRY,
+                )
+
+        videos = cls.load_records(video_ids[offset:offset + limit])
+        next_cursor = cls.encode_cursor(snapshot_id, offset + limit) if len(video_ids) > offset + limit else None
+        logger.info(f"Search {tokens} (channel={channel_id}) returned {len(videos)} videos")
+        return videos, next_cursor
+
+    @classmethod
+    def ranked_ids(cls, tokens, channel_id):
+        """Returns the ids of the best MAX_RESULTS matches, ranked with the backend's text index."""
+        vendor = connection.vendor
+        if vendor == "sqlite":
+            return cls._search_sqlite(tokens, channel_id)
+        if vendor == "postgresql":
+            return cls._search_postgresql(tokens, channel_id)
+        return cls._search_fallback(tokens, channel_id)
+
+    @classmethod
+    def load_records(cls, video_ids):
+        """Returns the records of `video_ids` in that order, hot or archived; deleted ones are skipped."""
+        records = {}
+        for model in (Video, VideoArchive):
+            missing = [video_id for video_id in video_ids if video_id not in records]
+            if not missing:
+                break
+            for row in model.objects.filter(video_id__in=missing).values_list(*VideoRecord.FIELDS):
+                records[row[0]] = VideoRecord.from_row(row)
+        return [records[video_id] for video_id in video_ids if video_id in records]
+
+    @classmethod
+    def _ranked_ids(cls, branch_sql, match, channel_id):
+        """
+        Runs one ranked branch per table (`branch_sql` has a `{table}` placeholder and selects
+        `video_id, score`), each filtered to the channel, and returns the best MAX_RESULTS ids.
+        """
+        branches = []
+        params = []
+        for table in ("videoservice_video", "videoservice_videoarchive"):
+            sql = branch_sql.format(table=table)
+            params.append(match)
+            if channel_id:
+                # Inside the branch, so each table's matches are narrowed before they are ranked
+                sql += " AND v.channel_id = %s"
+                params.append(channel_id)
+            branches.append(sql)
+        sql = f"SELECT video_id FROM ({' UNION ALL '.join(branches)}) ranked ORDER BY score DESC, video_id LIMIT %s"
+        params.append(cls.MAX_RESULTS)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def _search_sqlite(cls, tokens, channel_id):
+        # Quoting every token makes FTS5 treat it as a plain term (implicit AND)
+        match = " ".join('"' + token + '"' for token in tokens)
+        return cls._ranked_ids(
+            "SELECT v.video_id, -bm25({table}_fts) AS score "
+            "FROM {table}_fts JOIN {table} v ON v.rowid = {table}_fts.rowid "
+            "WHERE {table}_fts MATCH %s",
+            match, channel_id,
+        )
+
+    @classmethod
+    def _search_postgresql(cls, tokens, channel_id):
+        return cls._ranked_ids(
+            "SELECT v.video_id, ts_rank(v.search_vector, q)::float8 AS score "
+            "FROM {table} v, plainto_tsquery('english', %s) q "
+            "WHERE v.search_vector @@ q",
+            " ".join(tokens), channel_id,
+        )
+
+    @classmethod
+    def _search_fallback(cls, tokens, channel_id):
+        # No text index on this backend: unranked title scans of both tables, ordered by video_id
+        video_ids = []
+        for model in (Video, VideoArchive):
+            queryset = model.objects.order_by("video_id")
+            for token in tokens:
+                queryset = queryset.filter(video_title__icontains=token)
+            if channel_id:
+                queryset = queryset.filter(channel_id=channel_id)
+            video_ids.extend(queryset.values_list("video_id", flat=True)[:cls.MAX_RESULTS])
+        return sorted(video_ids)[:cls.MAX_RESULTS]
+
+    @classmethod
+    def rebuild_index(cls):
+        """
+        Rebuilds the full-text indexes from `videoservice_video` and `videoservice_videoarchive`.
+        Needed after a SQLite VACUUM (the FTS5 table references rowids) or to repair drift.
+        Returns:
+            bool: False when the backend has no full-text index.
+        """
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute("INSERT INTO videoservice_video_fts(videoservice_video_fts) VALUES ('rebuild')")
+                cursor.execute(
+                    "INSERT INTO videoservice_videoarchive_fts(videoservice_videoarchive_fts) VALUES ('rebuild')"
+                )
+            elif connection.vendor == "postgresql":
+                cursor.execute("REINDEX INDEX videoservice_video_search_idx")
+                cursor.execute("REINDEX INDEX videoservice_videoarchive_search_idx")
+            else:
+                return False
+        return True
@@ -0,0 +1,187 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+
+from videoservice.models.channel import Channel
+from videoservice.models.upload_stats import ChannelDailyUploads, ChannelUploadStats
+from videoservice.models.video import Video
+from videoservice.models.video_archive import VideoArchive
+
+logger = logging.getLogger('videoservice')
+
+
+class ChannelStatsService:
+    """
+    Service layer for per-channel upload statistics.
+    - `record_new_videos` folds newly inserted videos into the rollup tables during ingest.
+    - `rebuild` recomputes rollups from `videoservice_video` (backfill / repair).
+    - `get_stats` answers range queries from the rollups only: O(buckets), never O(videos).
+    Rollups count ingested videos; deleting videos does not decrement them until the next rebuild.
+    """
+
+    BUCKETS = ("day", "week")
+    BULK_BATCH_SIZE = 1000
+
+    @staticmethod
+    def upload_day(upload_date):
+        """Returns the UTC calendar day of an aware upload datetime."""
+        return upload_date.astimezone(dt_timezone.utc).date()
+
+    @classmethod
+    def record_new_videos(cls, videos):
+        """
+        Adds newly inserted videos to the rollups. Must run inside the ingest transaction, with
+        the channels' rows locked, so concurrent ingests cannot double-count or lose increments.
+        Args:
+            videos (list): Video instances that did not exist before this ingest.
+        """
+        if not videos:
+            return
+
+        daily = defaultdict(int)
+        totals = {}
+        for video in videos:
+            uploaded = video.upload_date
+            if timezone.is_naive(uploaded):
+                # Ingest builds naive datetimes; they are stored as UTC
+                uploaded = timezone.make_aware(uploaded)
+            daily[(video.channel_id, cls.upload_day(uploaded))] += 1
+            count, first, last = totals.get(video.channel_id, (0, uploaded, uploaded))
+            totals[video.channel_id] = (count + 1, min(first, uploaded), max(last, uploaded))
+
+        channel_ids = list(totals)
+        existing_days = {
+            (bucket.channel_id, bucket.day): bucket
+            for bucket in ChannelDailyUploads.objects.filter(
+                channel_id__in=channel_ids, day__in={day for _, day in daily}
+            )
+        }
+        created_days = []
+        for (channel_id, day), count in daily.items():
+            bucket = existing_days.get((channel_id, day))
+            if bucket:
+                bucket.video_count += count
+            else:
+                created_days.append(ChannelDailyUploads(channel_id=channel_id, day=day, video_count=count))
+        ChannelDailyUploads.objects.bulk_update(existing_days.values(), ["video_count"], batch_size=cls.BULK_BATCH_SIZE)
+        ChannelDailyUploads.objects.bulk_create(created_days, batch_size=cls.BULK_BATCH_SIZE)
+
+        existing_stats = ChannelUploadStats.objects.in_bulk(channel_ids)
+        created_stats = []
+        for channel_id, (count, first, last) in totals.items():
+            stats = existing_stats.get(channel_id)
+            if stats:
+                stats.video_count += count
+                stats.first_upload_at = min(stats.first_upload_at, first)
+                stats.last_upload_at = max(stats.last_upload_at, last)
+            else:
+                created_stats.append(ChannelUploadStats(
+                    channel_id=channel_id, video_count=count, first_upload_at=first, last_upload_at=last
+                ))
+        ChannelUploadStats.objects.bulk_update(
+            existing_stats.values(), ["video_count", "first_upload_at", "last_upload_at"],
+            batch_size=cls.BULK_BATCH_SIZE,
+        )
+        ChannelUploadStats.objects.bulk_create(created_stats, batch_size=cls.BULK_BATCH_SIZE)
+
+    @classmethod
+    def rebuild(cls, channel_ids):
+        """
+        Recomputes the rollups of the given channels from the hot and archived videos, replacing existing rows.
+        Reads and writes in one transaction with the channels' rows locked, like `record_new_videos`.
+        Args:
+            channel_ids (list): Channels to rebuild.
+        Returns:
+            int: Number of daily buckets written.
+        """
+        with transaction.atomic():
+            # Lock the channels first, as ingest and archiving do: no video can be added to or moved
+            # out of them between the aggregation and the write
+            list(
+                Channel.objects.select_for_update().filter(channel_id__in=channel_ids)
+                .order_by("channel_id").values_list("channel_id", flat=True)
+            )
+            daily = defaultdict(int)
+            totals = {}
+            # Archived videos still count: aggregate the hot table and the archive
+            for model in (Video, VideoArchive):
+                for row in (
+                    model.objects.filter(channel_id__in=channel_ids)
+                    .annotate(day=TruncDate("upload_date", tzinfo=dt_timezone.utc))
+                    .values("channel_id", "day")
+                    .annotate(video_count=Count("video_id"))
+                    .order_by()
+                ):
+                    daily[(row["channel_id"], row["day"])] += row["video_count"]
+                for row in (
+                    model.objects.filter(channel_id__in=channel_ids)
+                    .values("channel_id")
+                    .annotate(video_count=Count("video_id"), first=Min("upload_date"), last=Max("upload_date"))
+                    .order_by()
+                ):
+                    count, first, last = totals.get(row["channel_id"], (0, row["first"], row["last"]))
+                    totals[row["channel_id"]] = (
+                        count + row["video_count"], min(first, row["first"]), max(last, row["last"])
+                    )
+
+            ChannelDailyUploads.objects.filter(channel_id__in=channel_ids).delete()
+            ChannelUploadStats.objects.filter(channel_id__in=channel_ids).delete()
+            buckets = ChannelDailyUploads.objects.bulk_create(
+                [
+                    ChannelDailyUploads(channel_id=channel_id, day=day, video_count=count)
+                    for (channel_id, day), count in daily.items()
+                ],
+                batch_size=cls.BULK_BATCH_SIZE,
+            )
+            ChannelUploadStats.objects.bulk_create(
+                [
+                    ChannelUploadStats(channel_id=channel_id, video_count=count, first_upload_at=first, last_upload_at=last)
+                    for channel_id, (count, first, last) in totals.items()
+                ],
+                batch_size=cls.BULK_BATCH_SIZE,
+            )
+        return len(buckets)
+
+    @classmethod
+    def get_stats(cls, channel_id, bucket="day", since=None, until=None):
+        """
+        Returns a channel's upload totals and bucketed upload counts, read from the rollups only.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            bucket (str): "day" or "week" (ISO weeks, starting Monday).
+            since (date, optional): Inclusive lower bound on the upload day.
+            until (date, optional): Inclusive upper bound on the upload day.
+        Returns:
+            dict: Totals plus a list of {"start": date, "video_count": int}, oldest first.
+        """
+        if bucket not in cls.BUCKETS:
+            raise ValidationError({"bucket": [f"Choose one of: {', '.join(cls.BUCKETS)}."]})
+        stats = ChannelUploadStats.objects.filter(channel_id=channel_id).first()
+        if not stats:
+            raise NotFound(detail=f"No upload statistics found for channel_id: {channel_id}")
+
+        days = ChannelDailyUploads.objects.filter(channel_id=channel_id).order_by("day")
+        if since:
+            days = days.filter(day__gte=since)
+        if until:
+            days = days.filter(day__lte=until)
+
+        buckets = {}
+        for day, count in days.values_list("day", "video_count"):
+            start = day - timedelta(days=day.weekday()) if bucket == "week" else day
+            buckets[start] = buckets.get(start, 0) + count
+
+        return {
+            "channel_id": channel_id,
+            "video_count": stats.video_count,
+            "first_upload_at": stats.first_upload_at,
+            "last_upload_at": stats.last_upload_at,
+            "bucket": bucket,
+            "buckets": [{"start": start, "video_count": count} for start, count in buckets.items()],
+        }
@@ -0,0 +1,183 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from videoservice import settings
+from videoservice.common.circuit_breaker import CircuitBreaker
+from videoservice.common.exceptions import UpstreamOverloaded, UpstreamUnavailable
+
+logger = logging.getLogger('videoservice')
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class UpstreamVideoClient:
+    """
+    HTTP client for the upstream video API.
+    - Reuses keep-alive connections through a pooled `requests.Session`.
+    - Applies strict connect/read timeouts and bounded retries with full-jitter backoff.
+    - Fails fast through a circuit breaker while the upstream is unhealthy.
+    - Caps concurrent upstream fetches per process so a slow upstream cannot tie up every worker.
+
+    Upstream contract: `GET {base_url}/channels/<channel_id>/videos?limit=N` returns
+    `{"channel_id": "...", "videos": [{"video_id", "video_title", "upload_date"}, ...]}`,
+    newest first, or 404 for unknown channels.
+    """
+
+    def __init__(self, base_url, connect_timeout=0.5, read_timeout=2.0, max_retries=2, backoff_base=0.1,
+                 backoff_max=1.0, pool_size=20, max_concurrency=10, acquire_timeout=0.1,
+                 breaker_failure_threshold=5, breaker_recovery_timeout=30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.acquire_timeout = acquire_timeout
+        self.breaker = CircuitBreaker(
+            "upstream", failure_threshold=breaker_failure_threshold, recovery_timeout=breaker_recovery_timeout
+        )
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+
+    @classmethod
+    def from_settings(cls):
+        """
+        Builds a client from `settings.UPSTREAM_API`.
+        Returns:
+            UpstreamVideoClient: Configured client.
+        """
+        config = getattr(settings, "UPSTREAM_API", {})
+        return cls(
+            config["BASE_URL"],
+            connect_timeout=config.get("CONNECT_TIMEOUT", 0.5),
+            read_timeout=config.get("READ_TIMEOUT", 2.0),
+            max_retries=config.get("MAX_RETRIES", 2),
+            backoff_base=config.get("BACKOFF_BASE", 0.1),
+            backoff_max=config.get("BACKOFF_MAX", 1.0),
+            pool_size=config.get("POOL_SIZE", 20),
+            max_concurrency=config.get("MAX_CONCURRENCY", 10),
+            acquire_timeout=config.get("ACQUIRE_TIMEOUT", 0.1),
+            breaker_failure_threshold=config.get("BREAKER_FAILURE_THRESHOLD", 5),
+            breaker_recovery_timeout=config.get("BREAKER_RECOVERY_TIMEOUT", 30.0),
+        )
+
+    def fetch_channel_videos(self, channel_id, limit=5):
+        """
+        Fetches the newest videos for a channel from the upstream API.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            limit (int): Maximum number of videos to return.
+        Returns:
+            list: Video dicts with video_id, video_title and upload_date; empty if the channel is unknown.
+        Raises:
+            UpstreamOverloaded: If the breaker is open or no concurrency slot is free.
+            UpstreamUnavailable: If all attempts fail or the upstream rejects the request.
+        """
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            logger.warning(f"Upstream concurrency limit reached, shedding fetch for channel {channel_id}")
+            raise UpstreamOverloaded()
+
+        try:
+            if not self.breaker.allow_request():
+                logger.warning(f"Upstream circuit open, failing fast for channel {channel_id}")
+                raise UpstreamOverloaded()
+            try:
+                videos = self._fetch_with_retries(channel_id, limit)
+            except Exception:
+                # Any failure ends a half-open trial; otherwise the breaker would never admit another
+                self.breaker.record_failure()
+                raise
+        finally:
+            self._slots.release()
+
+        self.breaker.record_success()
+        return videos
+
+    def _fetch_with_retries(self, channel_id, limit):
+        url = f"{self.base_url}/channels/{quote(channel_id, safe='')}/videos"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, params={"limit": limit}, timeout=self.timeout)
+                if response.status_code == 404:
+                    return []
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    return self._parse_videos(response.json(), channel_id)[:limit]
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = exc.__class__.__name__
+            except (requests.RequestException, ValueError, TypeError) as exc:
+                logger.error(f"Upstream request for channel {channel_id} failed: {exc}")
+                raise UpstreamUnavailable()
+
+            if attempt < self.max_retries:
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                logger.warning(
+                    f"Upstream attempt {attempt + 1} for channel {channel_id} failed ({error}), retrying in {delay:.3f}s"
+                )
+                time.sleep(delay)
+
+        logger.error(f"Upstream fetch for channel {channel_id} failed after {self.max_retries + 1} attempts ({error})")
+        raise UpstreamUnavailable()
+
+    @staticmethod
+    def _valid_video(video):
+        """True if an upstream row has the fields the video table needs, in the contract's formats."""
+        if not isinstance(video, dict):
+            return False
+        video_id, title, upload_date = video.get("video_id"), video.get("video_title"), video.get("upload_date")
+        if not isinstance(video_id, str) or not 0 < len(video_id) <= 255:
+            return False
+        if not isinstance(title, str) or len(title) > 255 or not isinstance(upload_date, str):
+            return False
+        try:
+            datetime.strptime(upload_date, "%Y-%m-%d")
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def _parse_videos(cls, payload, channel_id):
+        """
+        Returns the valid videos of an upstream response body. Rows missing a field or with an
+        upload_date not in YYYY-MM-DD format are dropped, so one bad row cannot fail the channel.
+        Raises:
+            TypeError: If the body does not follow the upstream contract, or none of its rows do.
+        """
+        videos = payload.get("videos", []) if isinstance(payload, dict) else None
+        if not isinstance(videos, list):
+            raise TypeError(f"unexpected response body for channel {channel_id}")
+        valid = [video for video in videos if cls._valid_video(video)]
+        if len(valid) < len(videos):
+            if not valid:
+                raise TypeError(f"no valid video in the response for channel {channel_id}")
+            logger.warning(f"Dropped {len(videos) - len(valid)} malformed upstream videos for channel {channel_id}")
+        return valid
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_upstream_client():
+    """
+    Returns the per-process upstream client, creating it on first use.
+    Returns:
+        UpstreamVideoClient | None: The shared client, or None when no upstream BASE_URL is configured.
+    """
+    global _client
+    if _client is None and getattr(settings, "UPSTREAM_API", {}).get("BASE_URL"):
+        with _client_lock:
+            if _client is None:
+                _client = UpstreamVideoClient.from_settings()
+    return _client
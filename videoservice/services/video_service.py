@@ -1,17 +1,26 @@
 import json
 import logging
 import os
-from datetime import datetime
 
 from rest_framework.exceptions import ValidationError, NotFound
 
 from videoservice import settings
+from videoservice.common.admission import AdmissionControl
+from videoservice.common.diagnostics import allocation_stage
+from videoservice.common.hot_cache import get_hot_cache
+from videoservice.common.profiler import tag_request_path
+from videoservice.common.single_flight import SingleFlight
+from videoservice.common.video_cache import build_cache_entry, build_validators, latest_top_k, limit_validators, \
+    normalize_cache_entry, recent_videos_key, recent_videos_top_k, rendered_body_key, serves_limit
 from videoservice.models.channel import Channel
 from videoservice.models.video import Video
+from videoservice.models.video_record import VideoRecord
 from videoservice.config.tasks import update_last_accessed, store_videos_in_db, async_store_videos_in_db, \
-    async_update_last_accessed
+    async_record_prefetch_hit, async_update_last_accessed
+from videoservice.services.prefetch_service import ChannelPrefetchService
 from videoservice.serializers.video_serializer import VideoSerializer
-from django.core.cache import cache
+# Redis behind a circuit breaker with a local fallback, see ResilientCache
+from videoservice.common.resilient_cache import resilient_cache as cache
 
 logger = logging.getLogger('videoservice')
 
@@ -25,106 +34,305 @@ class VideoService:
     """
 
     CACHE_EXPIRY = 300  # Cache TTL = 5 minutes
+    # Concurrent misses for the same channel in this process share one DB/upstream load
+    uncached_loads = SingleFlight()
 
     @classmethod
-    def get_recent_videos(cls, channel_id):
+    def get_recent_videos(cls, channel_id, limit=None):
         """
-        Fetches the most recent 5 videos for a given channel ID.
+        Fetches the most recent `limit` videos for a given channel ID.
+        Every channel has a single cache entry holding its newest K videos (RECENT_VIDEOS_TOP_K);
+        any limit up to K is served by slicing it.
+        - If the channel is hot, serves it from the host-local shared-memory cache.
         - If cached, retrieves from Redis.
-        - Otherwise, fetches from the database or external API.
+        - Otherwise, fetches the top K from the database or external API.
         Args:
             channel_id (str): The unique identifier of the YouTube channel.
+            limit (int, optional): Number of videos, 1 to K (default RECENT_VIDEOS_DEFAULT_LIMIT).
         Returns:
             tuple: (list of serialized video data, HTTP status code)
         """
+        data, status_code, _ = cls.get_recent_videos_with_validators(channel_id, limit)
+        return data, status_code
+
+    @classmethod
+    def get_recent_videos_with_validators(cls, channel_id, limit=None):
+        """
+        Same as `get_recent_videos`, also returning the HTTP validators of the result.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            limit (int, optional): Number of videos, 1 to K (default RECENT_VIDEOS_DEFAULT_LIMIT).
+        Returns:
+            tuple: (list of serialized video data, HTTP status code, validators dict or None)
+        """
         logger.info(f"Fetching recent videos for channel: {channel_id}")
 
         if not channel_id:
             raise ValidationError({"channel_id": ["This field is required."]})
+        limit = cls.resolve_limit(limit)
+
+        with allocation_stage("hot_cache"):
+            hot_payload = cls.get_hot_payload(channel_id)
+        if hot_payload:
+            logger.debug(f"Hot cache hit for channel {channel_id}")
+            tag_request_path("hit")
+            cls.record_access(channel_id)
+            return hot_payload["videos"][:limit], 200, limit_validators(hot_payload["validators"], limit)
+
+        redis_key = recent_videos_key(channel_id)
+
+        with allocation_stage("load"):
+            entry = normalize_cache_entry(cache.get(redis_key)) if settings.USE_REDIS else None
+            if entry and serves_limit(entry, limit):
+                logger.debug(f"Cache hit for channel {channel_id}, fetching from database")
+                tag_request_path("hit")
+                cls.record_prefetch_hit(channel_id)
+                videos = [
+                    VideoRecord.from_row(row)
+                    for row in Video.objects.filter(video_id__in=entry["video_ids"][:limit])
+                    .order_by("-upload_date")
+                    .values_list(*VideoRecord.FIELDS)
+                ]
+                # Entries written before validators were cached carry none: derive them from the prefix
+                validators = (
+                    limit_validators({"etag": entry["etag"], "last_modified": entry["last_modified"]}, limit)
+                    if entry.get("etag") else build_validators(videos)
+                )
+                if not videos:
+                    logger.info(f"Cached videos for channel {channel_id} are gone, fetching from database/API")
+                    videos, validators = cls.load_uncached_prefix(channel_id, limit)
+            else:
+                logger.info(f"Cache miss for channel {channel_id}, fetching from database/API")
+                videos, validators = cls.load_uncached_prefix(channel_id, limit)
 
-        redis_key = f"recent_videos:{channel_id}"
-
-        video_ids  = cache.get(redis_key) if settings.USE_REDIS else None
-        if video_ids:
-            logger.debug(f"Cache hit for channel {channel_id}, fetching from database")
-            videos = list(Video.objects.filter(video_id__in=video_ids).order_by("-upload_date"))
-            if not videos and len(videos) != 5:
-                logger.info(f"Cache had less than 5 videos for channel {channel_id}, fetching from API")
-                videos  = cls.fetch_and_cache_videos(channel_id)
-        else:
-            logger.info(f"Cache miss for channel {channel_id}, fetching from database/API")
-            videos = cls.fetch_and_cache_videos(channel_id)
-
-        serializer = VideoSerializer(videos, many=True)
-        # Async update last_accessed in background (non-blocking)
+        with allocation_stage("serialize"):
+            data = VideoSerializer(videos, many=True).data
+        cls.record_access(channel_id)
+        return data, 200, validators
+
+    @staticmethod
+    def resolve_limit(limit):
+        """Returns the number of videos to serve: `limit` capped at K, or the configured default."""
+        return min(limit or getattr(settings, "RECENT_VIDEOS_DEFAULT_LIMIT", 5), recent_videos_top_k())
+
+    @classmethod
+    def load_uncached_prefix(cls, channel_id, limit):
+        """
+        Loads (and caches) the channel's top K videos and returns the first `limit` of them.
+        Returns:
+            tuple: (list of VideoRecord objects, validators dict of the prefix)
+        """
+        videos = cls.load_uncached_videos(channel_id)
+        return videos[:limit], limit_validators(build_validators(videos), limit)
+
+    @classmethod
+    def get_hot_payload(cls, channel_id):
+        """
+        Looks a channel up in the host-local hot cache (no network hop, no lock).
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+        Returns:
+            dict | None: {"videos": serialized videos, "validators": dict}, or None on a miss.
+        """
+        hot_cache = get_hot_cache()
+        if hot_cache is None:
+            return None
+        payload = hot_cache.get(recent_videos_key(channel_id))
+        return json.loads(payload) if payload else None
+
+    @classmethod
+    def get_cached_body(cls, channel_id, etag, encoding, media_format="json"):
+        """
+        Returns a pre-rendered response body for the given data version, format and content coding.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            etag (str): ETag of the cached data version.
+            encoding (str): Negotiated content coding ("br", "gzip" or "identity").
+            media_format (str): Negotiated renderer format ("json" or "msgpack").
+        Returns:
+            tuple | None: (applied content coding, body bytes), or None on a miss.
+        """
+        if not settings.USE_REDIS:
+            return None
+        return cache.get(rendered_body_key(channel_id, etag, encoding, media_format))
+
+    @classmethod
+    def cache_rendered_bodies(cls, channel_id, etag, variants, media_format="json"):
+        """
+        Caches every encoded variant of a rendered response body in one round trip.
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            etag (str): ETag of the data version the body was rendered from.
+            variants (dict): Requested coding -> (applied coding, bytes), see `compress_variants`.
+            media_format (str): Renderer format the body was rendered with.
+        """
+        if settings.USE_REDIS:
+            cache.set_many(
+                {
+                    rendered_body_key(channel_id, etag, encoding, media_format): variant
+                    for encoding, variant in variants.items()
+                },
+                timeout=cls.CACHE_EXPIRY,
+            )
+
+    @classmethod
+    def record_access(cls, channel_id):
+        """Updates the channel's last_accessed timestamp in the background (non-blocking)."""
         async_update_last_accessed(channel_id)
-        return serializer.data, 200
 
+    @classmethod
+    def record_prefetch_hit(cls, channel_id):
+        """Counts a cache hit towards the prefetch hit rate in the background (see ChannelPrefetchService)."""
+        if ChannelPrefetchService.enabled():
+            async_record_prefetch_hit(channel_id)
+
+    @classmethod
+    def get_cached_validators(cls, channel_id, limit=None):
+        """
+        Returns the HTTP validators stored with a channel's cache entry (a single cache lookup).
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            limit (int, optional): Number of videos served (default RECENT_VIDEOS_DEFAULT_LIMIT).
+        Returns:
+            dict | None: {"etag", "last_modified"}, or None if not cached or cached without validators.
+        """
+        if not channel_id:
+            return None
+        limit = cls.resolve_limit(limit)
+        hot_payload = cls.get_hot_payload(channel_id)
+        if hot_payload:
+            return limit_validators(hot_payload["validators"], limit)
+        if not settings.USE_REDIS:
+            return None
+        entry = normalize_cache_entry(cache.get(recent_videos_key(channel_id)))
+        if not entry or not entry.get("etag") or not serves_limit(entry, limit):
+            return None
+        cls.record_prefetch_hit(channel_id)
+        return limit_validators({"etag": entry["etag"], "last_modified": entry["last_modified"]}, limit)
+
+    @classmethod
+    def load_uncached_videos(cls, channel_id):
+        """
+        Runs `fetch_and_cache_videos` within the global miss budget of admission control,
+        coalescing concurrent misses for the same channel (only the first takes a slot).
+        Raises:
+            ServiceOverloaded: If too many misses are in flight (the request is shed).
+        """
+        tag_request_path("db")
+
+        def load():
+            with AdmissionControl.miss_slot():
+                return cls.fetch_and_cache_videos(channel_id)
+
+        return cls.uncached_loads.do(channel_id, load)
 
     @classmethod
     def fetch_and_cache_videos(cls, channel_id):
         """
-        Fetches the most recent 5 videos from the database or external API if not available.
+        Fetches the channel's top K videos from the database or external API if not available.
         Args:
             channel_id (str): The unique identifier of the YouTube channel.
         Returns:
-            list: Video objects retrieved from DB or API.
+            list: VideoRecord objects retrieved from DB or API.
         """
 
         logger.info(f"Fetching videos for channel {channel_id} from database or external source")
 
-        channel = Channel.objects.filter(channel_id=channel_id).first()
-        videos = []
-        if channel:
-            # Fetch latest 5 videos from the database
-            videos = list(Video.objects.filter(channel=channel).order_by("-upload_date")[:5])
+        # Single primary-key read: the channel row carries its denormalized latest videos
+        row = Channel.objects.filter(channel_id=channel_id).values_list("latest_videos", "latest_videos_complete").first()
+        channel_exists = row is not None
+        top_k = recent_videos_top_k()
+        entries, complete = latest_top_k(*row) if channel_exists else ([], False)
+        videos = [VideoRecord.from_latest_entry(entry, channel_id) for entry in entries or []]
 
-        if not channel or not videos:
-            logger.info(f"Channel {channel_id} not found in DB or has no videos, fetching from API")
-            api_videos = cls.fetch_and_store_videos(channel_id)
-            # Convert API response format into Django ORM objects before serializing
+        if channel_exists and (entries is None or not videos):
+            # The row predates the denormalized column, or was denormalized with a limit below K
             videos = [
-                Video(
-                    video_id=video["video_id"],
-                    video_title=video["video_title"],
-                    upload_date=datetime.strptime(video["upload_date"], "%Y-%m-%d"),
-                    channel=channel,
-                )
-                for video in api_videos
+                VideoRecord.from_row(row)
+                for row in Video.objects.filter(channel_id=channel_id)
+                .order_by("-upload_date")
+                .values_list(*VideoRecord.FIELDS)[:top_k]
             ]
+            complete = len(videos) < top_k
+
+        if not channel_exists or not videos:
+            logger.info(f"Channel {channel_id} not found in DB or has no videos, fetching from API")
+            api_videos = cls.fetch_and_store_videos(channel_id)
+            # Convert API response format into read records before serializing
+            videos = [VideoRecord.from_upstream(video, channel_id if channel_exists else None) for video in api_videos]
+            complete = False
 
         if not videos:
             raise NotFound("Channel ID not found or no videos available.")
 
-        video_ids = [video.video_id for video in videos]
+        cls.cache_videos(channel_id, videos, complete)
+        return videos
 
-        # Store video IDs in cache
+    @classmethod
+    def cache_videos(cls, channel_id, videos, complete=False):
+        """
+        Stores a channel's recent video IDs and their HTTP validators in the cache (no-op when Redis is disabled).
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+            videos (list): Video or VideoRecord objects, newest first.
+            complete (bool): True if these are all of the channel's videos.
+        """
         if settings.USE_REDIS:
-            cache_key = f"recent_videos:{channel_id}"
-            cache.set(cache_key, video_ids, timeout=cls.CACHE_EXPIRY)
-        return videos
+            cache.set(recent_videos_key(channel_id), build_cache_entry(videos, complete), timeout=cls.CACHE_EXPIRY)
+
+    @classmethod
+    def invalidate_cached_videos(cls, channel_ids):
+        """
+        Removes channels' cached recent videos so the next request reads the updated rows.
+        Rendered bodies are keyed by ETag and need no invalidation.
+        Args:
+            channel_ids (list): Channels whose stored videos changed.
+        """
+        if settings.USE_REDIS and channel_ids:
+            cache.delete_many([recent_videos_key(channel_id) for channel_id in channel_ids])
 
     @classmethod
     def fetch_and_store_videos(cls, channel_id):
         """
-        Fetches videos from the Mock YouTube API and stores them asynchronously in the database.
+        Fetches videos from the upstream YouTube API and stores them asynchronously in the database.
         Args:
             channel_id (str): The unique identifier of the YouTube channel.
         Returns:
             list: Video data fetched from the external API.
         """
 
-        logger.info(f"Fetching videos for channel {channel_id} from Mock YouTube API")
-        mock_videos = cls.fetch_videos_from_mock_youtube(channel_id)
+        logger.info(f"Fetching videos for channel {channel_id} from upstream YouTube API")
+        tag_request_path("upstream")
+        upstream_videos = cls.fetch_videos_from_upstream(channel_id)
 
-        if not mock_videos:
-            logger.warning(f"No videos found in Mock YouTube API for channel {channel_id}")
+        if not upstream_videos:
+            logger.warning(f"No videos found in upstream YouTube API for channel {channel_id}")
             raise NotFound("Channel ID not found or no videos available.")
 
         # Store fetched videos in DB asynchronously using Celery
-        async_store_videos_in_db(channel_id, mock_videos)
+        async_store_videos_in_db(channel_id, upstream_videos)
+
+        return upstream_videos
+
+    @classmethod
+    def fetch_videos_from_upstream(cls, channel_id):
+        """
+        Fetches the newest videos through the pooled upstream client, or the mock file when no
+        upstream is configured (`settings.UPSTREAM_API["BASE_URL"]`).
+        Args:
+            channel_id (str): The unique identifier of the YouTube channel.
+        Returns:
+            list: A list of video dictionaries with video_id, video_title and upload_date.
+        Raises:
+            UpstreamUnavailable: If the upstream is failing or overloaded.
+        """
+        # Imported lazily: the HTTP client stack is only needed once a miss reaches upstream
+        from videoservice.services.upstream_client import get_upstream_client
 
-        return mock_videos
+        client = get_upstream_client()
+        if client is None:
+            return cls.fetch_videos_from_mock_youtube(channel_id)
+        return client.fetch_channel_videos(channel_id, limit=recent_videos_top_k())
 
     @classmethod
     def fetch_videos_from_mock_youtube(cls, channel_id):
@@ -148,9 +356,9 @@ class VideoService:
         if not videos:
             return []
 
-        # Sort videos by upload_date (newest first) and return the top 5
+        # Sort videos by upload_date (newest first) and return the top K
         videos_sorted = sorted(videos, key=lambda x: x["upload_date"], reverse=True)
 
-        return videos_sorted[:5]
+        return videos_sorted[:recent_videos_top_k()]
 
 
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/4.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Opt-in, see DIAGNOSTICS["PROFILER"]; first so samples cover the whole middleware stack
+    'videoservice.common.profiler.SamplingProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -48,6 +51,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Opt-in, see DIAGNOSTICS; removed by Django at startup when disabled
+    'videoservice.common.diagnostics.DiagnosticsMiddleware',
+    'videoservice.common.diagnostics.AllocationProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'videoservice.urls'
@@ -76,6 +82,10 @@ REST_FRAMEWORK = {
         # Force JSON output
     ),
     'EXCEPTION_HANDLER': 'videoservice.exceptions.custom_exception_handler',
+    # Reverse proxies in front of the app. Client identities (rate limit buckets, prefetch co-access)
+    # come from the X-Forwarded-For entry the outermost of them added; with 0 they are REMOTE_ADDR.
+    # Left unset, DRF would trust the whole header, so a client could pick its own identity.
+    'NUM_PROXIES': int(os.environ.get("NUM_PROXIES", "0")),
 }
 
 # Database
@@ -93,22 +103,163 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.redis.RedisCache",
         "LOCATION": "redis://localhost:6379/1",  # Database index 1 for cache
         "TIMEOUT": 300,  # Cache TTL in seconds
-
+        "OPTIONS": {
+            # Tight per-call bounds: a slow or unreachable Redis must not stall requests
+            "socket_connect_timeout": 0.1,
+            "socket_timeout": 0.1,
+        },
     }
 }
+
+# Read-path cache resilience (videoservice.common.resilient_cache)
+CACHE_RESILIENCE = {
+    "BREAKER_FAILURE_THRESHOLD": 3,  # consecutive Redis failures before skipping it
+    "BREAKER_RECOVERY_TIMEOUT": 5.0,  # seconds before a trial call is let through
+    "LOCAL_MAX_ENTRIES": 1000,  # per-process fallback cache used while Redis is skipped
+    "LOCAL_TTL": 30,  # seconds
+}
 # ✅ Use Redis as Celery broker
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 
-# ✅ Store task results in Redis
+# ✅ Result backend, only for tasks that opt in with ignore_result=False: every task here is
+# fire-and-forget, so no result keys accumulate in Redis
 CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_RESULT_EXPIRES = 3600  # seconds, for results that are stored anyway
 
 # ✅ Set task serialization format
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# ✅ Queue topology (videoservice.config.queues): one queue per workload, each consumed by its own
+# worker so a flood in one queue never delays another (see docker-compose.yml)
+CELERY_TASK_DEFAULT_QUEUE = "celery"
+CELERY_TASK_ROUTES = {
+    "videoservice.config.tasks.refresh_due_channels": {"queue": "refresh"},
+    "videoservice.config.tasks.update_video_cache": {"queue": "refresh"},
+    "videoservice.config.tasks.store_videos_in_db": {"queue": "ingest"},
+    "videoservice.config.tasks.update_last_accessed": {"queue": "bookkeeping"},
+    "videoservice.config.tasks.prefetch_channels": {"queue": "bookkeeping"},
+}
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # overridden per worker with --prefetch-multiplier
+
 USE_REDIS = True
 USE_CELERY = True
 
+# K: newest videos cached per channel (one entry per channel); requests may ask for any `limit` up to K
+RECENT_VIDEOS_TOP_K = 20
+RECENT_VIDEOS_DEFAULT_LIMIT = 5
+# Number of newest videos denormalized onto each Channel row (Channel.latest_videos), at least K
+LATEST_VIDEOS_LIMIT = RECENT_VIDEOS_TOP_K
+# How ingest treats videos that already exist: "upsert" rewrites rows whose content hash changed,
+# "insert" keeps the stored version (bulk_create with ignore_conflicts)
+VIDEO_INGEST_MODE = "upsert"
+# Number of most recently accessed channels refreshed by the periodic cache task
+VIDEO_CACHE_REFRESH_LIMIT = 1000
+
+# Upstream video API client. Without a BASE_URL the mock fixture file is used instead.
+UPSTREAM_API = {
+    "BASE_URL": os.environ.get("UPSTREAM_API_URL"),
+    "CONNECT_TIMEOUT": 0.5,  # seconds
+    "READ_TIMEOUT": 2.0,  # seconds
+    "MAX_RETRIES": 2,  # retries after the first attempt
+    "BACKOFF_BASE": 0.1,  # seconds, doubled per retry with full jitter
+    "BACKOFF_MAX": 1.0,  # seconds
+    "POOL_SIZE": 20,  # keep-alive connections per host
+    "MAX_CONCURRENCY": 10,  # concurrent upstream fetches per process
+    "ACQUIRE_TIMEOUT": 0.1,  # seconds to wait for a concurrency slot before failing fast
+    "BREAKER_FAILURE_THRESHOLD": 5,
+    "BREAKER_RECOVERY_TIMEOUT": 30.0,  # seconds
+}
+
+# Precompressed response bodies cached per channel (videoservice.common.compression)
+RESPONSE_COMPRESSION = {
+    "MIN_SIZE": 512,  # bytes; smaller bodies are served uncompressed
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+}
+
+# Adaptive per-channel refresh scheduler (videoservice.services.refresh_scheduler)
+REFRESH_SCHEDULER = {
+    # Replaces the fixed 5-minute update_video_cache beat, which is only provisioned (enabled) when this is off
+    "ENABLED": os.environ.get("REFRESH_SCHEDULER_ENABLED", "1") == "1",
+    "TICK_SECONDS": 60,  # how often the refresh_due_channels beat task runs
+    "CLAIM_SECONDS": 600,  # a tick's claim on its channels; lapses if the worker dies mid-tick
+    "RATE_BUDGET_PER_MINUTE": 600,  # global cap on upstream refreshes
+    "MIN_INTERVAL": 300,  # seconds
+    "MAX_INTERVAL": 7 * 24 * 3600,  # seconds
+    "CADENCE_FRACTION": 0.25,  # refresh ~4 times per typical gap between uploads
+    "HISTORY_SIZE": 20,  # uploads used to learn a channel's cadence
+    "ACCESS_DECAY_HOURS": 24,  # interval doubles for every this many hours since last access
+}
+
+# Slow-request diagnostics (videoservice.common.diagnostics), exposed on /diagnostics/slow-requests/
+DIAGNOSTICS = {
+    "ENABLED": os.environ.get("DIAGNOSTICS_ENABLED", "") == "1",
+    "ADMIN_TOKEN": os.environ.get("DIAGNOSTICS_TOKEN"),  # endpoint is closed when unset
+    "SLOW_REQUEST_MS": 200,
+    "SLOW_QUERY_MS": 50,  # queries at least this slow get an EXPLAIN plan
+    "EXPLAIN": True,
+    "MAX_EXPLAINS": 5,  # per request
+    "N_PLUS_ONE_THRESHOLD": 5,  # same statement shape repeated this often in one request
+    "MAX_QUERIES_RECORDED": 100,  # slowest queries kept per sample
+    "WORST_N": 50,  # samples kept per process
+    # Per-request/per-stage tracemalloc reports (slow: profiling runs only, one single-threaded worker)
+    "ALLOCATIONS": os.environ.get("DIAGNOSTICS_ALLOCATIONS", "") == "1",
+    "ALLOCATION_FRAMES": 1,  # traceback depth recorded per allocation
+    "ALLOCATION_TOP_SITES": 10,  # top allocation sites per sample (0 disables the snapshots)
+    # On-demand stack sampling of a live worker (/diagnostics/profile/)
+    "PROFILER": os.environ.get("DIAGNOSTICS_PROFILER", "") == "1",
+    "PROFILE_MAX_SECONDS": 60,
+    "PROFILE_INTERVAL_MS": 5,  # default sampling interval
+    "PROFILE_RESULT_TTL": 3600,  # seconds a finished profile can be fetched (from the shared cache)
+}
+
+# Hot/cold video storage (videoservice.services.archive_service)
+VIDEO_RETENTION = {
+    "HOT_MONTHS": 3,  # full months (plus the current one) kept in videoservice_video
+    "BATCH_SIZE": 500,  # channels archived per transaction
+}
+
+# Admission control in front of VideoView (videoservice.common.admission)
+ADMISSION_CONTROL = {
+    "ENABLED": True,
+    "CLIENT_RATE": 20,  # requests per second per client (token bucket refill)
+    "CLIENT_BURST": 40,  # bucket size
+    "MISS_CONCURRENCY": 64,  # miss-path requests (DB/upstream) in flight across all workers
+    "MISS_SLOT_TTL": 30,  # seconds before the slot of a crashed worker is reclaimed
+    "LOCAL_MISS_CONCURRENCY": 8,  # per process, while Redis is unreachable
+    "RETRY_AFTER": 1,  # seconds, sent with shed (503) responses
+}
+
+# Host-local shared-memory cache of hot channels' payloads (videoservice.common.hot_cache).
+# Filled by one `manage.py run_hot_cache` process per host; web workers only read it.
+HOT_CACHE = {
+    "ENABLED": os.environ.get("HOT_CACHE_ENABLED", "") == "1",
+    "PATH": os.environ.get("HOT_CACHE_PATH", "/dev/shm/videoservice_hot_cache"),
+    "SLOTS": 16384,  # fixed hash index size; keep well above CHANNELS
+    "SLOT_SIZE": 8192,  # bytes per entry (top-K payloads), larger payloads are not cached
+    "CHANNELS": 10000,  # most recently accessed channels kept hot
+    "TTL": 60,  # seconds; bounds staleness if the refresher stops
+    "REFRESH_INTERVAL": 15,  # seconds between refresher passes
+}
+
+# Co-access prefetching (videoservice.services.prefetch_service): channels that clients usually
+# request right after the current one are cached ahead of time by a background task.
+PREFETCH = {
+    "ENABLED": os.environ.get("PREFETCH_ENABLED", "") == "1",
+    "WINDOW": 5,  # previous requests per client that a new request is associated with
+    "WINDOW_SECONDS": 120,  # a client's window is forgotten after this much inactivity
+    "TOP_K": 16,  # associations kept per channel
+    "HALF_LIFE": 86400,  # seconds for an association's weight to halve
+    "ASSOCIATION_TTL": 7 * 86400,  # seconds before an unused channel's associations are dropped
+    "MIN_SCORE": 2.0,  # decayed co-access count an association needs to be prefetched
+    "MAX_CANDIDATES": 3,  # channels prefetched per request
+    "BUDGET_RATE": 50,  # channels prefetched per second across all workers (extra DB load cap)
+    "BUDGET_BURST": 100,
+    "CACHE_TTL": 300,  # seconds, like VideoService.CACHE_EXPIRY
+}
+
 import sys
 
 LOGGING = {
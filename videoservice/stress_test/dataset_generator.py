@@ -0,0 +1,121 @@
+"""
+Deterministic synthetic datasets for benchmarks and load tests.
+
+The same arguments (including the seed) always produce the same channels, videos and
+request traces, independently of batch sizes, so results are reproducible across machines:
+
+- Videos per channel follow a Zipf law: the channel of popularity rank r gets ~C / r**s videos.
+- Each channel starts uploading on a random day within the date span and uploads until the end
+  date; upload days are spread uniformly over that window (a Poisson process given its count).
+- Request traces pick channels from a second, independent Zipf popularity ranking.
+
+Used by `manage.py generate_dataset`.
+"""
+import hashlib
+import random
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+ADJECTIVES = ("Ultimate", "Quick", "Honest", "Live", "Hidden", "Easy", "Complete", "Epic", "Daily", "Advanced")
+TOPICS = ("Python", "Cooking", "Travel", "Guitar", "Fitness", "Gaming", "Chess", "Science", "Finance", "Gardening")
+FORMATS = ("Tutorial", "Review", "Vlog", "Challenge", "Highlights", "Guide", "Podcast", "Unboxing", "Q&A", "Tips")
+
+
+class SyntheticDataset:
+    """Seeded generator of channels, videos and request traces."""
+
+    def __init__(self, channels, videos, seed=42, zipf_s=1.1, span_days=3650, end_date=None, min_videos=1):
+        self.channels = channels
+        self.videos = videos
+        self.seed = seed
+        self.zipf_s = zipf_s
+        self.span_days = span_days
+        self.end_date = end_date or datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        self.min_videos = min_videos
+        self._video_counts = None
+
+    def _digest(self, *parts, size=16):
+        return hashlib.blake2b(":".join(str(part) for part in (self.seed, *parts)).encode(), digest_size=size)
+
+    def channel_id(self, index):
+        """Returns the YouTube-style id of the channel at `index`."""
+        return "UC" + self._digest("channel", index, size=11).hexdigest()
+
+    def video_id(self, channel_index, number):
+        """Returns the 11-character YouTube-style id of a channel's `number`-th video."""
+        return urlsafe_b64encode(self._digest("video", channel_index, number, size=9).digest()).decode()[:11]
+
+    @staticmethod
+    def zipf_weights(count, exponent):
+        return [1.0 / rank ** exponent for rank in range(1, count + 1)]
+
+    def ranks(self, purpose):
+        """Returns a seeded permutation mapping channel index -> popularity rank (0-based)."""
+        ranks = list(range(self.channels))
+        random.Random(f"{self.seed}:{purpose}").shuffle(ranks)
+        return ranks
+
+    def video_counts(self):
+        """
+        Returns the number of videos of every channel, by channel index.
+        Counts follow Zipf over a seeded rank permutation and sum to roughly `videos`.
+        """
+        if self._video_counts is None:
+            weights = self.zipf_weights(self.channels, self.zipf_s)
+            scale = self.videos / sum(weights)
+            self._video_counts = [
+                max(self.min_videos, round(scale * weights[rank])) for rank in self.ranks("videos")
+            ]
+        return self._video_counts
+
+    def channel_videos(self, index):
+        """
+        Generates one channel's videos, newest first.
+        Args:
+            index (int): Channel index (0 <= index < channels).
+        Returns:
+            list: Dicts with video_id, video_title and upload_date (aware datetime at midnight UTC,
+            matching the day precision of the upstream API).
+        """
+        rng = random.Random(f"{self.seed}:channel:{index}")
+        count = self.video_counts()[index]
+        # Active from a random start day until the end date
+        active_days = max(1, int(self.span_days * rng.random() ** 0.5))
+        start = self.end_date - timedelta(days=active_days)
+        offsets = sorted((rng.randrange(active_days) for _ in range(count)), reverse=True)
+
+        videos = []
+        for number, offset in enumerate(offsets):
+            videos.append({
+                "video_id": self.video_id(index, number),
+                "video_title": f"{rng.choice(ADJECTIVES)} {rng.choice(TOPICS)} {rng.choice(FORMATS)} #{count - number}",
+                "upload_date": start + timedelta(days=offset),
+            })
+        return videos
+
+    def iter_channels(self, start=0, stop=None):
+        """Yields (index, channel_id, videos newest first) for channels in [start, stop)."""
+        for index in range(start, self.channels if stop is None else min(stop, self.channels)):
+            yield index, self.channel_id(index), self.channel_videos(index)
+
+    def iter_trace(self, requests, rps=100.0, zipf_s=1.0):
+        """
+        Yields a request trace: channel popularity is Zipf-distributed over an independent ranking,
+        arrivals are a Poisson process at `rps` requests per second.
+        Yields:
+            dict: {"t": seconds since start, "path": "/video/?channel_id=..."}
+        """
+        rng = random.Random(f"{self.seed}:trace")
+        by_rank = [0] * self.channels
+        for index, rank in enumerate(self.ranks("trace")):
+            by_rank[rank] = index
+        cumulative = []
+        total = 0.0
+        for weight in self.zipf_weights(self.channels, zipf_s):
+            total += weight
+            cumulative.append(total)
+
+        elapsed = 0.0
+        for rank in rng.choices(range(self.channels), cum_weights=cumulative, k=requests):
+            elapsed += rng.expovariate(rps)
+            yield {"t": round(elapsed, 4), "path": f"/video/?channel_id={self.channel_id(by_rank[rank])}"}
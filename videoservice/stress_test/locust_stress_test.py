@@ -1,6 +1,18 @@
+import itertools
+import json
+import os
 import random
 
 from locust import HttpUser, task, between
+
+# Optional request trace from `manage.py generate_dataset --trace`: replayed in order (looping)
+TRACE_PATH = os.environ.get("VIDEO_TRACE")
+TRACE = None
+if TRACE_PATH:
+    with open(TRACE_PATH) as trace_file:
+        TRACE = itertools.cycle([json.loads(line)["path"] for line in trace_file])
+
+
 class VideoAPIStressTest(HttpUser):
     wait_time = between(1,5)
 
@@ -36,6 +48,9 @@ class VideoAPIStressTest(HttpUser):
     ]
     @task
     def get_videos(self):
+        if TRACE is not None:
+            self.client.get(next(TRACE), name="/video/?channel_id=[trace]")
+            return
         channel_id = random.choice(self.channel_ids)  # Pick a random channel ID
 
         self.client.get(f"/video/?channel_id={channel_id}")
\ No newline at end of file
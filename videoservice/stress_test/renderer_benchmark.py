@@ -0,0 +1,73 @@
+"""
+Payload-size and encode-time benchmark: VideoJSONRenderer vs VideoMessagePackRenderer.
+
+Renders `--channels` channel payloads of `--videos` videos each (the shape the list endpoint
+serves) with both renderers and reports bytes per payload (raw and gzip) and encode time:
+
+    python -m videoservice.stress_test.renderer_benchmark --channels 2000
+"""
+import argparse
+import gzip
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "videoservice.settings")
+django.setup()
+
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from videoservice.common.renderers import VideoJSONRenderer, VideoMessagePackRenderer  # noqa: E402
+
+
+def build_payloads(channels, videos):
+    factory = APIRequestFactory()
+    started = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    payloads = []
+    for channel_index in range(channels):
+        channel_id = f"UC{channel_index:022x}"
+        request = Request(factory.get("/video/", {"channel_id": channel_id}))
+        data = [
+            {
+                "video_id": f"{channel_index:06x}{video_index:05x}",
+                "video_title": f"Example video {video_index} for channel {channel_index}",
+                "upload_date": (started - timedelta(hours=video_index * 7)).isoformat().replace("+00:00", "Z"),
+                "channel": channel_id,
+            }
+            for video_index in range(videos)
+        ]
+        payloads.append((data, {"request": request}))
+    return payloads
+
+
+def measure(renderer, payloads):
+    bodies = []
+    started = time.perf_counter()
+    for data, context in payloads:
+        bodies.append(renderer.render(data, renderer.media_type, context))
+    elapsed = time.perf_counter() - started
+    sizes = [len(body) for body in bodies]
+    gzip_sizes = [len(gzip.compress(body)) for body in bodies]
+    return elapsed / len(payloads) * 1e6, statistics.mean(sizes), statistics.mean(gzip_sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs MessagePack renderer benchmark")
+    parser.add_argument("--channels", type=int, default=2000)
+    parser.add_argument("--videos", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = build_payloads(args.channels, args.videos)
+    print(f"payloads={args.channels} videos_per_payload={args.videos}")
+    print(f"{'renderer':<10} {'encode us':>10} {'bytes':>8} {'gzip bytes':>11}")
+    for name, renderer in (("json", VideoJSONRenderer()), ("msgpack", VideoMessagePackRenderer())):
+        encode_us, size, gzip_size = measure(renderer, payloads)
+        print(f"{name:<10} {encode_us:>10.1f} {size:>8.0f} {gzip_size:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Cold-start benchmark: import time and time-to-first-request of the WSGI application.
+
+Each run starts a fresh interpreter, imports `videoservice.wsgi`, then serves one request
+in-process through the WSGI callable. The default path (`/video/` without `channel_id`)
+exercises the full Django/DRF stack without needing Redis or the database; pass
+`--path "/video/?channel_id=..."` to include a real lookup.
+
+    python -m videoservice.stress_test.startup_benchmark --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+CHILD_SCRIPT = r"""
+import io, json, os, sys, time
+started = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "videoservice.settings")
+from videoservice.wsgi import application
+imported = time.perf_counter()
+path, _, query = sys.argv[1].partition("?")
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query,
+    "SERVER_NAME": "localhost", "SERVER_PORT": "80", "HTTP_HOST": "localhost",
+    "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr, "wsgi.url_scheme": "http",
+}
+status = []
+body = b"".join(application(environ, lambda s, h, e=None: status.append(s)))
+finished = time.perf_counter()
+print(json.dumps({"import": imported - started, "first_request": finished - imported, "status": status[0]}))
+"""
+
+
+def run_once(path):
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, path],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup / time-to-first-request benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/video/")
+    args = parser.parse_args()
+
+    results = [run_once(args.path) for _ in range(args.runs)]
+    imports = [result["import"] * 1000 for result in results]
+    first_requests = [result["first_request"] * 1000 for result in results]
+    totals = [i + f for i, f in zip(imports, first_requests)]
+
+    print(f"runs={args.runs} path={args.path} status={results[-1]['status']}")
+    print(f"import ms:              median={statistics.median(imports):.1f} max={max(imports):.1f}")
+    print(f"first request ms:       median={statistics.median(first_requests):.1f} max={max(first_requests):.1f}")
+    print(f"time-to-first-request:  median={statistics.median(totals):.1f} max={max(totals):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Local stub of the upstream video API, for offline benchmarks and tests.
+
+Serves `GET /channels/<channel_id>/videos?limit=N` from the mock fixture file, with
+configurable latency, jitter and error rate:
+
+    python -m videoservice.stress_test.stub_upstream --port 8081 --latency-ms 150 --error-rate 0.05
+
+Then point the service at it with `UPSTREAM_API_URL=http://127.0.0.1:8081`.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_PATH = Path(__file__).resolve().parent.parent / "fixtures" / "api_take_home_JSON_file.json"
+PATH_PATTERN = re.compile(r"^/channels/(?P<channel_id>[^/]+)/videos/?$")
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like a real upstream
+
+    def do_GET(self):
+        server = self.server
+        delay = server.latency + random.uniform(0, server.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if random.random() < server.error_rate:
+            self._send_json(503, {"error": "injected failure"})
+            return
+
+        parsed = urlparse(self.path)
+        match = PATH_PATTERN.match(parsed.path)
+        if not match:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        channel_id = match.group("channel_id")
+        videos = server.videos.get(channel_id)
+        if not videos:
+            self._send_json(404, {"error": "channel not found"})
+            return
+
+        limit = int(parse_qs(parsed.query).get("limit", ["5"])[0])
+        videos = sorted(videos, key=lambda video: video["upload_date"], reverse=True)[:limit]
+        self._send_json(200, {"channel_id": channel_id, "videos": videos})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StubUpstreamServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the fixture data and fault-injection settings."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 fixture_path=FIXTURE_PATH, verbose=False):
+        super().__init__((host, port), StubUpstreamHandler)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.verbose = verbose
+        with open(fixture_path, "r") as file:
+            self.videos = json.load(file)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_in_thread(self):
+        """Serves requests from a daemon thread and returns the server (handy in tests)."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub upstream video API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fixed latency added to every response.")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency (uniform, 0..jitter).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--fixture", default=str(FIXTURE_PATH), help="Fixture JSON keyed by channel_id.")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = StubUpstreamServer(
+        args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.fixture, args.verbose
+    )
+    print(f"Stub upstream listening on {server.url} "
+          f"(latency={args.latency_ms}ms, jitter={args.jitter_ms}ms, error_rate={args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
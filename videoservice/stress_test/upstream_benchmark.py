@@ -0,0 +1,85 @@
+"""
+Benchmark for the upstream client against the local stub upstream.
+
+Starts a stub upstream in-process (unless `--url` is given), fires `--requests` fetches
+from `--concurrency` threads and reports latency percentiles, error counts and the final
+circuit breaker state:
+
+    python -m videoservice.stress_test.upstream_benchmark --latency-ms 50 --error-rate 0.1
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "videoservice.settings")
+django.setup()
+
+from videoservice.common.exceptions import UpstreamUnavailable  # noqa: E402
+from videoservice.services.upstream_client import UpstreamVideoClient  # noqa: E402
+from videoservice.stress_test.stub_upstream import FIXTURE_PATH, StubUpstreamServer  # noqa: E402
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upstream client benchmark")
+    parser.add_argument("--url", help="Existing upstream URL (default: start a stub in-process).")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=10, help="Client concurrency limit.")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = StubUpstreamServer(
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate
+        ).start_in_thread()
+        url = server.url
+
+    with open(FIXTURE_PATH, "r") as file:
+        channel_ids = list(json.load(file))
+
+    client = UpstreamVideoClient(url, max_concurrency=args.max_concurrency, acquire_timeout=1.0)
+
+    def fetch(index):
+        started = time.perf_counter()
+        try:
+            client.fetch_channel_videos(channel_ids[index % len(channel_ids)])
+            ok = True
+        except UpstreamUnavailable:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(fetch, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    failures = sum(1 for _, ok in results if not ok)
+    print(f"requests={args.requests} concurrency={args.concurrency} elapsed={elapsed:.2f}s "
+          f"throughput={args.requests / elapsed:.1f} req/s")
+    print(f"latency ms: p50={percentile(latencies, 0.5):.1f} p95={percentile(latencies, 0.95):.1f} "
+          f"p99={percentile(latencies, 0.99):.1f} max={latencies[-1]:.1f}")
+    print(f"failures={failures} breaker={client.breaker.snapshot()}")
+
+    if server:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from videoservice import settings
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+
+
+@pytest.mark.django_db
+def test_backfill_latest_videos(monkeypatch):
+    """Test the backfill command rebuilds latest_videos from the video table."""
+    monkeypatch.setattr(settings, "LATEST_VIDEOS_LIMIT", 5)
+    channel = Channel.objects.create(channel_id="UC123456", name="Test Channel")
+    for i in range(7):
+        Video.objects.create(
+            video_id=f"vid{i}",
+            video_title=f"Video {i}",
+            upload_date=datetime(2024, 3, i + 1),
+            channel=channel,
+        )
+    Channel.objects.create(channel_id="UC_EMPTY", name="Empty Channel")
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command("backfill_latest_videos", batch_size=1)
+
+    video_reads = [query["sql"] for query in queries if 'FROM "videoservice_video"' in query["sql"]]
+    assert len(video_reads) == 2  # one bounded read per channel
+    assert all("LIMIT 6" in sql for sql in video_reads)  # one past the limit: are there older videos?
+    # Each chunk is read and written in one transaction
+    statements = [query["sql"].split()[0] for query in queries]
+    first_read = next(i for i, query in enumerate(queries) if 'FROM "videoservice_video"' in query["sql"])
+    write = next(i for i, query in enumerate(queries) if query["sql"].startswith("UPDATE"))
+    assert "SAVEPOINT" in statements[:first_read] and "RELEASE" in statements[write:]
+    assert "RELEASE" not in statements[first_read:write]
+    channel.refresh_from_db()
+    assert [entry["video_id"] for entry in channel.latest_videos] == ["vid6", "vid5", "vid4", "vid3", "vid2"]
+    assert not channel.latest_videos_complete
+    empty = Channel.objects.get(channel_id="UC_EMPTY")
+    assert empty.latest_videos == [] and empty.latest_videos_complete
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from videoservice.models.channel import Channel
+from videoservice.models.upload_stats import ChannelUploadStats
+from videoservice.models.video import Video
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.stress_test.dataset_generator import SyntheticDataset
+
+
+class TestSyntheticDataset:
+
+    def test_deterministic_per_seed(self):
+        """Test the same seed reproduces the same data and another seed does not."""
+        first = list(SyntheticDataset(50, 2000, seed=7).iter_channels())
+        again = list(SyntheticDataset(50, 2000, seed=7).iter_channels(25))
+        other = list(SyntheticDataset(50, 2000, seed=8).iter_channels())
+
+        assert first[25:] == again
+        assert first != other
+
+    def test_zipf_video_counts(self):
+        """Test videos per channel are heavy-tailed and add up to roughly the requested total."""
+        counts = sorted(SyntheticDataset(1000, 100000).video_counts(), reverse=True)
+
+        assert abs(sum(counts) - 100000) < 2000
+        assert counts[0] > 50 * counts[len(counts) // 2]
+        assert min(counts) >= 1
+
+    def test_videos_newest_first_within_span(self):
+        """Test a channel's uploads are sorted newest first and inside the date span."""
+        dataset = SyntheticDataset(10, 500, span_days=365)
+        for _, _, videos in dataset.iter_channels():
+            dates = [video["upload_date"] for video in videos]
+            assert dates == sorted(dates, reverse=True)
+            assert (dataset.end_date - dates[-1]).days <= 365
+
+
+@pytest.mark.django_db
+class TestGenerateDatasetCommand:
+
+    def test_writes_db_fixture_and_trace(self, tmp_path):
+        """Test the command writes channels, videos, rollups and matching fixture/trace files."""
+        fixture = tmp_path / "fixture.json"
+        trace = tmp_path / "trace.ndjson"
+
+        call_command(
+            "generate_dataset", channels=20, videos=300, batch_size=7,
+            fixture=str(fixture), fixture_videos=3, trace=str(trace), trace_requests=50,
+        )
+
+        dataset = SyntheticDataset(20, 300)
+        assert Channel.objects.count() == 20
+        assert Video.objects.count() == sum(dataset.video_counts())
+        assert ChannelUploadStats.objects.count() == 20
+        fixture_data = json.loads(fixture.read_text())
+        assert len(fixture_data) == 20
+        channel_id, videos = next(iter(fixture_data.items()))
+        assert Channel.objects.get(channel_id=channel_id).latest_videos[0]["video_id"] == videos[0]["video_id"]
+        assert len(trace.read_text().splitlines()) == 50
+
+        # Re-ingesting the fixture finds nothing new or changed
+        result = VideoIngestService.store_videos(channel_id, videos)
+        assert result == {"inserted": 0, "updated": 0, "unchanged": 3}
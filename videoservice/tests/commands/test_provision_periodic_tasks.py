@@ -0,0 +1,38 @@
+import pytest
+from django.core.management import call_command
+from django_celery_beat.models import PeriodicTask
+
+from videoservice import settings
+
+
+@pytest.mark.django_db
+def test_provision_periodic_tasks_is_idempotent():
+    """Test provisioning twice leaves exactly one periodic task per definition."""
+    PeriodicTask.objects.all().delete()
+
+    call_command("provision_periodic_tasks")
+    call_command("provision_periodic_tasks")
+
+    assert sorted(PeriodicTask.objects.values_list("task", flat=True)) == [
+        "videoservice.config.tasks.refresh_due_channels",
+        "videoservice.config.tasks.update_video_cache",
+    ]
+
+
+@pytest.mark.django_db
+def test_fixed_cache_refresh_only_runs_without_the_scheduler(monkeypatch):
+    """Test the fixed-interval cache refresh is provisioned disabled while the adaptive scheduler runs."""
+    scheduler = {**settings.REFRESH_SCHEDULER, "ENABLED": True}
+    monkeypatch.setattr(settings, "REFRESH_SCHEDULER", scheduler)
+    call_command("provision_periodic_tasks")
+    assert dict(PeriodicTask.objects.values_list("task", "enabled")) == {
+        "videoservice.config.tasks.refresh_due_channels": True,
+        "videoservice.config.tasks.update_video_cache": False,
+    }
+
+    scheduler["ENABLED"] = False
+    call_command("provision_periodic_tasks")
+    assert dict(PeriodicTask.objects.values_list("task", "enabled")) == {
+        "videoservice.config.tasks.refresh_due_channels": False,
+        "videoservice.config.tasks.update_video_cache": True,
+    }
@@ -0,0 +1,40 @@
+import gzip
+
+import brotli
+
+from videoservice.common.compression import compress_variants, negotiate_encoding
+
+
+class TestNegotiateEncoding:
+
+    def test_prefers_brotli(self):
+        """Test Brotli is preferred when the client accepts both codings."""
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+
+    def test_respects_quality_values(self):
+        """Test codings with q=0 are never chosen."""
+        assert negotiate_encoding("br;q=0, gzip;q=0.5") == "gzip"
+        assert negotiate_encoding("*;q=0") == "identity"
+
+    def test_missing_header(self):
+        """Test no Accept-Encoding header means identity."""
+        assert negotiate_encoding("") == "identity"
+
+
+class TestCompressVariants:
+
+    def test_large_body_variants(self):
+        """Test every variant decodes to the original body."""
+        body = b'{"channel": [' + b'{"video_title": "Example video"},' * 100 + b"{}]}"
+        variants = compress_variants(body)
+
+        assert variants["identity"] == ("identity", body)
+        assert variants["gzip"][0] == "gzip" and gzip.decompress(variants["gzip"][1]) == body
+        assert variants["br"][0] == "br" and brotli.decompress(variants["br"][1]) == body
+
+    def test_small_body_not_compressed(self):
+        """Test bodies below the size threshold are served uncompressed."""
+        variants = compress_variants(b'{"channel": []}')
+
+        assert variants["gzip"] == ("identity", b'{"channel": []}')
+        assert variants["br"] == ("identity", b'{"channel": []}')
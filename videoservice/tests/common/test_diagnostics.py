@@ -0,0 +1,150 @@
+import tracemalloc
+from datetime import datetime
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice import settings
+from videoservice.common.diagnostics import AllocationProfilerMiddleware, DiagnosticsMiddleware, WorstSamples, \
+    allocation_samples, allocation_stage, normalize_sql, slow_requests
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+
+
+@pytest.fixture
+def diagnostics(monkeypatch):
+    config = {
+        "ENABLED": True, "ADMIN_TOKEN": "secret", "SLOW_REQUEST_MS": 0, "SLOW_QUERY_MS": 0,
+        "N_PLUS_ONE_THRESHOLD": 3,
+    }
+    monkeypatch.setattr(settings, "DIAGNOSTICS", config, raising=False)
+    slow_requests.clear()
+    yield config
+    slow_requests.clear()
+
+
+def n_plus_one_view(request):
+    for channel in list(Channel.objects.all()):
+        list(Video.objects.filter(channel_id=channel.channel_id))
+    return HttpResponse("ok")
+
+
+@pytest.mark.django_db
+class TestDiagnosticsMiddleware:
+    def setup_method(self, method):
+        for i in range(4):
+            channel = Channel.objects.create(channel_id=f"UC_{i}", name=f"Channel {i}")
+            Video.objects.create(video_id=f"vid_{i}", video_title="Video", upload_date=datetime(2024, 3, 1), channel=channel)
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test the middleware removes itself unless diagnostics are enabled."""
+        monkeypatch.setattr(settings, "DIAGNOSTICS", {"ENABLED": False}, raising=False)
+        with pytest.raises(MiddlewareNotUsed):
+            DiagnosticsMiddleware(n_plus_one_view)
+
+    def test_slow_request_sample(self, diagnostics):
+        """Test a slow request records its queries, flags repeated statements and explains slow queries."""
+        middleware = DiagnosticsMiddleware(n_plus_one_view)
+
+        middleware(RequestFactory().get("/video/?channel_id=UC_0"))
+
+        sample = slow_requests.samples()[0]
+        assert sample["path"] == "/video/?channel_id=UC_0"
+        assert sample["query_count"] == 5
+        assert sample["n_plus_one"][0]["count"] == 4
+        assert "videoservice_video" in sample["n_plus_one"][0]["sql"]
+        assert any(query.get("explain") for query in sample["queries"])
+
+    def test_fast_requests_are_not_recorded(self, diagnostics):
+        """Test requests under the threshold leave no sample."""
+        diagnostics["SLOW_REQUEST_MS"] = 60_000
+        DiagnosticsMiddleware(n_plus_one_view)(RequestFactory().get("/video/"))
+
+        assert slow_requests.samples() == []
+
+    def test_admin_endpoint_requires_token(self, client, diagnostics):
+        """Test the slow request endpoint is only served with the configured token."""
+        DiagnosticsMiddleware(n_plus_one_view)(RequestFactory().get("/video/"))
+        url = reverse("diagnostics-slow-requests")
+
+        assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(url, HTTP_X_DIAGNOSTICS_TOKEN="secret")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["samples"]) == 1
+
+
+@pytest.fixture
+def allocations(monkeypatch):
+    config = {"ALLOCATIONS": True, "ADMIN_TOKEN": "secret", "ALLOCATION_TOP_SITES": 3}
+    monkeypatch.setattr(settings, "DIAGNOSTICS", config, raising=False)
+    allocation_samples.clear()
+    yield config
+    allocation_samples.clear()
+    tracemalloc.stop()
+
+
+def allocating_view(request):
+    with allocation_stage("build"):
+        rows = [{"index": i, "title": f"Video {i}"} for i in range(2000)]
+    with allocation_stage("render"):
+        body = str(rows).encode()
+    return HttpResponse(body[:2])
+
+
+class TestAllocationProfilerMiddleware:
+    def test_disabled_by_default(self, monkeypatch):
+        """Test the profiler removes itself unless allocation profiling is enabled."""
+        monkeypatch.setattr(settings, "DIAGNOSTICS", {"ALLOCATIONS": False}, raising=False)
+        with pytest.raises(MiddlewareNotUsed):
+            AllocationProfilerMiddleware(allocating_view)
+
+    def test_reports_allocations_per_request_and_stage(self, allocations):
+        """Test every request gets an allocation report with its stages and top allocation sites."""
+        AllocationProfilerMiddleware(allocating_view)(RequestFactory().get("/video/?channel_id=UC_0"))
+
+        sample = allocation_samples.samples()[0]
+        assert sample["path"] == "/video/?channel_id=UC_0"
+        assert [stage["stage"] for stage in sample["stages"]] == ["build", "render"]
+        build = sample["stages"][0]
+        assert build["allocated_kb"] > 100
+        assert sample["allocated_kb"] >= build["allocated_kb"]
+        assert sample["gc_collections"] >= 0
+        assert len(sample["top_sites"]) == 3
+
+    def test_stages_are_free_outside_profiled_requests(self):
+        """Test stages outside a profiled request do not require tracemalloc."""
+        with allocation_stage("build"):
+            pass
+        assert not tracemalloc.is_tracing()
+
+    def test_admin_endpoint(self, client, allocations):
+        """Test the allocation samples are served with the configured token."""
+        AllocationProfilerMiddleware(allocating_view)(RequestFactory().get("/video/"))
+        url = reverse("diagnostics-allocations")
+
+        assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(url, HTTP_X_DIAGNOSTICS_TOKEN="secret")
+        assert response.json()["enabled"] is True
+        assert len(response.json()["samples"]) == 1
+        assert client.delete(url, HTTP_X_DIAGNOSTICS_TOKEN="secret").status_code == status.HTTP_204_NO_CONTENT
+        assert allocation_samples.samples() == []
+
+
+def test_worst_samples_keeps_slowest():
+    """Test the buffer is bounded and keeps the slowest samples."""
+    samples = WorstSamples(3)
+    for duration in (5, 1, 9, 3, 7):
+        samples.add(duration, {"duration_ms": duration})
+
+    assert [sample["duration_ms"] for sample in samples.samples()] == [9, 7, 5]
+
+
+def test_normalize_sql_groups_parameters():
+    """Test statements differing only in literals and IN-list length share a shape."""
+    assert normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 5") == normalize_sql(
+        "SELECT * FROM t WHERE id IN (%s, %s) LIMIT 21"
+    )
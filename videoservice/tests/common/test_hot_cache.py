@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from videoservice import settings
+from videoservice.common import hot_cache as hot_cache_module, video_cache
+from videoservice.common.hot_cache import SEQ, SharedHotCache
+from videoservice.common.video_cache import build_validators, limit_validators, recent_videos_key
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.serializers.video_serializer import VideoSerializer
+from videoservice.services.hot_cache_service import HotCacheRefresher
+from videoservice.services.video_service import VideoService
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "hot_cache")
+
+
+class TestSharedHotCache:
+    def test_round_trip_between_writer_and_reader(self, cache_path):
+        writer = SharedHotCache.create(cache_path, slots=64, slot_size=512)
+        reader = SharedHotCache.open(cache_path)
+        assert writer.put("recent_videos:UC_1", b"payload", ttl=60)
+        assert reader.get("recent_videos:UC_1") == b"payload"
+        assert writer.put("recent_videos:UC_1", b"updated", ttl=60)
+        assert reader.get("recent_videos:UC_1") == b"updated"
+        assert reader.get("recent_videos:UC_2") is None
+
+    def test_entries_expire(self, cache_path):
+        writer = SharedHotCache.create(cache_path, slots=64, slot_size=512)
+        writer.put("key", b"value", ttl=10, now=1000.0)
+        assert writer.get("key", now=1005.0) == b"value"
+        assert writer.get("key", now=1010.0) is None
+
+    def test_collisions_are_probed_and_full_chains_evict_the_earliest_expiry(self, cache_path):
+        writer = SharedHotCache.create(cache_path, slots=4, slot_size=256)
+        for i in range(4):
+            assert writer.put(f"key{i}", f"value{i}".encode(), ttl=100 + i, now=0.0)
+        assert [writer.get(f"key{i}", now=1.0) for i in range(4)] == [b"value0", b"value1", b"value2", b"value3"]
+
+        writer.put("key4", b"value4", ttl=500, now=1.0)
+        assert writer.get("key4", now=2.0) == b"value4"
+        assert writer.get("key0", now=2.0) is None
+        assert writer.get("key3", now=2.0) == b"value3"
+
+    def test_oversized_values_are_not_cached(self, cache_path):
+        writer = SharedHotCache.create(cache_path, slots=8, slot_size=256)
+        assert not writer.put("key", b"x" * 256, ttl=60)
+        assert writer.get("key") is None
+
+    def test_slot_being_written_reads_as_miss(self, cache_path):
+        writer = SharedHotCache.create(cache_path, slots=1, slot_size=256)
+        writer.put("key", b"value", ttl=60)
+        offset = writer._offset(0)
+        seq = SEQ.unpack_from(writer._mm, offset)[0]
+        SEQ.pack_into(writer._mm, offset, seq + 1)
+        assert SharedHotCache.open(cache_path).get("key") is None
+
+    def test_readers_cannot_write_and_reject_foreign_files(self, cache_path, tmp_path):
+        SharedHotCache.create(cache_path, slots=8, slot_size=256)
+        with pytest.raises(PermissionError):
+            SharedHotCache.open(cache_path).put("key", b"value", ttl=60)
+
+        other = tmp_path / "not_a_cache"
+        other.write_bytes(b"\0" * 1024)
+        assert SharedHotCache.open(str(other)) is None
+        assert SharedHotCache.open(str(tmp_path / "missing")) is None
+
+    def test_geometry_change_replaces_the_file(self, cache_path):
+        SharedHotCache.create(cache_path, slots=8, slot_size=256).put("key", b"value", ttl=60)
+        reader = SharedHotCache.open(cache_path)
+        assert not reader.is_stale()
+        assert SharedHotCache.create(cache_path, slots=8, slot_size=256).get("key") == b"value"
+
+        SharedHotCache.create(cache_path, slots=16, slot_size=256)
+        assert reader.is_stale()
+
+
+@pytest.mark.django_db
+class TestHotCacheReads:
+    def setup_method(self, method):
+        self.channel = Channel.objects.create(channel_id="UC_HOT", name="Hot Channel")
+        self.videos = [
+            Video(
+                video_id=f"vid_{i}", video_title=f"Video {i}",
+                upload_date=datetime(2024, 3, 5 - i, tzinfo=timezone.utc), channel=self.channel,
+            )
+            for i in range(3)
+        ]
+        Video.objects.bulk_create(self.videos)
+        self.channel.latest_videos = [Channel.to_latest_entry(video) for video in self.videos]
+        self.channel.latest_videos_complete = True
+        self.channel.save()
+
+    @pytest.fixture(autouse=True)
+    def hot_cache(self, monkeypatch, cache_path):
+        monkeypatch.setattr(settings, "HOT_CACHE", {"ENABLED": True, "PATH": cache_path, "SLOTS": 64}, raising=False)
+        monkeypatch.setattr(settings, "USE_REDIS", False)
+        monkeypatch.setattr(hot_cache_module, "_reader", None)
+        monkeypatch.setattr(hot_cache_module, "_reader_checked_at", 0.0)
+        monkeypatch.setattr(VideoService, "record_access", classmethod(lambda cls, channel_id: None))
+        self.writer = HotCacheRefresher.open_cache()
+        yield
+        self.writer.close()
+
+    def test_refresh_stores_serialized_payloads(self):
+        assert HotCacheRefresher.refresh(self.writer) == 1
+        assert self.writer.get(recent_videos_key("UC_HOT")) is not None
+
+    def test_hot_hit_needs_no_database_query(self, monkeypatch):
+        monkeypatch.setattr(video_cache, "modified_epoch", lambda: 1_710_000_000)
+        HotCacheRefresher.refresh(self.writer)
+        with CaptureQueriesContext(connection) as queries:
+            data, status_code, validators = VideoService.get_recent_videos_with_validators("UC_HOT")
+            cached_validators = VideoService.get_cached_validators("UC_HOT")
+
+        assert len(queries) == 0
+        assert status_code == 200
+        assert data == VideoSerializer(self.videos, many=True).data
+        assert validators == cached_validators == limit_validators(build_validators(self.videos), 5)
+
+    def test_smaller_limits_slice_the_hot_entry(self):
+        HotCacheRefresher.refresh(self.writer)
+        data, _, validators = VideoService.get_recent_videos_with_validators("UC_HOT", limit=2)
+
+        assert data == VideoSerializer(self.videos[:2], many=True).data
+        assert validators == VideoService.get_cached_validators("UC_HOT", 2)
+        assert validators["etag"] != VideoService.get_cached_validators("UC_HOT")["etag"]
+
+    def test_disabled_cache_is_skipped(self, monkeypatch):
+        HotCacheRefresher.refresh(self.writer)
+        monkeypatch.setattr(settings, "HOT_CACHE", {"ENABLED": False}, raising=False)
+        assert VideoService.get_hot_payload("UC_HOT") is None
@@ -0,0 +1,153 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice import settings
+from videoservice.common import profiler
+from videoservice.common.profiler import ProfileInProgress, SamplingProfilerMiddleware, format_collapsed, \
+    start_profile, tag_request_path
+from videoservice.common.resilient_cache import ResilientCache
+
+
+@pytest.fixture
+def profiling(monkeypatch):
+    config = {"PROFILER": True, "ADMIN_TOKEN": "secret", "PROFILE_MAX_SECONDS": 5}
+    monkeypatch.setattr(settings, "DIAGNOSTICS", config, raising=False)
+    return config
+
+
+@pytest.fixture
+def shared_cache():
+    backend = LocMemCache("profiles", {})
+    backend.clear()
+    with patch("videoservice.views.diagnostics_view.resilient_cache", ResilientCache(backend=backend)):
+        yield backend
+
+
+def busy_db_view(request):
+    tag_request_path("db")
+    deadline = time.monotonic() + 0.3
+    while time.monotonic() < deadline:
+        sum(range(1000))
+    return HttpResponse("ok")
+
+
+def fetch_profile(client, profile_id):
+    deadline = time.monotonic() + 5
+    while True:
+        response = client.get(reverse("diagnostics-profile") + f"?id={profile_id}", HTTP_X_DIAGNOSTICS_TOKEN="secret")
+        if response.status_code != status.HTTP_202_ACCEPTED or time.monotonic() > deadline:
+            return response
+        time.sleep(0.01)
+
+
+def wait_until_active():
+    deadline = time.monotonic() + 5
+    while not profiler._active and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestSamplingProfiler:
+    def test_middleware_disabled_by_default(self, monkeypatch):
+        """Test the middleware removes itself unless profiling is enabled."""
+        monkeypatch.setattr(settings, "DIAGNOSTICS", {"PROFILER": False}, raising=False)
+        with pytest.raises(MiddlewareNotUsed):
+            SamplingProfilerMiddleware(busy_db_view)
+
+    def test_samples_are_attributed_to_the_serving_path(self, profiling):
+        """Test request threads are sampled with their serving path as the root frame."""
+        middleware = SamplingProfilerMiddleware(busy_db_view)
+        results = {}
+        done = threading.Event()
+        start_profile(0.5, 0.002, lambda samples: (results.update(samples=samples), done.set()))
+        wait_until_active()
+        middleware(RequestFactory().get("/video/?channel_id=UC1"))
+        assert done.wait(5)
+
+        samples = results["samples"]
+        db_stacks = [stack for stack in samples if stack.startswith("db;")]
+        assert db_stacks
+        assert any("busy_db_view" in stack for stack in db_stacks)
+        assert not any("profiler.py:_sample" in stack for stack in samples)
+        assert format_collapsed(samples).splitlines()[0].rsplit(" ", 1)[1].isdigit()
+        assert profiler._thread_paths == {}
+
+    def test_one_profile_at_a_time(self, profiling):
+        """Test a second concurrent profile is refused until the first one is done."""
+        done = threading.Event()
+        start_profile(0.3, 0.01, lambda samples: done.set())
+        wait_until_active()
+        with pytest.raises(ProfileInProgress):
+            start_profile(0.1, 0.01, lambda samples: None)
+        assert done.wait(5)
+        finished = threading.Event()
+        start_profile(0.01, 0.01, lambda samples: finished.set())
+        assert finished.wait(5)
+
+    def test_tagging_is_a_no_op_when_idle(self):
+        """Test tagging outside a profile records nothing."""
+        tag_request_path("hit")
+        assert profiler._thread_paths == {}
+
+
+class TestProfileEndpoint:
+    def test_disabled_profiler_is_not_found(self, client, profiling):
+        profiling["PROFILER"] = False
+        response = client.post(reverse("diagnostics-profile"), HTTP_X_DIAGNOSTICS_TOKEN="secret")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_requires_token_and_valid_duration(self, client, profiling):
+        url = reverse("diagnostics-profile")
+        assert client.post(url + "?seconds=0.05").status_code == status.HTTP_403_FORBIDDEN
+        assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        assert client.post(url + "?seconds=60", HTTP_X_DIAGNOSTICS_TOKEN="secret").status_code == \
+            status.HTTP_400_BAD_REQUEST
+
+    def test_unknown_or_missing_profile_id(self, client, profiling, shared_cache):
+        url = reverse("diagnostics-profile")
+        assert client.get(url + "?id=nope", HTTP_X_DIAGNOSTICS_TOKEN="secret").status_code == \
+            status.HTTP_404_NOT_FOUND
+        assert client.get(url, HTTP_X_DIAGNOSTICS_TOKEN="secret").status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_start_returns_at_once_and_samples_concurrent_requests(self, client, profiling, shared_cache):
+        """Test the profile runs in the background while the worker keeps serving requests."""
+        url = reverse("diagnostics-profile") + "?seconds=0.5&interval_ms=2"
+        started = time.monotonic()
+        response = client.post(url, HTTP_X_DIAGNOSTICS_TOKEN="secret")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert time.monotonic() - started < 0.5
+        profile_id = response.json()["id"]
+        assert client.post(url, HTTP_X_DIAGNOSTICS_TOKEN="secret").status_code == status.HTTP_409_CONFLICT
+        # Only the running profile's entry is in the shared cache
+        assert len(shared_cache._cache) == 1
+
+        # Served by the same thread that started the profile
+        SamplingProfilerMiddleware(busy_db_view)(RequestFactory().get("/video/?channel_id=UC1"))
+        response = fetch_profile(client, profile_id)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        assert int(response["X-Profile-Samples"]) > 0
+        assert any(
+            line.startswith("db;") and "busy_db_view" in line for line in response.content.decode().splitlines()
+        )
+
+    def test_result_is_read_from_the_shared_cache(self, client, profiling, shared_cache):
+        """Test any worker can serve a profile by id: the result lives in the shared cache."""
+        url = reverse("diagnostics-profile")
+        profile_id = client.post(url + "?seconds=0.05&interval_ms=5", HTTP_X_DIAGNOSTICS_TOKEN="secret").json()["id"]
+        assert fetch_profile(client, profile_id).status_code == status.HTTP_200_OK
+
+        # Another worker has no profiler state of its own, only the cache
+        with patch.object(profiler, "_profile_lock", threading.Lock()):
+            response = client.get(url + f"?id={profile_id}", HTTP_X_DIAGNOSTICS_TOKEN="secret")
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Profile-Samples" in response
@@ -0,0 +1,37 @@
+import msgpack
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from videoservice.common.renderers import VideoJSONRenderer, VideoMessagePackRenderer
+
+VIDEOS = [
+    {"video_id": "vid1", "video_title": "Video 1", "upload_date": "2024-03-01T00:00:00Z", "channel": "UC123456"},
+]
+
+
+def renderer_context(channel_id="UC123456"):
+    return {"request": Request(APIRequestFactory().get("/video/", {"channel_id": channel_id}))}
+
+
+class TestVideoMessagePackRenderer:
+
+    def test_groups_by_channel_with_epoch_dates(self):
+        """Test MessagePack output has the JSON structure with integer epoch upload dates."""
+        body = VideoMessagePackRenderer().render(VIDEOS, renderer_context=renderer_context())
+
+        assert msgpack.unpackb(body) == {
+            "UC123456": [{**VIDEOS[0], "upload_date": 1709251200}],
+        }
+
+    def test_smaller_than_json(self):
+        """Test the MessagePack payload is smaller than the JSON one."""
+        msgpack_body = VideoMessagePackRenderer().render(VIDEOS, renderer_context=renderer_context())
+        json_body = VideoJSONRenderer().render(VIDEOS, renderer_context=renderer_context())
+
+        assert len(msgpack_body) < len(json_body)
+
+    def test_renders_errors_unchanged(self):
+        """Test error payloads pass through untouched."""
+        errors = {"errors": [{"status": "404", "detail": "Not found."}]}
+
+        assert msgpack.unpackb(VideoMessagePackRenderer().render(errors, renderer_context=renderer_context())) == errors
@@ -0,0 +1,136 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework import status
+
+from videoservice import settings
+from videoservice.common.circuit_breaker import CircuitBreaker
+from videoservice.common.resilient_cache import LocalCache, ResilientCache
+from videoservice.common.single_flight import SingleFlight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResilientCache:
+    def setup_method(self, method):
+        self.clock = FakeClock()
+        self.backend = LocMemCache("resilient", {})
+        self.backend.clear()
+        self.cache = ResilientCache(
+            backend=self.backend,
+            breaker=CircuitBreaker("redis-cache", failure_threshold=2, recovery_timeout=5.0, clock=self.clock),
+            local=LocalCache(max_entries=10, ttl=30, clock=self.clock),
+        )
+
+    def fail_backend(self):
+        failing = MagicMock(side_effect=RedisConnectionError("down"))
+        self.cache.backend = MagicMock(get=failing, set=failing, set_many=failing, delete_many=failing)
+        return failing
+
+    def test_healthy_calls_go_to_redis(self):
+        self.cache.set("key", "value", timeout=60)
+        assert self.backend.get("key") == "value"
+        assert self.cache.get("key") == "value"
+        assert len(self.cache.local) == 0
+
+    def test_outage_falls_back_to_local_cache_and_skips_redis(self):
+        failing = self.fail_backend()
+        self.cache.set("key", "value", timeout=60)
+        assert self.cache.get("key") == "value"
+        assert self.cache.breaker.state == CircuitBreaker.OPEN
+
+        calls = failing.call_count
+        self.cache.set_many({"other": "value"})
+        assert self.cache.get("other") == "value"
+        assert failing.call_count == calls  # Redis skipped while the breaker is open
+
+    def test_recovers_and_drops_local_entries(self):
+        self.fail_backend()
+        self.cache.set("key", "stale")
+        self.cache.get("key")
+
+        self.cache.backend = self.backend
+        self.clock.now += 5.0
+        assert self.cache.get("key") is None  # half-open trial reaches Redis
+        assert self.cache.breaker.state == CircuitBreaker.CLOSED
+        assert len(self.cache.local) == 0
+
+    def test_delete_many_also_clears_local_entries(self):
+        self.fail_backend()
+        self.cache.set("key", "value")
+        self.cache.delete_many(["key"])
+        assert self.cache.get("key") is None
+
+    def test_snapshot_reports_breaker_state(self):
+        self.fail_backend()
+        self.cache.get("a")
+        self.cache.get("b")
+        snapshot = self.cache.snapshot()
+        assert snapshot["name"] == "redis-cache"
+        assert snapshot["state"] == CircuitBreaker.OPEN
+
+
+def test_local_cache_is_bounded_and_expires():
+    clock = FakeClock()
+    local = LocalCache(max_entries=2, ttl=10, clock=clock)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)  # evicts the least recently used entry
+    assert local.get("b") is None
+    assert local.get("a") == 1
+
+    local.set("short", 4, timeout=60)  # capped at the local ttl
+    clock.now = 10.0
+    assert local.get("short") is None
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["vid1"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("UC1", load)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("UC1", load))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    time.sleep(0.2)  # let the followers reach the in-flight call
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [["vid1"]] * 4
+    assert flight.do("UC1", lambda: "next") == "next"
+
+
+@pytest.mark.django_db
+def test_breakers_endpoint(client, monkeypatch):
+    monkeypatch.setattr(settings, "DIAGNOSTICS", {"ADMIN_TOKEN": "secret"}, raising=False)
+    url = reverse("diagnostics-breakers")
+
+    assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+    response = client.get(url, HTTP_X_DIAGNOSTICS_TOKEN="secret")
+    assert response.status_code == status.HTTP_200_OK
+    assert "redis-cache" in [breaker["name"] for breaker in response.json()["breakers"]]
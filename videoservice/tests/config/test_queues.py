@@ -0,0 +1,80 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from videoservice.config import tasks
+from videoservice.config.celery import celery_app
+from videoservice.config.queues import message_age, queue_stats, stamp_sent_at
+
+
+class TestQueueTopology:
+
+    @pytest.mark.parametrize("task_name, queue", [
+        ("videoservice.config.tasks.refresh_due_channels", "refresh"),
+        ("videoservice.config.tasks.update_video_cache", "refresh"),
+        ("videoservice.config.tasks.store_videos_in_db", "ingest"),
+        ("videoservice.config.tasks.update_last_accessed", "bookkeeping"),
+        ("videoservice.config.tasks.prefetch_channels", "bookkeeping"),
+    ])
+    def test_tasks_are_routed_to_their_queue(self, task_name, queue):
+        """Test every task is routed to its own workload queue."""
+        assert celery_app.amqp.router.route({}, task_name)["queue"].name == queue
+
+    def test_tasks_are_fire_and_forget(self):
+        """Test no task stores a result and ingest is acknowledged late."""
+        for task in (tasks.update_last_accessed, tasks.store_videos_in_db, tasks.update_video_cache,
+                     tasks.refresh_due_channels, tasks.prefetch_channels):
+            assert task.ignore_result
+        assert tasks.store_videos_in_db.acks_late
+
+    def test_message_age(self):
+        """Test lag is read from the sent_at header stamped on publish."""
+        headers = {}
+        stamp_sent_at(headers=headers)
+        raw = json.dumps({"headers": {"sent_at": 100.0}})
+
+        assert "sent_at" in headers
+        assert message_age(raw, now=112.5) == 12.5
+        assert message_age(json.dumps({"headers": {}}), now=112.5) is None
+        assert message_age(b"not json") is None
+
+    def test_queue_stats_reads_redis_lists(self):
+        """Test depth and the oldest message's age are read per queue."""
+        client = MagicMock()
+        client.llen.side_effect = lambda queue: {"ingest": 2}.get(queue, 0)
+        client.lindex.return_value = json.dumps({"headers": {"sent_at": 90.0}})
+        connection = MagicMock()
+        connection.transport.driver_type = "redis"
+        connection.default_channel.client = client
+        app = MagicMock()
+        app.connection_for_read.return_value.__enter__.return_value = connection
+
+        stats = queue_stats(app, ("ingest", "bookkeeping"), now=100.0)
+
+        assert stats == {
+            "ingest": {"depth": 2, "lag_seconds": 10.0},
+            "bookkeeping": {"depth": 0, "lag_seconds": None},
+        }
+        client.lindex.assert_called_once_with("ingest", -1)
+
+    def test_queue_stats_needs_the_redis_broker(self):
+        """Test other brokers are rejected with a clear error, reported by the command."""
+        app = MagicMock()
+        app.connection_for_read.return_value.__enter__.return_value.transport.driver_type = "amqp"
+
+        with pytest.raises(ValueError):
+            queue_stats(app)
+        with patch("videoservice.management.commands.queue_stats.celery_app", app), \
+                pytest.raises(CommandError, match="Redis broker"):
+            call_command("queue_stats")
+
+    @patch.object(tasks.update_last_accessed, "apply_async")
+    def test_last_accessed_updates_expire(self, mock_apply_async, monkeypatch):
+        """Test bookkeeping tasks are published with an expiry so a backlog drains instead of running late."""
+        monkeypatch.setattr(tasks.settings, "USE_CELERY", True)
+
+        tasks.async_update_last_accessed("UC123456")
+
+        mock_apply_async.assert_called_once_with(("UC123456",), expires=tasks.LAST_ACCESSED_TASK_EXPIRES)
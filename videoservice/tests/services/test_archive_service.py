@@ -0,0 +1,74 @@
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+
+from videoservice import settings
+from videoservice.models.upload_stats import ChannelUploadStats
+from videoservice.models.video import Video
+from videoservice.models.video_archive import VideoArchive
+from videoservice.services.archive_service import VideoArchiveService
+from videoservice.services.export_service import VideoExportService
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.search_service import VideoSearchService
+from videoservice.services.stats_service import ChannelStatsService
+
+
+@pytest.fixture(autouse=True)
+def latest_videos_limit(monkeypatch):
+    monkeypatch.setattr(settings, "LATEST_VIDEOS_LIMIT", 5)
+
+
+@pytest.mark.django_db
+class TestVideoArchiveService:
+
+    def setup_method(self):
+        """Setup before each test case."""
+        # Eight monthly uploads; with LATEST_VIDEOS_LIMIT=5 the three oldest are not in latest_videos
+        self.videos_data = [
+            {"video_id": f"vid{i}", "video_title": f"Video {i}", "upload_date": f"2023-{i + 1:02d}-15"}
+            for i in range(8)
+        ]
+        VideoIngestService.store_videos("UC123456", self.videos_data)
+        self.cutoff = datetime(2023, 7, 1, tzinfo=dt_timezone.utc)
+
+    def test_hot_cutoff_is_month_aligned(self):
+        """Test the cutoff is the first day of the oldest hot month."""
+        now = datetime(2024, 2, 20, 13, 30, tzinfo=dt_timezone.utc)
+
+        assert VideoArchiveService.hot_cutoff(now=now, hot_months=3) == datetime(2023, 11, 1, tzinfo=dt_timezone.utc)
+        assert VideoArchiveService.hot_cutoff(now=now, hot_months=0) == datetime(2024, 2, 1, tzinfo=dt_timezone.utc)
+
+    def test_archive_moves_cold_rows_and_keeps_latest(self):
+        """Test old videos move to the archive while the channel's latest videos stay hot."""
+        archived = VideoArchiveService.archive_channels(["UC123456"], self.cutoff)
+
+        assert archived == 3
+        assert sorted(VideoArchive.objects.values_list("video_id", flat=True)) == ["vid0", "vid1", "vid2"]
+        assert sorted(Video.objects.values_list("video_id", flat=True)) == [f"vid{i}" for i in range(3, 8)]
+        assert VideoArchiveService.archive_channels(["UC123456"], self.cutoff) == 0
+
+    def test_archived_videos_stay_visible(self):
+        """Test re-ingest, export, search and stats rebuilds account for archived videos."""
+        VideoArchiveService.archive_channels(["UC123456"], self.cutoff)
+
+        VideoIngestService.store_videos("UC123456", self.videos_data[:1])
+        ChannelStatsService.rebuild(["UC123456"])
+
+        assert not Video.objects.filter(video_id="vid0").exists()
+        assert ChannelUploadStats.objects.get(channel_id="UC123456").video_count == 8
+        assert len(list(VideoExportService.iter_videos(channel_ids=["UC123456"]))) == 8
+
+        videos, _ = VideoSearchService.search("video 1")
+        assert [video.video_id for video in videos] == ["vid1"]
+        videos, next_cursor = VideoSearchService.search("video", limit=6)
+        more, _ = VideoSearchService.search("video", limit=6, cursor=next_cursor)
+        assert sorted(video.video_id for video in videos + more) == [f"vid{i}" for i in range(8)]
+        assert VideoSearchService._search_fallback(["video"], "UC123456") == [f"vid{i}" for i in range(8)]
+
+    def test_archive_command(self):
+        """Test the command archives everything before the retention window."""
+        call_command("archive_videos", hot_months=0, batch_size=1)
+
+        assert Video.objects.count() == 5
+        assert VideoArchive.objects.count() == 3
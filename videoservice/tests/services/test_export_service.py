@@ -0,0 +1,59 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from rest_framework.exceptions import ValidationError
+
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.services.export_service import VideoExportService
+
+
+@pytest.mark.django_db
+class TestVideoExportService:
+
+    def setup_method(self):
+        """Setup before each test case."""
+        for channel_index in range(2):
+            channel = Channel.objects.create(channel_id=f"UC_{channel_index}", name=f"Channel {channel_index}")
+            for i in range(5):
+                Video.objects.create(
+                    video_id=f"vid_{channel_index}_{i}",
+                    video_title=f"Video {i}",
+                    upload_date=datetime(2024, 3, i + 1),
+                    channel=channel,
+                )
+
+    def test_iter_videos_keyset_pagination(self, django_assert_num_queries):
+        """Test every row is returned exactly once across keyset pages."""
+        # 4 pages of the hot table, 1 (empty) page of the archive
+        with django_assert_num_queries(5):
+            rows = list(VideoExportService.iter_videos(chunk_size=3))
+
+        assert [row[0] for row in rows] == sorted(f"vid_{c}_{i}" for c in range(2) for i in range(5))
+
+    def test_iter_ndjson_filters(self):
+        """Test channel and upload date filters are applied."""
+        body = b"".join(VideoExportService.iter_ndjson(
+            channel_ids=["UC_1"],
+            uploaded_after=VideoExportService.parse_upload_bound("2024-03-02", "uploaded_after"),
+            uploaded_before=VideoExportService.parse_upload_bound("2024-03-04", "uploaded_before"),
+        ))
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+
+        assert [row["video_id"] for row in rows] == ["vid_1_1", "vid_1_2"]
+        assert rows[0]["channel_id"] == "UC_1"
+
+    def test_iter_ndjson_gzip(self):
+        """Test the gzip stream decompresses to the plain NDJSON export."""
+        plain = b"".join(VideoExportService.iter_ndjson(chunk_size=3))
+        compressed = b"".join(VideoExportService.iter_ndjson(compress=True, chunk_size=3))
+
+        assert gzip.decompress(compressed) == plain
+        assert len(plain.splitlines()) == 10
+
+    def test_parse_upload_bound_invalid(self):
+        """Test invalid dates raise a validation error."""
+        with pytest.raises(ValidationError):
+            VideoExportService.parse_upload_bound("not-a-date", "uploaded_after")
@@ -0,0 +1,136 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from videoservice import settings
+from videoservice.common.admission import AdmissionControl
+from videoservice.common.exceptions import ServiceOverloaded
+from videoservice.common.resilient_cache import ResilientCache
+from videoservice.common.video_cache import recent_videos_key
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.services.feed_service import VideoFeedService
+from videoservice.services.ingest_service import VideoIngestService
+
+CHANNELS = ["UC_DAILY", "UC_WEEKLY", "UC_RARE"]
+
+
+@pytest.fixture(autouse=True)
+def small_top_k(monkeypatch):
+    # Three cached videos per channel, so the prolific channels' lists are truncated
+    monkeypatch.setattr(settings, "RECENT_VIDEOS_TOP_K", 3)
+    monkeypatch.setattr(settings, "LATEST_VIDEOS_LIMIT", 3)
+    monkeypatch.setattr(settings, "USE_REDIS", True)
+    backend = LocMemCache("feed", {})
+    backend.clear()
+    with patch("videoservice.services.feed_service.cache", ResilientCache(backend=backend)):
+        yield
+
+
+def uploads(prefix, days):
+    return [
+        {"video_id": f"{prefix}{day:02d}", "video_title": f"{prefix} {day}", "upload_date": f"2024-03-{day:02d}"}
+        for day in days
+    ]
+
+
+@pytest.mark.django_db
+class TestVideoFeedService:
+    def setup_method(self, method):
+        VideoIngestService.store_videos("UC_DAILY", uploads("d", range(1, 29)))
+        VideoIngestService.store_videos("UC_WEEKLY", uploads("w", range(2, 29, 7)))
+        VideoIngestService.store_videos("UC_RARE", uploads("r", [3, 27]))
+
+    def walk(self, limit, channels=CHANNELS):
+        ids, cursor = [], None
+        while True:
+            videos, cursor = VideoFeedService.feed(channels, limit=limit, cursor=cursor)
+            ids.extend(video.video_id for video in videos)
+            if cursor is None:
+                return ids
+
+    def test_pages_follow_upload_order_across_channels(self):
+        """Test walking the cursor yields every video once, in the order of the upload-sorted table."""
+        expected = list(
+            Video.objects.filter(channel_id__in=CHANNELS)
+            .order_by("-upload_date", "-video_id")
+            .values_list("video_id", flat=True)
+        )
+        assert self.walk(limit=4) == expected
+        assert self.walk(limit=100) == expected
+
+    def test_first_page_is_merged_from_cached_lists(self, django_assert_num_queries):
+        """Test a page within the cached top lists needs no scan of the video table."""
+        VideoFeedService.feed(CHANNELS, limit=2)  # caches the channels' lists
+
+        with django_assert_num_queries(1):  # titles of the page, by primary key
+            videos, cursor = VideoFeedService.feed(CHANNELS, limit=3)
+
+        assert [video.video_id for video in videos] == ["d28", "r27", "d27"]
+        assert cursor is not None
+
+    def test_exhausted_lists_continue_from_the_database(self, django_assert_num_queries):
+        """Test a page past a truncated list reads only that page from the video table."""
+        _, cursor = VideoFeedService.feed(CHANNELS, limit=4)
+
+        with django_assert_num_queries(1):  # one keyset page of the video table, titles included
+            videos, _ = VideoFeedService.feed(CHANNELS, limit=4, cursor=cursor)
+
+        # Same upload time: ties are ordered by video_id, descending
+        assert [video.video_id for video in videos] == ["d25", "d24", "w23", "d23"]
+
+    def test_short_rows_and_entries_are_not_taken_as_complete(self, monkeypatch):
+        """Test a channel denormalized with a smaller limit (or cached without the flag) keeps its older videos."""
+        monkeypatch.setattr(settings, "LATEST_VIDEOS_LIMIT", 2)
+        VideoIngestService.store_videos("UC_OLD", uploads("o", range(1, 11)))
+        monkeypatch.setattr(settings, "LATEST_VIDEOS_LIMIT", 3)
+        assert len(Channel.objects.get(channel_id="UC_OLD").latest_videos) == 2
+        channels = CHANNELS + ["UC_OLD"]
+        expected = list(
+            Video.objects.filter(channel_id__in=channels)
+            .order_by("-upload_date", "-video_id")
+            .values_list("video_id", flat=True)
+        )
+
+        assert self.walk(limit=4, channels=channels) == expected
+        # Entries cached before the flag existed: a short list is not known to be complete
+        with patch("videoservice.services.feed_service.cache.get_many", return_value={
+            recent_videos_key("UC_OLD"): {"video_ids": ["o10", "o09"], "upload_epochs": [1710028800, 1709942400]},
+        }):
+            assert self.walk(limit=4, channels=channels) == expected
+
+    def test_database_pages_take_a_miss_slot(self, monkeypatch):
+        """Test pages past the cached lists are shed while the miss budget is exhausted, cached pages are not."""
+        monkeypatch.setattr(settings, "ADMISSION_CONTROL", {"ENABLED": True, "LOCAL_MISS_CONCURRENCY": 1},
+                            raising=False)
+        monkeypatch.setattr(AdmissionControl, "_local_slots", None)
+        _, cursor = VideoFeedService.feed(CHANNELS, limit=4)
+
+        with patch.object(AdmissionControl, "run_script", return_value=None):
+            AdmissionControl.local_slots().acquire(blocking=False)  # another miss in flight
+            assert VideoFeedService.feed(CHANNELS, limit=2)[0]  # within the cached lists
+            with pytest.raises(ServiceOverloaded):
+                VideoFeedService.feed(CHANNELS, limit=4, cursor=cursor)
+
+    def test_invalid_requests(self):
+        with pytest.raises(ValidationError):
+            VideoFeedService.feed([])
+        with pytest.raises(ValidationError):
+            VideoFeedService.feed(CHANNELS, cursor="not-a-cursor")
+        with pytest.raises(ValidationError):
+            VideoFeedService.feed([f"UC{i}" for i in range(VideoFeedService.MAX_CHANNELS + 1)])
+
+    def test_feed_endpoint(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMISSION_CONTROL", {"ENABLED": False}, raising=False)
+        url = reverse("video-feed") + "?channel_id=UC_DAILY,UC_RARE&channel_id=UC_WEEKLY"
+        response = client.get(url + "&limit=2")
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert [video["video_id"] for video in body["results"]] == ["d28", "r27"]
+        assert body["next_cursor"]
+        assert client.get(url + "&limit=101").status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+import pytest
+
+from videoservice import settings
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.video_service import VideoService
+
+
+@pytest.fixture(autouse=True)
+def latest_videos_limit(monkeypatch):
+    monkeypatch.setattr(settings, "LATEST_VIDEOS_LIMIT", 5)
+
+
+@pytest.mark.django_db
+class TestVideoIngestService:
+
+    def setup_method(self):
+        """Setup before each test case."""
+        self.videos_data = [
+            {"video_id": f"vid{i}", "video_title": f"Video {i}", "upload_date": f"2024-03-{i + 1:02d}"}
+            for i in range(7)
+        ]
+
+    def test_store_videos_creates_channel_and_latest_videos(self):
+        """Test storing videos creates the channel and denormalizes the newest 5."""
+        result = VideoIngestService.store_videos("UC123456", self.videos_data)
+
+        channel = Channel.objects.get(channel_id="UC123456")
+        assert result == {"inserted": 7, "updated": 0, "unchanged": 0}
+        assert Video.objects.filter(channel=channel).count() == 7
+        assert [entry["video_id"] for entry in channel.latest_videos] == ["vid6", "vid5", "vid4", "vid3", "vid2"]
+
+    def test_store_videos_merges_with_existing_latest_videos(self):
+        """Test a later insert-mode ingest merges into latest_videos and keeps existing entries on conflict."""
+        VideoIngestService.store_videos("UC123456", self.videos_data[:3])
+        renamed = [{"video_id": "vid0", "video_title": "Renamed", "upload_date": "2024-03-01"}]
+        VideoIngestService.store_videos("UC123456", renamed + self.videos_data[3:], mode="insert")
+
+        channel = Channel.objects.get(channel_id="UC123456")
+        assert len(channel.latest_videos) == 5
+        assert channel.latest_videos[0]["video_id"] == "vid6"
+        assert Video.objects.get(video_id="vid0").video_title == "Video 0"
+
+    @patch.object(VideoService, "invalidate_cached_videos")
+    def test_upsert_writes_only_changed_rows(self, mock_invalidate, django_capture_on_commit_callbacks):
+        """Test upsert updates changed titles, skips unchanged rows and invalidates only changed channels."""
+        VideoIngestService.bulk_store_videos({"UC_A": self.videos_data[:3], "UC_B": []})
+        renamed = dict(self.videos_data[2], video_title="Renamed")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            unchanged = VideoIngestService.bulk_store_videos({"UC_A": self.videos_data[:3], "UC_B": []})
+        mock_invalidate.assert_not_called()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            result = VideoIngestService.bulk_store_videos({
+                "UC_A": self.videos_data[:2] + [renamed, self.videos_data[3]],
+                "UC_B": [],
+            })
+
+        assert unchanged == {"inserted": 0, "updated": 0, "unchanged": 3}
+        assert result == {"inserted": 1, "updated": 1, "unchanged": 2}
+        assert Video.objects.get(video_id="vid2").video_title == "Renamed"
+        assert Channel.objects.get(channel_id="UC_A").latest_videos[1]["video_title"] == "Renamed"
+        mock_invalidate.assert_called_once_with(["UC_A"])
+
+    def test_upsert_treats_legacy_rows_by_content(self):
+        """Test rows stored without a content hash are not rewritten when their content is unchanged."""
+        VideoIngestService.store_videos("UC123456", self.videos_data[:2])
+        Video.objects.update(content_hash=None)
+
+        result = VideoIngestService.store_videos("UC123456", self.videos_data[:2])
+
+        assert result == {"inserted": 0, "updated": 0, "unchanged": 2}
+
+    def test_bulk_store_videos_multiple_channels(self):
+        """Test bulk ingest keeps latest_videos up to date for every channel."""
+        VideoIngestService.bulk_store_videos({
+            "UC_A": self.videos_data[:2],
+            "UC_B": [dict(video, video_id=f"b_{video['video_id']}") for video in self.videos_data[:3]],
+        })
+
+        channels = Channel.objects.in_bulk(["UC_A", "UC_B"])
+        assert len(channels["UC_A"].latest_videos) == 2
+        assert len(channels["UC_B"].latest_videos) == 3
+
+    @patch("videoservice.services.video_service.cache.set")
+    def test_fetch_and_cache_videos_single_query(self, mock_cache_set, django_assert_num_queries, monkeypatch):
+        """Test a DB miss is served from the denormalized column with one query."""
+        monkeypatch.setattr(settings, "USE_REDIS", True)
+        monkeypatch.setattr(settings, "RECENT_VIDEOS_TOP_K", 5)
+        VideoIngestService.store_videos("UC123456", self.videos_data)
+
+        with django_assert_num_queries(1):
+            videos = VideoService.fetch_and_cache_videos("UC123456")
+
+        assert [video.video_id for video in videos] == ["vid6", "vid5", "vid4", "vid3", "vid2"]
+        mock_cache_set.assert_called_once()
+
+    @patch("videoservice.services.video_service.cache.set")
+    def test_rows_shorter_than_k_are_read_from_the_video_table(self, mock_cache_set, monkeypatch):
+        """Test a row denormalized with a limit below K does not cap the served list."""
+        monkeypatch.setattr(settings, "USE_REDIS", True)
+        monkeypatch.setattr(settings, "RECENT_VIDEOS_TOP_K", 20)
+        VideoIngestService.store_videos("UC123456", self.videos_data)  # 5 of 7 videos denormalized
+        VideoIngestService.store_videos("UC_SMALL", [{**video, "video_id": f"small_{video['video_id']}"}
+                                                     for video in self.videos_data[:3]])
+        channels = Channel.objects.in_bulk(["UC123456", "UC_SMALL"])
+        assert not channels["UC123456"].latest_videos_complete
+        assert channels["UC_SMALL"].latest_videos_complete
+
+        videos = VideoService.fetch_and_cache_videos("UC123456")
+
+        assert len(videos) == 7
+        assert mock_cache_set.call_args.args[1]["complete"] is True
+        assert len(VideoService.fetch_and_cache_videos("UC_SMALL")) == 3
@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice import settings
+from videoservice.common.resilient_cache import ResilientCache
+from videoservice.common.video_cache import recent_videos_key
+from videoservice.models.channel import Channel
+from videoservice.services import prefetch_service
+from videoservice.services.prefetch_service import ChannelPrefetchService
+from videoservice.services.video_service import VideoService
+
+
+def latest_entry(video_id, day):
+    return {"video_id": video_id, "video_title": f"Video {video_id}", "upload_date": f"2024-03-{day:02d}T00:00:00"}
+
+
+@pytest.fixture(autouse=True)
+def prefetch_settings(monkeypatch):
+    config = {"ENABLED": True, "WINDOW": 5, "MIN_SCORE": 2.0, "MAX_CANDIDATES": 3}
+    monkeypatch.setattr(settings, "PREFETCH", config, raising=False)
+    monkeypatch.setattr(settings, "DIAGNOSTICS", {"ADMIN_TOKEN": "secret"}, raising=False)
+    monkeypatch.setattr(settings, "USE_REDIS", True)
+    return config
+
+
+@pytest.fixture
+def local_cache():
+    backend = LocMemCache("prefetch", {})
+    backend.clear()
+    cache = ResilientCache(backend=backend)
+    with patch.object(prefetch_service, "resilient_cache", cache), \
+            patch("videoservice.services.video_service.cache", cache):
+        yield cache
+
+
+class TestCoAccessObservation:
+    def setup_method(self, method):
+        self.client = MagicMock()
+        self.pipe = self.client.pipeline.return_value
+        ChannelPrefetchService._scripts.clear()
+
+    def observe(self, previous, associations):
+        self.pipe.execute.side_effect = [[previous, 1, True, True, associations], [1]]
+        with patch.object(ChannelPrefetchService, "redis_client", return_value=self.client):
+            return ChannelPrefetchService.observe("10.0.0.1", "UC_A")
+
+    def test_previous_channels_are_associated_with_the_current_one(self):
+        """Test every other channel in the client's window gets an association to the requested one."""
+        self.observe([b"UC_X", b"UC_A", b"UC_Y"], [])
+
+        script = self.client.register_script.return_value
+        sources = {call.kwargs["keys"][0] for call in script.call_args_list}
+        assert sources == {"videoservice:prefetch:assoc:UC_X", "videoservice:prefetch:assoc:UC_Y"}
+        assert all(call.kwargs["args"][0] == "UC_A" for call in script.call_args_list)
+        self.pipe.lpush.assert_called_once_with("videoservice:prefetch:recent:10.0.0.1", "UC_A")
+
+    def test_candidates_are_strong_and_not_recently_requested(self):
+        """Test weak associations and channels the client just requested are not prefetched."""
+        candidates = self.observe([b"UC_X"], [(b"UC_B", 9.0), (b"UC_X", 5.0), (b"UC_C", 1.5)])
+
+        assert candidates == ["UC_B"]
+
+    def test_no_redis_no_observation(self):
+        """Test observation is skipped while Redis is unhealthy."""
+        with patch.object(ChannelPrefetchService, "redis_client", return_value=None):
+            assert ChannelPrefetchService.observe("10.0.0.1", "UC_A") == []
+
+    def test_budget_caps_prefetches(self):
+        """Test candidates are dropped (and counted) when the prefetch budget is exhausted."""
+        with patch("videoservice.services.prefetch_service.AdmissionControl.take_bucket_tokens",
+                   return_value=(False, 0.5)) as take, \
+                patch.object(ChannelPrefetchService, "count") as count:
+            assert ChannelPrefetchService.admit(["UC_B", "UC_C"]) == []
+        assert take.call_args.kwargs["cost"] == 2
+        count.assert_called_once_with("skipped_budget", 2)
+
+        with patch("videoservice.services.prefetch_service.AdmissionControl.take_bucket_tokens",
+                   return_value=(True, 0.0)):
+            assert ChannelPrefetchService.admit(["UC_B"]) == ["UC_B"]
+
+
+@pytest.mark.django_db
+class TestPrefetch:
+    def setup_method(self, method):
+        Channel.objects.create(channel_id="UC_B", name="B", latest_videos=[latest_entry("b1", 2), latest_entry("b0", 1)],
+                               latest_videos_complete=True)
+        Channel.objects.create(channel_id="UC_C", name="C", latest_videos=[latest_entry("c1", 1)],
+                               latest_videos_complete=True)
+
+    def test_prefetch_caches_uncached_channels_in_one_query(self, local_cache, django_assert_num_queries):
+        """Test only channels missing from the cache are loaded, with a single query."""
+        local_cache.set(recent_videos_key("UC_C"), {"video_ids": ["c1"]})
+        redis_client = MagicMock()
+
+        with patch.object(ChannelPrefetchService, "count") as count, \
+                patch.object(ChannelPrefetchService, "redis_client", return_value=redis_client), \
+                django_assert_num_queries(1):
+            assert ChannelPrefetchService.prefetch(["UC_B", "UC_C"]) == 1
+
+        entry = local_cache.get(recent_videos_key("UC_B"))
+        assert entry["video_ids"] == ["b1", "b0"]
+        redis_client.pipeline.return_value.set.assert_called_once_with("videoservice:prefetch:flag:UC_B", 1, ex=300)
+        count.assert_any_call("prefetched", 1)
+        count.assert_any_call("skipped_cached", 1)
+
+    def test_first_hit_on_a_prefetched_channel_is_counted_once(self, local_cache):
+        """Test serving a prefetched entry consumes its marker off the request path, leaving the entry alone."""
+        with patch.object(ChannelPrefetchService, "count"), \
+                patch.object(ChannelPrefetchService, "redis_client", return_value=MagicMock()):
+            ChannelPrefetchService.prefetch(["UC_B"])
+        entry = local_cache.get(recent_videos_key("UC_B"))
+
+        redis_client = MagicMock()
+        redis_client.delete.side_effect = [1, 0]
+        with patch("videoservice.services.video_service.async_record_prefetch_hit",
+                   side_effect=ChannelPrefetchService.record_hit) as record_hit, \
+                patch.object(ChannelPrefetchService, "redis_client", return_value=redis_client), \
+                patch.object(ChannelPrefetchService, "count") as count, \
+                patch.object(local_cache, "set") as cache_set:
+            assert VideoService.get_cached_validators("UC_B")
+            assert VideoService.get_cached_validators("UC_B")
+
+        assert record_hit.call_count == 2
+        redis_client.delete.assert_called_with("videoservice:prefetch:flag:UC_B")
+        count.assert_called_once_with("hits")
+        cache_set.assert_not_called()
+        assert local_cache.get(recent_videos_key("UC_B")) == entry
+
+    def test_stats_hit_rate(self, client):
+        """Test the diagnostics endpoint reports counters and hit rate."""
+        redis_client = MagicMock()
+        redis_client.hgetall.return_value = {b"prefetched": b"8", b"hits": b"6"}
+        url = reverse("diagnostics-prefetch")
+
+        with patch.object(ChannelPrefetchService, "redis_client", return_value=redis_client):
+            assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+            response = client.get(url, HTTP_X_DIAGNOSTICS_TOKEN="secret")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["hit_rate"] == 0.75
+        assert response.json()["skipped_budget"] == 0
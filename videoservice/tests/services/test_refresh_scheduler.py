@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+import pytest
+
+from videoservice.common.exceptions import UpstreamOverloaded, UpstreamUnavailable
+from videoservice.models.channel import Channel
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.refresh_scheduler import ChannelRefreshScheduler
+
+NOW = datetime(2024, 4, 1, tzinfo=dt_timezone.utc)
+
+
+def daily_uploads(count):
+    return [NOW - timedelta(days=day) for day in range(count)]
+
+
+class TestComputeRefreshInterval:
+
+    def test_frequent_uploader_refreshes_more_often(self):
+        """Test channels uploading daily are refreshed more often than weekly ones."""
+        daily = ChannelRefreshScheduler.compute_refresh_interval(daily_uploads(10), NOW, NOW)
+        weekly = ChannelRefreshScheduler.compute_refresh_interval(
+            [NOW - timedelta(days=7 * week) for week in range(10)], NOW, NOW
+        )
+
+        assert daily == 6 * 3600  # a quarter of the daily cadence
+        assert weekly == 7 * 6 * 3600
+
+    def test_idle_channels_back_off(self):
+        """Test channels nobody has read recently are refreshed less often."""
+        active = ChannelRefreshScheduler.compute_refresh_interval(daily_uploads(10), NOW, NOW)
+        idle = ChannelRefreshScheduler.compute_refresh_interval(daily_uploads(10), NOW - timedelta(days=2), NOW)
+
+        assert idle == active * 4
+
+    def test_no_history_uses_max_interval(self):
+        """Test channels without upload history get the maximum interval."""
+        interval = ChannelRefreshScheduler.compute_refresh_interval(daily_uploads(1), NOW, NOW)
+
+        assert interval == ChannelRefreshScheduler.config()["MAX_INTERVAL"]
+
+
+@pytest.mark.django_db
+class TestRefreshDueChannels:
+
+    def setup_method(self):
+        """Setup before each test case."""
+        for channel_id in ("UC_DUE", "UC_LATER"):
+            VideoIngestService.store_videos(channel_id, [
+                {"video_id": f"{channel_id}_{day}", "video_title": f"Video {day}", "upload_date": f"2024-03-{day:02d}"}
+                for day in range(1, 6)
+            ])
+        Channel.objects.filter(channel_id="UC_DUE").update(next_refresh_at=NOW - timedelta(minutes=1))
+        Channel.objects.filter(channel_id="UC_LATER").update(next_refresh_at=NOW + timedelta(hours=1))
+
+    @patch("videoservice.services.refresh_scheduler.VideoService.cache_videos")
+    @patch("videoservice.services.refresh_scheduler.VideoService.fetch_videos_from_upstream")
+    def test_refreshes_only_due_channels(self, mock_fetch, mock_cache_videos):
+        """Test a tick refreshes due channels, caches them and pushes their next refresh out."""
+        mock_fetch.return_value = [{"video_id": "UC_DUE_new", "video_title": "New", "upload_date": "2024-03-31"}]
+
+        result = ChannelRefreshScheduler.refresh_due_channels(now=NOW)
+
+        assert result == {"refreshed": 1, "changed": 1, "failed": 0, "scheduled": 0}
+        mock_fetch.assert_called_once_with("UC_DUE")
+        mock_cache_videos.assert_called_once()
+        channel = Channel.objects.get(channel_id="UC_DUE")
+        assert channel.latest_videos[0]["video_id"] == "UC_DUE_new"
+        assert channel.next_refresh_at > NOW
+
+    @patch("videoservice.services.refresh_scheduler.VideoService.fetch_videos_from_upstream",
+           side_effect=UpstreamOverloaded)
+    def test_upstream_outage_stops_tick(self, mock_fetch):
+        """Test an open circuit ends the tick and leaves the channel at the head of the queue."""
+        result = ChannelRefreshScheduler.refresh_due_channels(now=NOW)
+
+        assert result["refreshed"] == 0
+        assert Channel.objects.get(channel_id="UC_DUE").next_refresh_at == NOW - timedelta(minutes=1)
+
+    @pytest.mark.parametrize("error", [UpstreamUnavailable(), KeyError("upload_date"), ValueError("bad date")])
+    @patch("videoservice.services.refresh_scheduler.VideoService.cache_videos")
+    def test_failing_channel_is_backed_off_and_the_tick_goes_on(self, mock_cache_videos, error):
+        """Test a channel whose refresh fails is pushed back (exponentially) instead of stalling the queue."""
+        Channel.objects.filter(channel_id="UC_LATER").update(next_refresh_at=NOW - timedelta(seconds=30))
+
+        def fetch(channel_id):
+            if channel_id == "UC_DUE":
+                raise error
+            return []
+
+        with patch("videoservice.services.refresh_scheduler.VideoService.fetch_videos_from_upstream",
+                   side_effect=fetch) as mock_fetch:
+            result = ChannelRefreshScheduler.refresh_due_channels(now=NOW)
+            assert result["refreshed"] == 1 and result["failed"] == 1
+            assert [call.args[0] for call in mock_fetch.call_args_list] == ["UC_DUE", "UC_LATER"]
+
+            poisoned = Channel.objects.get(channel_id="UC_DUE")
+            assert poisoned.next_refresh_at == NOW + timedelta(seconds=300)
+            ChannelRefreshScheduler.refresh_due_channels(now=poisoned.next_refresh_at)
+
+        assert Channel.objects.get(channel_id="UC_DUE").refresh_interval == 600
+
+    def test_claimed_channels_are_not_picked_by_an_overlapping_tick(self):
+        """Test channels claimed by a running tick are not due for another one."""
+        claimed = ChannelRefreshScheduler.claim_due_channels(10, NOW)
+
+        assert [row[0] for row in claimed] == ["UC_DUE"]
+        assert ChannelRefreshScheduler.claim_due_channels(10, NOW) == []
+        assert Channel.objects.get(channel_id="UC_DUE").next_refresh_at == NOW + timedelta(seconds=600)
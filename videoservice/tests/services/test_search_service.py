@@ -0,0 +1,149 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from videoservice.common.resilient_cache import ResilientCache
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.models.video_record import VideoRecord
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.search_service import VideoSearchService
+
+
+@pytest.mark.django_db
+class TestVideoSearchService:
+    def setup_method(self, method):
+        self.channel = Channel.objects.create(channel_id="UC_search", name="Search Channel")
+        self.other = Channel.objects.create(channel_id="UC_other", name="Other Channel")
+        titles = {
+            "vid_1": ("Python tutorial for beginners", self.channel),
+            "vid_2": ("Advanced Python tips", self.channel),
+            "vid_3": ("Cooking pasta", self.channel),
+            "vid_4": ("Python Python Python", self.other),
+        }
+        for video_id, (title, channel) in titles.items():
+            Video.objects.create(video_id=video_id, video_title=title, upload_date=datetime(2024, 3, 1), channel=channel)
+
+    @pytest.fixture(autouse=True)
+    def shared_cache(self):
+        backend = LocMemCache("search", {})
+        backend.clear()
+        with patch("videoservice.services.search_service.cache", ResilientCache(backend=backend)):
+            yield backend
+
+    def page_through(self, query, **kwargs):
+        seen = []
+        cursor = None
+        while True:
+            videos, cursor = VideoSearchService.search(query, limit=1, cursor=cursor, **kwargs)
+            seen.extend(video.video_id for video in videos)
+            if not cursor:
+                return seen
+
+    def test_search_ranks_matches(self):
+        """Test all matching titles are returned, best match first."""
+        videos, next_cursor = VideoSearchService.search("python")
+
+        assert [video.video_id for video in videos][0] == "vid_4"
+        assert {video.video_id for video in videos} == {"vid_1", "vid_2", "vid_4"}
+        assert next_cursor is None
+
+    def test_search_within_channel_requires_all_words(self):
+        """Test the channel filter and implicit AND between words."""
+        videos, _ = VideoSearchService.search("python tips", channel_id="UC_search")
+
+        assert [video.video_id for video in videos] == ["vid_2"]
+        assert all(isinstance(video, VideoRecord) for video in videos)
+
+    def test_channel_filter_is_applied_in_each_branch(self):
+        """Test the channel predicate narrows each table's matches, not the ranked union of all of them."""
+        with CaptureQueriesContext(connection) as queries:
+            videos, _ = VideoSearchService.search("python", channel_id="UC_search")
+
+        assert {video.video_id for video in videos} == {"vid_1", "vid_2"}
+        ranked_sql = next(query["sql"] for query in queries if "UNION ALL" in query["sql"])
+        for branch in ranked_sql.split("UNION ALL"):
+            assert "v.channel_id = 'UC_search'" in branch
+        assert "channel_id = 'UC_search'" not in ranked_sql.rsplit(") ranked", 1)[1]
+
+    def test_search_ignores_query_syntax(self):
+        """Test FTS operators in user input are treated as plain words."""
+        videos, _ = VideoSearchService.search('pasta" OR NEAR(')
+
+        assert videos == []
+        assert [video.video_id for video in VideoSearchService.search("pasta*")[0]] == ["vid_3"]
+
+    def test_cursor_pagination(self):
+        """Test paging with the cursor visits every match exactly once."""
+        assert sorted(self.page_through("python")) == ["vid_1", "vid_2", "vid_4"]
+
+    def test_pages_do_not_drift_when_the_index_changes(self):
+        """Test later pages come from the first page's ranking, whatever is written in between."""
+        first, cursor = VideoSearchService.search("python", limit=1)
+        # Outranks every match and changes the corpus statistics BM25 scores depend on
+        Video.objects.create(
+            video_id="vid_0", video_title="Python Python Python Python", upload_date=datetime(2024, 3, 2),
+            channel=self.channel,
+        )
+        seen = [first[0].video_id]
+        while cursor:
+            videos, cursor = VideoSearchService.search("python", limit=1, cursor=cursor)
+            seen.extend(video.video_id for video in videos)
+
+        assert sorted(seen) == ["vid_1", "vid_2", "vid_4"]
+        assert self.page_through("python")[0] == "vid_0"
+
+    def test_expired_snapshot_or_other_query_ranks_again(self, shared_cache):
+        """Test a cursor whose snapshot is gone, or reused with other words, still returns a page of matches."""
+        _, cursor = VideoSearchService.search("python", limit=1)
+        videos, _ = VideoSearchService.search("pasta", limit=1, cursor=cursor)
+        assert videos == []  # offset 1 of the single "pasta" match
+
+        shared_cache.clear()
+        videos, next_cursor = VideoSearchService.search("python", limit=1, cursor=cursor)
+        assert len(videos) == 1 and next_cursor
+
+    def test_fallback_backend_returns_records(self, monkeypatch):
+        """Test backends without a text index scan titles and return records ordered by video_id."""
+        monkeypatch.setattr(connection, "vendor", "mysql")
+
+        videos, _ = VideoSearchService.search("python")
+
+        assert [video.video_id for video in videos] == ["vid_1", "vid_2", "vid_4"]
+        assert all(isinstance(video, VideoRecord) for video in videos)
+
+    def test_index_follows_writes(self):
+        """Test bulk ingest, title updates and deletes are reflected in the index."""
+        VideoIngestService.store_videos("UC_search", [
+            {"video_id": "vid_5", "video_title": "Gardening basics", "upload_date": "2024-03-02"},
+        ])
+        assert [video.video_id for video in VideoSearchService.search("gardening")[0]] == ["vid_5"]
+
+        Video.objects.filter(video_id="vid_5").update(video_title="Woodworking basics")
+        assert VideoSearchService.search("gardening")[0] == []
+
+        Video.objects.filter(video_id="vid_5").delete()
+        assert VideoSearchService.search("basics")[0] == []
+
+    def test_invalid_input(self):
+        """Test empty queries and malformed cursors are rejected."""
+        with pytest.raises(ValidationError):
+            VideoSearchService.search("  ??  ")
+        with pytest.raises(ValidationError):
+            VideoSearchService.search("python", cursor="not-a-cursor")
+
+    def test_rebuild_command(self):
+        """Test the rebuild command backfills rows missing from the index."""
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO videoservice_video_fts(videoservice_video_fts) VALUES ('delete-all')")
+        assert VideoSearchService.search("pasta")[0] == []
+
+        call_command("rebuild_search_index")
+
+        assert [video.video_id for video in VideoSearchService.search("pasta")[0]] == ["vid_3"]
@@ -0,0 +1,100 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import NotFound, ValidationError
+
+from videoservice.models.upload_stats import ChannelDailyUploads, ChannelUploadStats
+from videoservice.models.video import Video
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.stats_service import ChannelStatsService
+
+
+@pytest.mark.django_db
+class TestChannelStatsService:
+
+    def setup_method(self):
+        """Setup before each test case."""
+        # 2024-03-04 is a Monday
+        self.videos_data = [
+            {"video_id": "vid0", "video_title": "Video 0", "upload_date": "2024-03-04"},
+            {"video_id": "vid1", "video_title": "Video 1", "upload_date": "2024-03-04"},
+            {"video_id": "vid2", "video_title": "Video 2", "upload_date": "2024-03-08"},
+            {"video_id": "vid3", "video_title": "Video 3", "upload_date": "2024-03-12"},
+        ]
+
+    def test_ingest_maintains_rollups(self):
+        """Test ingest adds new videos to the rollups and ignores ones already stored."""
+        VideoIngestService.store_videos("UC123456", self.videos_data[:3])
+        VideoIngestService.store_videos("UC123456", self.videos_data[1:] + self.videos_data[3:])
+
+        stats = ChannelUploadStats.objects.get(channel_id="UC123456")
+        assert stats.video_count == 4
+        assert stats.first_upload_at == datetime(2024, 3, 4, tzinfo=dt_timezone.utc)
+        assert stats.last_upload_at == datetime(2024, 3, 12, tzinfo=dt_timezone.utc)
+        assert dict(ChannelDailyUploads.objects.values_list("day", "video_count")) == {
+            date(2024, 3, 4): 2, date(2024, 3, 8): 1, date(2024, 3, 12): 1,
+        }
+
+    def test_get_stats_buckets_and_range(self):
+        """Test weekly buckets are summed from daily rollups and the range filter applies."""
+        VideoIngestService.store_videos("UC123456", self.videos_data)
+
+        weekly = ChannelStatsService.get_stats("UC123456", bucket="week")
+        daily = ChannelStatsService.get_stats("UC123456", since=date(2024, 3, 5), until=date(2024, 3, 12))
+
+        assert weekly["video_count"] == 4
+        assert weekly["buckets"] == [
+            {"start": date(2024, 3, 4), "video_count": 3},
+            {"start": date(2024, 3, 11), "video_count": 1},
+        ]
+        assert [bucket["start"] for bucket in daily["buckets"]] == [date(2024, 3, 8), date(2024, 3, 12)]
+
+    def test_get_stats_reads_only_rollups(self):
+        """Test the stats query never touches the video table."""
+        VideoIngestService.store_videos("UC123456", self.videos_data)
+
+        with CaptureQueriesContext(connection) as queries:
+            ChannelStatsService.get_stats("UC123456", bucket="week")
+
+        assert len(queries) == 2
+        assert not any("videoservice_video\"" in query["sql"] for query in queries)
+
+    def test_get_stats_errors(self):
+        """Test unknown channels and buckets are rejected."""
+        with pytest.raises(NotFound):
+            ChannelStatsService.get_stats("UC_missing")
+        VideoIngestService.store_videos("UC123456", self.videos_data)
+        with pytest.raises(ValidationError):
+            ChannelStatsService.get_stats("UC123456", bucket="month")
+
+    def test_rebuild_command(self):
+        """Test the rebuild command recomputes rollups from the video table."""
+        VideoIngestService.store_videos("UC123456", self.videos_data)
+        Video.objects.filter(video_id="vid3").delete()
+        ChannelDailyUploads.objects.all().delete()
+
+        call_command("rebuild_upload_stats", batch_size=1)
+
+        stats = ChannelUploadStats.objects.get(channel_id="UC123456")
+        assert stats.video_count == 3
+        assert stats.last_upload_at == datetime(2024, 3, 8, tzinfo=dt_timezone.utc)
+        assert ChannelDailyUploads.objects.count() == 2
+
+    def test_rebuild_aggregates_inside_the_locking_transaction(self):
+        """Test rebuild locks the channels before reading their videos, and writes in the same transaction."""
+        VideoIngestService.store_videos("UC123456", self.videos_data)
+
+        with CaptureQueriesContext(connection) as queries:
+            ChannelStatsService.rebuild(["UC123456"])
+
+        statements = [query["sql"] for query in queries]
+        lock = next(i for i, sql in enumerate(statements) if 'FROM "videoservice_channel"' in sql)
+        first_read = next(i for i, sql in enumerate(statements) if 'FROM "videoservice_video"' in sql)
+        write = next(i for i, sql in enumerate(statements) if sql.startswith("INSERT"))
+        assert any(sql.startswith("SAVEPOINT") for sql in statements[:lock])
+        assert lock < first_read < write
+        assert not any(sql.startswith("RELEASE") for sql in statements[lock:write])
+        assert ChannelUploadStats.objects.get(channel_id="UC123456").video_count == 4
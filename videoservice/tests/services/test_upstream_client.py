@@ -0,0 +1,141 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from videoservice.common.circuit_breaker import CircuitBreaker
+from videoservice.common.exceptions import UpstreamUnavailable
+from videoservice.services.upstream_client import UpstreamVideoClient
+from videoservice.stress_test.stub_upstream import StubUpstreamServer
+
+CHANNEL_ID = "UC6qq5ZRn_epjgdKwtgmeSd3"
+
+
+@pytest.fixture
+def stub_upstream():
+    servers = []
+
+    def start(**kwargs):
+        server = StubUpstreamServer(**kwargs).start_in_thread()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestUpstreamVideoClient:
+
+    def test_fetch_channel_videos_success(self, stub_upstream):
+        """Test fetching the newest videos through the pooled session."""
+        client = UpstreamVideoClient(stub_upstream().url)
+
+        videos = client.fetch_channel_videos(CHANNEL_ID, limit=5)
+
+        assert len(videos) == 5
+        assert videos[0]["upload_date"] >= videos[-1]["upload_date"]
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    def test_fetch_unknown_channel_returns_empty(self, stub_upstream):
+        """Test a 404 from upstream is an empty result, not a failure."""
+        client = UpstreamVideoClient(stub_upstream().url, breaker_failure_threshold=1)
+
+        assert client.fetch_channel_videos("NON_EXISTENT_CHANNEL") == []
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    def test_retries_then_opens_breaker(self, stub_upstream):
+        """Test failing requests are retried, then the breaker opens and fails fast."""
+        server = stub_upstream(error_rate=1.0)
+        client = UpstreamVideoClient(server.url, max_retries=2, backoff_base=0.001, breaker_failure_threshold=1)
+
+        with pytest.raises(UpstreamUnavailable):
+            client.fetch_channel_videos(CHANNEL_ID)
+        assert client.breaker.state == CircuitBreaker.OPEN
+
+        server.error_rate = 0.0
+        with pytest.raises(UpstreamUnavailable):
+            client.fetch_channel_videos(CHANNEL_ID)  # rejected without contacting upstream
+
+    def test_read_timeout(self, stub_upstream):
+        """Test slow responses hit the read timeout instead of blocking the worker."""
+        client = UpstreamVideoClient(stub_upstream(latency_ms=300).url, read_timeout=0.05, max_retries=0)
+
+        with pytest.raises(UpstreamUnavailable):
+            client.fetch_channel_videos(CHANNEL_ID)
+
+    def test_channel_id_is_quoted_into_the_path(self):
+        """Test reserved characters in a channel id cannot change the request target."""
+        client = UpstreamVideoClient("http://upstream.test")
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"videos": []}
+        with patch.object(client.session, "get", return_value=response) as get:
+            client.fetch_channel_videos("UC/../admin?x=1#frag")
+
+        assert get.call_args.args[0] == "http://upstream.test/channels/UC%2F..%2Fadmin%3Fx%3D1%23frag/videos"
+
+    @pytest.mark.parametrize("body", [
+        ["not", "an", "object"], {"videos": "nope"}, {"videos": [1, 2]},
+        {"videos": [{"video_id": "vid0", "video_title": "Video 0", "upload_date": "03/01/2024"}]},
+    ])
+    def test_malformed_body_fails_the_half_open_trial(self, body):
+        """Test an unexpected body is an upstream failure and ends the half-open trial."""
+        now = [0.0]
+        client = UpstreamVideoClient("http://upstream.test", breaker_failure_threshold=1)
+        client.breaker = CircuitBreaker("upstream", failure_threshold=1, recovery_timeout=10, clock=lambda: now[0])
+        client.breaker.record_failure()
+        now[0] = 11  # half-open: the next call is the trial
+        response = MagicMock(status_code=200)
+        response.json.return_value = body
+
+        with patch.object(client.session, "get", return_value=response), pytest.raises(UpstreamUnavailable):
+            client.fetch_channel_videos(CHANNEL_ID)
+
+        assert client.breaker.state == CircuitBreaker.OPEN
+        now[0] = 22
+        assert client.breaker.allow_request()  # a later trial is admitted again
+
+    def test_malformed_rows_are_dropped(self):
+        """Test rows missing a field or with a bad upload_date are dropped and the valid ones kept."""
+        client = UpstreamVideoClient("http://upstream.test")
+        valid = {"video_id": "vid0", "video_title": "Video 0", "upload_date": "2024-03-01"}
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"videos": [
+            valid,
+            {"video_id": "vid1", "video_title": "Video 1"},
+            {"video_id": "", "video_title": "Video 2", "upload_date": "2024-03-02"},
+            {"video_id": "vid3", "video_title": "Video 3", "upload_date": "2024-03-03T10:00:00"},
+            {"video_id": "vid4", "video_title": None, "upload_date": "2024-03-04"},
+            "vid5",
+        ]}
+
+        with patch.object(client.session, "get", return_value=response):
+            assert client.fetch_channel_videos(CHANNEL_ID) == [valid]
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    def test_unexpected_error_is_recorded(self):
+        """Test an unexpected exception still records a failure instead of leaking the trial."""
+        client = UpstreamVideoClient("http://upstream.test", breaker_failure_threshold=1)
+        with patch.object(client, "_fetch_with_retries", side_effect=RuntimeError("boom")), \
+                pytest.raises(RuntimeError):
+            client.fetch_channel_videos(CHANNEL_ID)
+
+        assert client.breaker.state == CircuitBreaker.OPEN
+
+
+class TestCircuitBreaker:
+
+    def test_half_open_trial_closes_circuit(self):
+        """Test the breaker lets one trial call through after the recovery timeout."""
+        now = [0.0]
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        breaker.record_failure()
+        assert not breaker.allow_request()
+
+        now[0] = 11
+        assert breaker.allow_request()
+        assert not breaker.allow_request()  # only one trial in flight
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
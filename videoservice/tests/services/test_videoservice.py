@@ -1,11 +1,17 @@
 import json
+import tracemalloc
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 
 import pytest
 from rest_framework.exceptions import ValidationError, NotFound
 
 from videoservice.models.channel import Channel
+from videoservice.common import video_cache
+from videoservice.common.video_cache import build_cache_entry
 from videoservice.models.video import Video
+from videoservice.models.video_record import VideoRecord
+from videoservice.serializers.video_serializer import VideoSerializer
 from videoservice.services.video_service import VideoService
 
 
@@ -41,8 +47,10 @@ class TestVideoService:
     ):
         """Test retrieving videos from cache (mocked)."""
 
-        # ✅ Mock the QuerySet so `.order_by()` does not fail
-        mock_filter.return_value.order_by.return_value = self.video_objects
+        # ✅ Mock the QuerySet so `.order_by().values_list()` returns compact rows
+        mock_filter.return_value.order_by.return_value.values_list.return_value = [
+            (video.video_id, video.video_title, video.upload_date, video.channel_id) for video in self.video_objects
+        ]
 
         response, status_code = VideoService.get_recent_videos(self.channel.channel_id)
 
@@ -128,3 +136,53 @@ class TestVideoService:
         response = VideoService.fetch_videos_from_mock_youtube("UC123456")
 
         assert len(response) == 5  # ✅ Ensure correct number of videos
+
+
+@pytest.mark.django_db
+class TestVideoRecord:
+
+    def setup_method(self):
+        self.channel = Channel.objects.create(channel_id="UC123456", name="Test Channel")
+        Video.objects.create(video_id="vid0", video_title="Video 0", upload_date="2024-03-01T00:00:00Z", channel=self.channel)
+
+    def test_records_serialize_and_cache_like_models(self, monkeypatch):
+        """Test records from rows, latest entries and upstream dicts match the model's serialized form."""
+        monkeypatch.setattr(video_cache, "modified_epoch", lambda: 1_710_000_000)
+        video = Video.objects.get(video_id="vid0")
+        from_row = VideoRecord.from_row(Video.objects.values_list(*VideoRecord.FIELDS).get(video_id="vid0"))
+        from_entry = VideoRecord.from_latest_entry(Channel.to_latest_entry(video), "UC123456")
+        from_upstream = VideoRecord.from_upstream(
+            {"video_id": "vid0", "video_title": "Video 0", "upload_date": "2024-03-01"}, "UC123456"
+        )
+
+        expected = VideoSerializer([video], many=True).data
+        for record in (from_row, from_entry, from_upstream):
+            assert VideoSerializer([record], many=True).data == expected
+            assert build_cache_entry([record]) == build_cache_entry([video])
+        assert VideoSerializer(VideoRecord.from_upstream(
+            {"video_id": "vid0", "video_title": "Video 0", "upload_date": "2024-03-01"}
+        )).data["channel"] is None
+
+    def test_records_allocate_less_than_models(self):
+        """Test a record costs a fraction of the memory of an unsaved model instance."""
+        entries = [Channel.to_latest_entry(Video.objects.get(video_id="vid0"))] * 500
+
+        def allocated(build):
+            tracemalloc.start()
+            try:
+                objects = [build(entry, "UC123456") for entry in entries]
+                return tracemalloc.get_traced_memory()[0], objects
+            finally:
+                tracemalloc.stop()
+
+        def unsaved_model(entry, channel_id):
+            return Video(
+                video_id=entry["video_id"],
+                video_title=entry["video_title"],
+                upload_date=datetime.fromisoformat(entry["upload_date"]),
+                channel_id=channel_id,
+            )
+
+        record_bytes, _ = allocated(VideoRecord.from_latest_entry)
+        model_bytes, _ = allocated(unsaved_model)
+        assert record_bytes * 2 < model_bytes
@@ -0,0 +1,110 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice import settings
+from videoservice.common.admission import AdmissionControl
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+
+
+@pytest.mark.django_db
+class TestAdmissionControl:
+    def setup_method(self, method):
+        channel = Channel.objects.create(channel_id="UC123456", name="Test Channel")
+        for i in range(5):
+            Video.objects.create(
+                video_id=f"vid{i}",
+                video_title=f"Video {i}",
+                upload_date=datetime(2024, 3, i + 1),
+                channel=channel,
+            )
+        self.url = reverse("video-list") + "?channel_id=UC123456"
+
+    @pytest.fixture(autouse=True)
+    def admission(self, monkeypatch):
+        config = {
+            "ENABLED": True, "CLIENT_RATE": 1, "CLIENT_BURST": 1, "MISS_CONCURRENCY": 1,
+            "LOCAL_MISS_CONCURRENCY": 1, "RETRY_AFTER": 2,
+        }
+        monkeypatch.setattr(settings, "ADMISSION_CONTROL", config, raising=False)
+        monkeypatch.setattr(settings, "DIAGNOSTICS", {"ADMIN_TOKEN": "secret"}, raising=False)
+        monkeypatch.setattr(settings, "USE_REDIS", True)
+        monkeypatch.setattr(settings, "USE_CELERY", False)
+        monkeypatch.setattr(AdmissionControl, "_local_slots", None)
+        AdmissionControl._shed.clear()
+        # Redis unreachable: no rate limiting, per-process miss budget
+        with patch.object(AdmissionControl, "run_script", return_value=None), \
+                patch("videoservice.services.video_service.cache", LocMemCache("admission", {})), \
+                patch("videoservice.services.video_service.VideoService.record_access"):
+            yield config
+        AdmissionControl._shed.clear()
+
+    def test_misses_release_their_slot(self, client):
+        """Test sequential misses each get the single miss slot back."""
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+        assert client.get(reverse("video-list") + "?channel_id=UC_UNKNOWN").status_code == status.HTTP_404_NOT_FOUND
+        assert AdmissionControl.local_slots().acquire(blocking=False)
+
+    def test_exhausted_miss_budget_sheds_misses_but_serves_hits(self, client):
+        """Test misses are shed with 503 and Retry-After while cache hits are still served."""
+        assert client.get(self.url).status_code == status.HTTP_200_OK  # caches the channel
+        AdmissionControl.local_slots().acquire(blocking=False)  # another miss in flight
+
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+
+        response = client.get(reverse("video-list") + "?channel_id=UC_OTHER")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response["Retry-After"] == "2"
+        assert response.json()["errors"][0]["status"] == "503"
+        assert AdmissionControl._shed["miss_budget"] == 1
+
+    def test_rate_limited_client_gets_429(self, client):
+        """Test an empty token bucket rejects the request with Retry-After."""
+        with patch.object(AdmissionControl, "take_token", return_value=(False, 1.5)):
+            response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response["Retry-After"] == "2"
+        assert AdmissionControl._shed["rate_limited"] == 1
+
+    def test_client_identity_ignores_spoofed_forwarded_for(self, client):
+        """Test a client cannot choose its rate limit bucket by sending X-Forwarded-For."""
+        with patch.object(AdmissionControl, "take_token", return_value=(True, 0)) as take_token:
+            client.get(self.url, HTTP_X_FORWARDED_FOR="10.9.9.9", REMOTE_ADDR="10.0.0.1")
+            with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+                # Behind one proxy: the entry it appended, not the client-supplied ones before it
+                client.get(self.url, HTTP_X_FORWARDED_FOR="10.9.9.9, 203.0.113.7", REMOTE_ADDR="10.0.0.2")
+
+        assert [call.args[0] for call in take_token.call_args_list] == ["10.0.0.1", "203.0.113.7"]
+
+    def test_redis_token_bucket_result(self):
+        """Test the token bucket script result is decoded."""
+        with patch.object(AdmissionControl, "run_script", return_value=[0, b"0.25"]) as run_script:
+            assert AdmissionControl.take_token("10.0.0.1") == (False, 0.25)
+        keys, args = run_script.call_args.args[1:]
+        assert keys == ["videoservice:admission:bucket:10.0.0.1"]
+        assert args == [1, 1, 1]
+
+    def test_redis_miss_slot_is_released(self):
+        """Test a Redis-backed miss slot is removed again when the block exits."""
+        with patch.object(AdmissionControl, "run_script", return_value=1), \
+                patch.object(AdmissionControl, "release_slot") as release_slot:
+            with AdmissionControl.miss_slot():
+                release_slot.assert_not_called()
+        assert release_slot.call_args.args[0] == "videoservice:admission:miss_slots"
+
+    def test_stats_endpoint(self, client):
+        """Test shed counters are exposed behind the diagnostics token."""
+        AdmissionControl.record_shed("miss_budget")
+        url = reverse("diagnostics-admission")
+
+        assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(url, HTTP_X_DIAGNOSTICS_TOKEN="secret")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["shed_local"] == {"miss_budget": 1}
@@ -0,0 +1,84 @@
+import gzip
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import brotli
+import msgpack
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice import settings
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+
+
+@pytest.mark.django_db
+class TestCompressedResponses:
+    def setup_method(self, method):
+        channel = Channel.objects.create(channel_id="UC123456", name="Test Channel")
+        for i in range(5):
+            Video.objects.create(
+                video_id=f"vid{i}",
+                video_title=f"A reasonably long title for video number {i}",
+                upload_date=datetime(2024, 3, i + 1),
+                channel=channel,
+            )
+        self.url = reverse("video-list") + "?channel_id=UC123456"
+
+    @pytest.fixture(autouse=True)
+    def local_cache(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_REDIS", True)
+        monkeypatch.setattr(settings, "USE_CELERY", False)
+        with patch("videoservice.services.video_service.cache", LocMemCache("compressed-responses", {})), \
+                patch("videoservice.services.video_service.VideoService.record_access"):
+            yield
+
+    def test_serves_negotiated_variant(self, client):
+        """Test gzip and Brotli clients get matching Content-Encoding and a variant ETag."""
+        identity = client.get(self.url)
+        gzipped = client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        brotli_response = client.get(self.url, HTTP_ACCEPT_ENCODING="br, gzip")
+
+        assert identity.status_code == status.HTTP_200_OK
+        assert "Content-Encoding" not in identity
+        assert gzipped["Content-Encoding"] == "gzip"
+        assert gzip.decompress(gzipped.content) == identity.content
+        assert brotli_response["Content-Encoding"] == "br"
+        assert brotli.decompress(brotli_response.content) == identity.content
+        assert gzipped["ETag"] == identity["ETag"][:-1] + '-gzip"'
+        assert "Accept-Encoding" in gzipped["Vary"]
+
+    def test_cache_hit_serves_precompressed_body(self, client, django_assert_num_queries):
+        """Test a warm cache serves the stored compressed body without DB or rendering."""
+        client.get(self.url)
+
+        with patch("videoservice.views.video_view.compress_variants") as mock_compress, \
+                django_assert_num_queries(0):
+            response = client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        mock_compress.assert_not_called()
+        assert json.loads(gzip.decompress(response.content))["UC123456"][0]["video_id"] == "vid4"
+
+    def test_variant_etag_revalidates(self, client):
+        """Test the ETag of a compressed variant is accepted for revalidation."""
+        etag = client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        response = client.get(self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_msgpack_negotiation(self, client):
+        """Test Accept: application/x-msgpack returns MessagePack, cached separately from JSON."""
+        json_response = client.get(self.url)
+        response = client.get(self.url, HTTP_ACCEPT="application/x-msgpack")
+        cached = client.get(self.url, HTTP_ACCEPT="application/x-msgpack")
+
+        assert response["Content-Type"] == "application/x-msgpack"
+        assert response["ETag"] == json_response["ETag"][:-1] + '-msgpack"'
+        payload = msgpack.unpackb(response.content)
+        assert payload["UC123456"][0]["upload_date"] == 1709596800
+        assert cached.content == response.content
@@ -0,0 +1,83 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+
+from videoservice import settings
+from videoservice.common import video_cache
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+from videoservice.services.video_service import VideoService
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def setup_method(self, method):
+        channel = Channel.objects.create(channel_id="UC123456", name="Test Channel")
+        for i in range(5):
+            Video.objects.create(
+                video_id=f"vid{i}",
+                video_title=f"Video {i}",
+                upload_date=datetime(2024, 3, i + 1),
+                channel=channel,
+            )
+        self.url = reverse("video-list") + "?channel_id=UC123456"
+
+    @pytest.fixture(autouse=True)
+    def local_cache(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_REDIS", True)
+        monkeypatch.setattr(settings, "USE_CELERY", False)
+        with patch("videoservice.services.video_service.cache", LocMemCache("conditional-get", {})), \
+                patch("videoservice.services.video_service.VideoService.record_access"):
+            yield
+
+    def test_response_has_validators(self, client, monkeypatch):
+        """Test a 200 response carries ETag and Last-Modified headers, the latter from when the entry was built."""
+        monkeypatch.setattr(video_cache, "modified_epoch", lambda: 1_710_000_000)
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"].startswith('"')
+        assert response["Last-Modified"] == http_date(1_710_000_000)
+
+    def test_if_none_match_returns_304_from_cache(self, client, django_assert_num_queries):
+        """Test revalidation with a current ETag returns an empty 304 without touching the DB."""
+        etag = client.get(self.url)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response["ETag"] == etag
+
+    def test_stale_etag_returns_full_response(self, client):
+        """Test a non-matching ETag gets the full payload."""
+        response = client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["UC123456"]) == 5
+
+    def test_if_modified_since(self, client):
+        """Test If-Modified-Since at or after the entry's Last-Modified returns 304."""
+        last_modified = client.get(self.url)["Last-Modified"]
+        response = client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_edited_title_is_modified_since(self, client, monkeypatch):
+        """Test an edit that is not a new upload still moves Last-Modified, so If-Modified-Since gets a 200."""
+        monkeypatch.setattr(video_cache, "modified_epoch", lambda: 1_710_000_000)
+        last_modified = client.get(self.url)["Last-Modified"]
+
+        Video.objects.filter(video_id="vid4").update(video_title="Video 4 (edited)")
+        VideoService.invalidate_cached_videos(["UC123456"])
+        monkeypatch.setattr(video_cache, "modified_epoch", lambda: 1_710_000_060)
+        response = client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["UC123456"][0]["video_title"] == "Video 4 (edited)"
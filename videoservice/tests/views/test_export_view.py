@@ -0,0 +1,52 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+
+
+@pytest.mark.django_db
+class TestExportView:
+    def setup_method(self, method):
+        for channel_index in range(3):
+            channel = Channel.objects.create(channel_id=f"UC_{channel_index}", name=f"Channel {channel_index}")
+            for i in range(2):
+                Video.objects.create(
+                    video_id=f"vid_{channel_index}_{i}",
+                    video_title=f"Video {i}",
+                    upload_date=datetime(2024, 3, i + 1),
+                    channel=channel,
+                )
+
+    def test_export_streams_ndjson(self, client):
+        """Test GET /video/export/ streams NDJSON filtered by channel list."""
+        url = reverse("video-export") + "?channel_id=UC_0,UC_2"
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        assert {row["channel_id"] for row in rows} == {"UC_0", "UC_2"}
+        assert len(rows) == 4
+
+    def test_export_gzip(self, client):
+        """Test the export is gzip-encoded when the client accepts it."""
+        url = reverse("video-export")
+        response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert len(gzip.decompress(b"".join(response.streaming_content)).splitlines()) == 6
+
+    def test_export_invalid_date(self, client):
+        """Test an invalid upload date filter returns 400."""
+        url = reverse("video-export") + "?uploaded_after=yesterday"
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["errors"][0]["source"] == {"parameter": "uploaded_after"}
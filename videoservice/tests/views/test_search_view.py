@@ -0,0 +1,49 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice.common.resilient_cache import ResilientCache
+from videoservice.models.channel import Channel
+from videoservice.models.video import Video
+
+
+@pytest.mark.django_db
+class TestSearchView:
+    def setup_method(self, method):
+        channel = Channel.objects.create(channel_id="UC_search", name="Search Channel")
+        for i in range(3):
+            Video.objects.create(
+                video_id=f"vid_{i}", video_title=f"Python lesson {i}", upload_date=datetime(2024, 3, i + 1), channel=channel
+            )
+
+    @pytest.fixture(autouse=True)
+    def shared_cache(self):
+        with patch("videoservice.services.search_service.cache", ResilientCache(backend=LocMemCache("search-view", {}))):
+            yield
+
+    def test_search_endpoint(self, client):
+        """Test GET /video/search/ returns a page of serialized results with a cursor."""
+        response = client.get(reverse("video-search") + "?q=python&channel_id=UC_search&limit=1")
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert len(body["results"]) == 1
+        assert body["results"][0]["channel"] == "UC_search"
+        assert "content_hash" not in body["results"][0]
+        assert body["next_cursor"]
+
+        response = client.get(reverse("video-search") + f"?q=python&limit=5&cursor={body['next_cursor']}")
+        assert len(response.json()["results"]) == 2
+
+        response = client.get(reverse("video-search") + "?q=python&limit=500")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_search_requires_query(self, client):
+        """Test a missing query returns 400."""
+        response = client.get(reverse("video-search"))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
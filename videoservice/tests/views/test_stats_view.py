@@ -0,0 +1,31 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from videoservice.services.ingest_service import VideoIngestService
+
+
+@pytest.mark.django_db
+class TestStatsView:
+    def setup_method(self, method):
+        VideoIngestService.store_videos("UC_stats", [
+            {"video_id": f"vid_{i}", "video_title": f"Video {i}", "upload_date": f"2024-03-{i + 1:02d}"}
+            for i in range(10)
+        ])
+
+    def test_weekly_stats(self, client):
+        """Test GET /video/stats/ returns totals and weekly buckets."""
+        response = client.get(reverse("video-stats") + "?channel_id=UC_stats&bucket=week&since=2024-03-04")
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["video_count"] == 10
+        assert body["first_upload_at"].startswith("2024-03-01")
+        assert body["buckets"] == [
+            {"start": "2024-03-04", "video_count": 7},
+        ]
+
+    def test_missing_channel(self, client):
+        """Test a channel without statistics returns 404 and a missing channel_id returns 400."""
+        assert client.get(reverse("video-stats") + "?channel_id=UC_none").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get(reverse("video-stats")).status_code == status.HTTP_400_BAD_REQUEST
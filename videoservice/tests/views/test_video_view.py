@@ -1,11 +1,18 @@
+from unittest.mock import patch
+
 import pytest
 
+from django.core.cache.backends.locmem import LocMemCache
 from django.urls import reverse
 from rest_framework import status
 
 from videoservice import settings
+from videoservice.common.resilient_cache import ResilientCache
+from videoservice.common.video_cache import recent_videos_key
 from videoservice.models.channel import Channel
 from videoservice.models.video import Video
+from videoservice.services.ingest_service import VideoIngestService
+from videoservice.services.video_service import VideoService
 from datetime import datetime
 
 
@@ -99,3 +106,69 @@ class TestVideoView:
         assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
 
 
+
+
+@pytest.mark.django_db
+class TestVideoLimit:
+    @pytest.fixture(autouse=True)
+    def redis_cache(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_REDIS", True)
+        monkeypatch.setattr(settings, "USE_CELERY", False)
+        backend = LocMemCache("video-limit", {})
+        backend.clear()
+        with patch("videoservice.services.video_service.cache", ResilientCache(backend=backend)), \
+                patch.object(VideoService, "record_access"):
+            yield backend
+
+    def setup_method(self, method):
+        VideoIngestService.store_videos("UC123456", [
+            {"video_id": f"vid{i}", "video_title": f"Video {i}", "upload_date": f"2024-03-{i + 1:02d}"}
+            for i in range(12)
+        ])
+
+    def test_one_cached_entry_serves_every_limit(self, client, redis_cache):
+        """Test the first miss caches the top K and other limits are sliced from that entry."""
+        url = reverse("video-list") + "?channel_id=UC123456"
+        with patch.object(VideoService, "load_uncached_videos", wraps=VideoService.load_uncached_videos) as load:
+            default = client.get(url)
+            ten = client.get(url + "&limit=10")
+
+        assert load.call_count == 1
+        assert len(redis_cache.get(recent_videos_key("UC123456"))["video_ids"]) == 12
+        assert [video["video_id"] for video in default.json()["UC123456"]] == [f"vid{i}" for i in range(11, 6, -1)]
+        assert len(ten.json()["UC123456"]) == 10
+        assert default["ETag"] != ten["ETag"]
+
+        revalidated = client.get(url + "&limit=10", HTTP_IF_NONE_MATCH=ten["ETag"])
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_short_entry_does_not_cap_a_larger_limit(self, client, redis_cache):
+        """Test an entry holding fewer videos than asked for, and not all of them, is reloaded."""
+        url = reverse("video-list") + "?channel_id=UC123456"
+        client.get(url)
+        entry = redis_cache.get(recent_videos_key("UC123456"))
+        legacy = {key: value[:5] if key in ("video_ids", "upload_epochs") else value
+                  for key, value in entry.items() if key != "complete"}
+        redis_cache.set(recent_videos_key("UC123456"), legacy)
+
+        assert len(client.get(url).json()["UC123456"]) == 5
+        assert len(client.get(url + "&limit=10").json()["UC123456"]) == 10
+        assert redis_cache.get(recent_videos_key("UC123456"))["complete"] is True
+
+    def test_etag_of_another_limit_does_not_match(self, client):
+        """Test a client revalidating with the ETag of a shorter (or longer) list gets the full list."""
+        url = reverse("video-list") + "?channel_id=UC123456"
+        default = client.get(url)
+        top_k = client.get(url + "&limit=20")
+
+        for limit, etag in (("20", default["ETag"]), ("20", f'W/{default["ETag"]}'), ("5", top_k["ETag"])):
+            response = client.get(url + f"&limit={limit}", HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()["UC123456"]) == min(int(limit), 12)
+
+    def test_limit_out_of_range(self, client):
+        """Test limits above K (or not numbers) are rejected."""
+        url = reverse("video-list") + "?channel_id=UC123456&limit="
+        assert client.get(url + "21").status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get(url + "0").status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get(url + "ten").status_code == status.HTTP_400_BAD_REQUEST
@@ -1,9 +1,17 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
+from videoservice.views.diagnostics_view import AdmissionStatsView, AllocationsView, BreakersView, \
+    PrefetchStatsView, ProfileView, SlowRequestsView
 from videoservice.views.video_view import VideoView
 
 router = DefaultRouter()
 router.register(r'video', VideoView, basename='video')
 urlpatterns = [
     path("", include(router.urls)),
+    path("diagnostics/slow-requests/", SlowRequestsView.as_view(), name="diagnostics-slow-requests"),
+    path("diagnostics/allocations/", AllocationsView.as_view(), name="diagnostics-allocations"),
+    path("diagnostics/admission/", AdmissionStatsView.as_view(), name="diagnostics-admission"),
+    path("diagnostics/breakers/", BreakersView.as_view(), name="diagnostics-breakers"),
+    path("diagnostics/prefetch/", PrefetchStatsView.as_view(), name="diagnostics-prefetch"),
+    path("diagnostics/profile/", ProfileView.as_view(), name="diagnostics-profile"),
 ]
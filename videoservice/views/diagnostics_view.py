@@ -0,0 +1,194 @@
+import logging
+import os
+import time
+import uuid
+
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from videoservice.common.admission import AdmissionControl
+from videoservice.common.diagnostics import HasDiagnosticsToken, allocation_samples, diagnostics_config, \
+    slow_requests
+from videoservice.common.exceptions import ProfilerBusy, custom_exception_handler
+from videoservice.common.profiler import ProfileInProgress, format_collapsed, start_profile
+from videoservice.common.resilient_cache import resilient_cache
+from videoservice.services.prefetch_service import ChannelPrefetchService
+
+logger = logging.getLogger('videoservice')
+
+
+class DiagnosticsAPIView(APIView):
+    """
+    Base of the admin endpoints: JSON only, no session or basic auth, and open only to requests
+    whose `X-Diagnostics-Token` header matches DIAGNOSTICS["ADMIN_TOKEN"].
+    """
+    renderer_classes = [JSONRenderer]
+    permission_classes = [HasDiagnosticsToken]
+    authentication_classes = []
+
+    def get_exception_handler(self):
+        return custom_exception_handler
+
+
+class SamplesView(DiagnosticsAPIView):
+    """Base admin endpoint exposing the samples a diagnostics middleware captured in this process."""
+    buffer = None  # WorstSamples filled by the middleware
+    enabled_setting = "ENABLED"
+
+    def get(self, request):
+        """
+        Returns the worst captured samples, worst first.
+        Returns:
+            Response: {"enabled": bool, "samples": [...]}
+        """
+        return Response({
+            "enabled": diagnostics_config().get(self.enabled_setting, False),
+            "samples": self.buffer.samples(),
+        })
+
+    def delete(self, request):
+        """Clears the captured samples."""
+        self.buffer.clear()
+        logger.info(f"Cleared {self.__class__.__name__} samples")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SlowRequestsView(SamplesView):
+    """Slowest requests captured by `DiagnosticsMiddleware`."""
+    buffer = slow_requests
+
+
+class AllocationsView(SamplesView):
+    """Requests with the largest allocation peaks captured by `AllocationProfilerMiddleware`."""
+    buffer = allocation_samples
+    enabled_setting = "ALLOCATIONS"
+
+
+class AdmissionStatsView(DiagnosticsAPIView):
+    """Admin endpoint exposing admission control counters (shed requests, miss-path requests in flight)."""
+
+    def get(self, request):
+        """
+        Returns:
+            Response: Counters from `AdmissionControl.stats`.
+        """
+        return Response(AdmissionControl.stats())
+
+
+class BreakersView(DiagnosticsAPIView):
+    """Admin endpoint exposing the state of this process's circuit breakers."""
+
+    def get(self, request):
+        """
+        Returns:
+            Response: {"breakers": [{"name", "state", "consecutive_failures", ...}]}
+        """
+        # Imported lazily, like VideoService does: the HTTP client stack is optional
+        from videoservice.services.upstream_client import get_upstream_client
+
+        breakers = [resilient_cache.snapshot(), AdmissionControl.redis_breaker.snapshot()]
+        client = get_upstream_client()
+        if client is not None:
+            breakers.append(client.breaker.snapshot())
+        return Response({"breakers": breakers})
+
+
+class PrefetchStatsView(DiagnosticsAPIView):
+    """Admin endpoint exposing co-access prefetch counters and hit rate."""
+
+    def get(self, request):
+        """
+        Returns:
+            Response: Counters from `ChannelPrefetchService.stats`.
+        """
+        return Response(ChannelPrefetchService.stats())
+
+
+def profile_key(profile_id):
+    """Returns the cache key of a profile's status and result."""
+    return f"videoservice:profile:{profile_id}"
+
+
+class ProfileView(DiagnosticsAPIView):
+    """
+    Admin endpoints running the stack sampler in the worker process that serves the request.
+    POST starts a profile in a background thread and returns its id; the result is stored in the
+    shared cache, so GET fetches it by that id from whichever worker serves the call.
+    Opt-in (DIAGNOSTICS["PROFILER"]).
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not diagnostics_config().get("PROFILER", False):
+            raise NotFound("Profiling is disabled.")
+
+    def post(self, request):
+        """
+        Starts sampling the stacks of this worker's request threads.
+        Query params:
+            seconds: Profile duration (default 10, at most PROFILE_MAX_SECONDS).
+            interval_ms: Sampling interval (default PROFILE_INTERVAL_MS).
+        Returns:
+            Response: 202 {"id": str, "status": "running", "worker": pid, "seconds": float}.
+        Raises:
+            ProfilerBusy: If a profile is already running in this worker.
+        """
+        config = diagnostics_config()
+        try:
+            seconds = float(request.query_params.get("seconds", 10))
+            interval_ms = float(request.query_params.get("interval_ms", config.get("PROFILE_INTERVAL_MS", 5)))
+        except ValueError:
+            raise ValidationError({"seconds": ["seconds and interval_ms must be numbers."]})
+        if not 0 < seconds <= config.get("PROFILE_MAX_SECONDS", 60) or not 1 <= interval_ms <= 1000:
+            raise ValidationError({"seconds": ["Out of range."]})
+
+        profile_id = uuid.uuid4().hex
+        key = profile_key(profile_id)
+        ttl = config.get("PROFILE_RESULT_TTL", 3600)
+        status_entry = {"id": profile_id, "status": "running", "worker": os.getpid(), "seconds": seconds}
+        resilient_cache.set(key, {**status_entry, "started_at": time.time()}, timeout=ttl)
+
+        def store(samples):
+            resilient_cache.set(key, {
+                **status_entry, "status": "done", "samples": sum(samples.values()), "stacks": format_collapsed(samples),
+            }, timeout=ttl)
+
+        try:
+            start_profile(seconds, interval_ms / 1000, store)
+        except ProfileInProgress:
+            resilient_cache.delete_many([key])
+            raise ProfilerBusy()
+        logger.info(f"Profiling worker {os.getpid()} for {seconds}s (profile {profile_id})")
+        return Response(status_entry, status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request):
+        """
+        Returns a profile: its stacks collapsed, each prefixed with the request's serving path
+        (hit, db, upstream or other).
+        Query params:
+            id: The profile id returned by POST.
+        Returns:
+            HttpResponse: text/plain collapsed stacks (`path;frame;...;frame count` per line), ready
+            for flamegraph.pl or speedscope; or 202 {"status": "running", ...} while sampling.
+        Raises:
+            NotFound: If the profile is unknown or its result expired (PROFILE_RESULT_TTL).
+        """
+        profile_id = request.query_params.get("id", "")
+        if not profile_id:
+            raise ValidationError({"id": ["This query parameter is required."]})
+        profile = resilient_cache.get(profile_key(profile_id))
+        if profile is None:
+            raise NotFound("Unknown or expired profile.")
+        if profile["status"] != "done":
+            remaining = max(0.0, profile["started_at"] + profile["seconds"] - time.time())
+            return Response(
+                {key: profile[key] for key in ("id", "status", "worker")} | {"remaining_seconds": round(remaining, 1)},
+                status=status.HTTP_202_ACCEPTED,
+            )
+        response = HttpResponse(profile["stacks"], content_type="text/plain; charset=utf-8")
+        response["X-Profile-Samples"] = str(profile["samples"])
+        return response
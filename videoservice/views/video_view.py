@@ -1,24 +1,64 @@
 import logging
 
-from rest_framework import viewsets
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from videoservice.common.admission import ClientRateThrottle
+from videoservice.common.compression import IDENTITY, compress_variants, negotiate_encoding
+from videoservice.common.conditional import not_modified_etag, set_validator_headers, variant_etag
+from videoservice.common.diagnostics import allocation_stage
 from videoservice.common.exceptions import custom_exception_handler
+from videoservice.common.profiler import tag_request_path
+from videoservice.common.video_cache import recent_videos_top_k
+from videoservice.config.tasks import async_observe_channel_access
 from videoservice.models.video import Video
-from videoservice.common.renderers import VideoJSONRenderer
+from videoservice.common.renderers import MSGPACK_AVAILABLE, NDJSONRenderer, VideoJSONRenderer, \
+    VideoMessagePackRenderer
 from videoservice.serializers.video_serializer import VideoSerializer
+from videoservice.services.export_service import VideoExportService
+from videoservice.services.feed_service import VideoFeedService
+from videoservice.services.prefetch_service import ChannelPrefetchService
+from videoservice.services.search_service import VideoSearchService
+from videoservice.services.stats_service import ChannelStatsService
 from videoservice.services.video_service import VideoService
 
 logger = logging.getLogger('videoservice')
 
+
+def parse_limit(request, maximum):
+    """
+    Reads the optional `limit` query param.
+    Args:
+        request (Request): The HTTP request object.
+        maximum (int): Largest accepted limit.
+    Returns:
+        int | None: The limit, or None when it is not given (the endpoint's default applies).
+    Raises:
+        ValidationError: If it is not a whole number between 1 and `maximum`.
+    """
+    limit = request.query_params.get("limit")
+    if limit is None:
+        return None
+    if not limit.isdigit() or not 1 <= int(limit) <= maximum:
+        raise ValidationError({"limit": [f"Enter a whole number between 1 and {maximum}."]})
+    return int(limit)
+
+
 class VideoView(viewsets.ReadOnlyModelViewSet):
     """
     API view for retrieving the most recent videos for a given channel.
-    This view only supports `GET` requests and formats responses using a custom JSON renderer.
+    This view only supports `GET` requests and formats responses using a custom JSON renderer,
+    or MessagePack for internal clients sending `Accept: application/x-msgpack`.
     """
     queryset = Video.objects.all()
     serializer_class = VideoSerializer
-    renderer_classes = [VideoJSONRenderer]
+    renderer_classes = [VideoJSONRenderer] + ([VideoMessagePackRenderer] if MSGPACK_AVAILABLE else [])
+    # Per-client token buckets; misses are additionally limited by AdmissionControl.miss_slot
+    throttle_classes = [ClientRateThrottle]
 
     def get_exception_handler(self):
         """
@@ -31,12 +71,188 @@ class VideoView(viewsets.ReadOnlyModelViewSet):
     def list(self, request):
         """
         Handles GET requests to retrieve the most recent videos for a given channel.
+        Responses are rendered once per data version and cached with their gzip/Brotli
+        variants; the variant matching `Accept-Encoding` is served as-is.
+        Query params:
+            channel_id: The channel (required).
+            limit: Number of videos, 1 to RECENT_VIDEOS_TOP_K (default RECENT_VIDEOS_DEFAULT_LIMIT).
         Args:
             request (Request): The HTTP request object.
         Returns:
-            Response: A JSON response containing the latest 5 videos or an error message.
+            Response: A JSON response containing the latest `limit` videos or an error message,
+            or an empty 304 when the client's `If-None-Match` / `If-Modified-Since` is still current.
         """
         logger.info("LIST API called")
         channel_id = request.query_params.get("channel_id")
-        response_data, status_code = VideoService.get_recent_videos(channel_id=channel_id)
-        return Response(response_data, status=status_code)
\ No newline at end of file
+        limit = parse_limit(request, recent_videos_top_k())
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        renderer = request.accepted_renderer
+        if channel_id and ChannelPrefetchService.enabled():
+            async_observe_channel_access(ClientRateThrottle().get_ident(request), channel_id)
+
+        # Revalidation against the validators stored with the cache entry: one cache lookup
+        validators = VideoService.get_cached_validators(channel_id, limit)
+        if validators:
+            tag_request_path("hit")
+            etag = not_modified_etag(request, validators)
+            if etag:
+                VideoService.record_access(channel_id)
+                return set_validator_headers(Response(status=status.HTTP_304_NOT_MODIFIED), validators, etag)
+
+            cached_body = VideoService.get_cached_body(channel_id, validators["etag"], encoding, renderer.format)
+            if cached_body:
+                VideoService.record_access(channel_id)
+                return self.encoded_response(renderer, *cached_body, validators)
+
+        response_data, status_code, validators = VideoService.get_recent_videos_with_validators(channel_id=channel_id, limit=limit)
+        if not validators:
+            return Response(response_data, status=status_code)
+
+        etag = not_modified_etag(request, validators)
+        if etag:
+            return set_validator_headers(Response(status=status.HTTP_304_NOT_MODIFIED), validators, etag)
+
+        with allocation_stage("render"):
+            body = renderer.render(response_data, renderer.media_type, {"request": request})
+        with allocation_stage("compress"):
+            variants = compress_variants(body)
+        VideoService.cache_rendered_bodies(channel_id, validators["etag"], variants, renderer.format)
+        return self.encoded_response(renderer, *variants[encoding], validators, status_code=status_code)
+
+    @staticmethod
+    def encoded_response(renderer, applied_encoding, body, validators, status_code=status.HTTP_200_OK):
+        """
+        Builds a response from an already rendered, possibly compressed, body.
+        Args:
+            renderer (BaseRenderer): Renderer the body was produced with (sets the content type).
+            applied_encoding (str): Content coding of `body` ("br", "gzip" or "identity").
+            body (bytes): Response body.
+            validators (dict): Validators of the data version the body was rendered from.
+            status_code (int): HTTP status code.
+        Returns:
+            HttpResponse: Response with content-coding and validator headers.
+        """
+        content_type = f"{renderer.media_type}; charset={renderer.charset}" if renderer.charset else renderer.media_type
+        response = HttpResponse(body, status=status_code, content_type=content_type)
+        if applied_encoding != IDENTITY:
+            response["Content-Encoding"] = applied_encoding
+        patch_vary_headers(response, ["Accept"])
+        etag = variant_etag(validators["etag"], applied_encoding, renderer.format)
+        return set_validator_headers(response, validators, etag)
+
+    @action(detail=False, methods=["get"], renderer_classes=[VideoJSONRenderer, NDJSONRenderer])
+    def export(self, request):
+        """
+        Handles GET requests for a streaming NDJSON export of videos.
+        Query params:
+            channel_id: Channel to include; repeat it or pass a comma-separated list (default: all).
+            uploaded_after: Inclusive lower bound on upload_date (YYYY-MM-DD or ISO-8601).
+            uploaded_before: Exclusive upper bound on upload_date (YYYY-MM-DD or ISO-8601).
+        The body is gzip-encoded when the client sends `Accept-Encoding: gzip`.
+        Args:
+            request (Request): The HTTP request object.
+        Returns:
+            StreamingHttpResponse: NDJSON stream, one video per line.
+        """
+        logger.info("EXPORT API called")
+        channel_ids = self.channel_ids(request)
+        uploaded_after = VideoExportService.parse_upload_bound(
+            request.query_params.get("uploaded_after"), "uploaded_after"
+        )
+        uploaded_before = VideoExportService.parse_upload_bound(
+            request.query_params.get("uploaded_before"), "uploaded_before"
+        )
+        compress = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), ("gzip",)) == "gzip"
+
+        response = StreamingHttpResponse(
+            VideoExportService.iter_ndjson(channel_ids, uploaded_after, uploaded_before, compress=compress),
+            content_type=NDJSONRenderer.media_type,
+        )
+        response["Vary"] = "Accept-Encoding"
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        return response
+
+    @staticmethod
+    def channel_ids(request):
+        """Returns the `channel_id` query params; each may be repeated or a comma-separated list."""
+        return [
+            channel_id
+            for value in request.query_params.getlist("channel_id")
+            for channel_id in value.split(",")
+            if channel_id
+        ]
+
+    @action(detail=False, methods=["get"], renderer_classes=[VideoJSONRenderer])
+    def feed(self, request):
+        """
+        Handles GET requests for the merged feed of several channels' latest uploads.
+        Query params:
+            channel_id: Channels to merge; repeat it or pass a comma-separated list (required, max 500).
+            limit: Page size, 1-100 (default 20).
+            cursor: `next_cursor` from the previous page.
+        Args:
+            request (Request): The HTTP request object.
+        Returns:
+            Response: {"results": [...], "next_cursor": str | None}, newest uploads first.
+        """
+        logger.info("FEED API called")
+        limit = parse_limit(request, VideoFeedService.MAX_LIMIT)
+
+        videos, next_cursor = VideoFeedService.feed(
+            self.channel_ids(request), limit=limit, cursor=request.query_params.get("cursor")
+        )
+        return Response({"results": VideoSerializer(videos, many=True).data, "next_cursor": next_cursor})
+
+    @action(detail=False, methods=["get"], renderer_classes=[VideoJSONRenderer])
+    def search(self, request):
+        """
+        Handles GET requests for full-text search over video titles.
+        Query params:
+            q: Words to search for (all must match).
+            channel_id: Restrict results to one channel (default: all channels).
+            limit: Page size, 1-100 (default 20).
+            cursor: `next_cursor` from the previous page.
+        Args:
+            request (Request): The HTTP request object.
+        Returns:
+            Response: {"results": [...], "next_cursor": str | None}, best matches first.
+        """
+        logger.info("SEARCH API called")
+        limit = parse_limit(request, VideoSearchService.MAX_LIMIT)
+
+        videos, next_cursor = VideoSearchService.search(
+            request.query_params.get("q", ""),
+            channel_id=request.query_params.get("channel_id") or None,
+            limit=limit,
+            cursor=request.query_params.get("cursor"),
+        )
+        return Response({"results": VideoSerializer(videos, many=True).data, "next_cursor": next_cursor})
+
+    @action(detail=False, methods=["get"], renderer_classes=[VideoJSONRenderer])
+    def stats(self, request):
+        """
+        Handles GET requests for a channel's upload statistics, served from precomputed rollups.
+        Query params:
+            channel_id: The channel (required).
+            bucket: "day" (default) or "week".
+            since: Inclusive first upload day (YYYY-MM-DD).
+            until: Inclusive last upload day (YYYY-MM-DD).
+        Args:
+            request (Request): The HTTP request object.
+        Returns:
+            Response: Totals, first/last upload times and upload counts per bucket.
+        """
+        logger.info("STATS API called")
+        channel_id = request.query_params.get("channel_id")
+        if not channel_id:
+            raise ValidationError({"channel_id": ["This query parameter is required."]})
+        since = VideoExportService.parse_upload_bound(request.query_params.get("since"), "since")
+        until = VideoExportService.parse_upload_bound(request.query_params.get("until"), "until")
+
+        return Response(ChannelStatsService.get_stats(
+            channel_id,
+            bucket=request.query_params.get("bucket", "day"),
+            since=ChannelStatsService.upload_day(since) if since else None,
+            until=ChannelStatsService.upload_day(until) if until else None,
+        ))